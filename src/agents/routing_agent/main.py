@@ -64,20 +64,17 @@ def main():
         print(f"Multi-criteria Cost: {routing_result.get_multi_criteria_cost():.2f}")
         print()
         
-        # Route Segments
-        if routing_result.route_segments:
+        # Route Segments (turn-by-turn, only present when directions were requested)
+        if len(routing_result.route_segments) > 1:
             print(f"🗺️  ROUTE SEGMENTS ({len(routing_result.route_segments)} segments)")
             print("-" * 30)
-            total_time = 0
-            total_distance = 0
             
             for i, segment in enumerate(routing_result.route_segments, 1):
                 print(f"{i:2d}. {segment.instructions}")
                 print(f"    Time: {segment.travel_time_minutes:.2f} min, Distance: {segment.distance_km:.2f} km")
-                total_time += segment.travel_time_minutes
-                total_distance += segment.distance_km
             
-            print(f"\nTotals: {total_time:.2f} min, {total_distance:.2f} km")
+            arrays = routing_result.arrays
+            print(f"\nTotals: {arrays['time'].sum():.2f} min, {arrays['distance'].sum():.2f} km")
         
         # Validation
         print("\n✅ VALIDATION")
@@ -16,4 +16,11 @@ try:
     __all__ = ["RoutingAgent", "MockRoutingAgent", "LocationState", "RoutingDecision"]
 except ImportError as e:
     # ArcGIS not available, only expose mock agent and location state classes
-    __all__ = ["MockRoutingAgent", "LocationState", "RoutingDecision"]
\ No newline at end of file
+    __all__ = ["MockRoutingAgent", "LocationState", "RoutingDecision"]
+
+# Import LocalRoutingBackend conditionally to allow running without NetworkX
+try:
+    from .local_backend import LocalRoutingBackend
+    __all__.append("LocalRoutingBackend")
+except ImportError:
+    pass
@@ -0,0 +1,50 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+# distutils: extra_compile_args = -O3 -ffast-math -march=native
+"""
+Compiled Haversine Distance Kernels
+
+Optional C extension used by location_state when available. Build it in place with:
+
+    python setup.py build_ext --inplace
+"""
+
+import numpy as np
+
+from libc.math cimport M_PI, atan2, cos, sin, sqrt
+
+cdef double EARTH_RADIUS_METERS = 6371000.0
+cdef double DEG_TO_RAD = M_PI / 180.0
+
+
+cpdef double haversine(double lat1, double lon1, double lat2, double lon2) noexcept nogil:
+    """Haversine distance in meters between two points given in degrees"""
+    cdef double lat1_rad = lat1 * DEG_TO_RAD
+    cdef double lat2_rad = lat2 * DEG_TO_RAD
+    cdef double sin_dlat = sin((lat2 - lat1) * DEG_TO_RAD / 2)
+    cdef double sin_dlon = sin((lon2 - lon1) * DEG_TO_RAD / 2)
+
+    cdef double a = sin_dlat * sin_dlat + cos(lat1_rad) * cos(lat2_rad) * sin_dlon * sin_dlon
+    return EARTH_RADIUS_METERS * 2 * atan2(sqrt(a), sqrt(1 - a))
+
+
+cpdef double haversine_cos(double lat1, double lon1, double cos_lat1,
+                           double lat2, double lon2, double cos_lat2) noexcept nogil:
+    """Haversine distance in meters reusing precomputed cosines of both latitudes"""
+    cdef double sin_dlat = sin((lat2 - lat1) * DEG_TO_RAD / 2)
+    cdef double sin_dlon = sin((lon2 - lon1) * DEG_TO_RAD / 2)
+
+    cdef double a = sin_dlat * sin_dlat + cos_lat1 * cos_lat2 * sin_dlon * sin_dlon
+    return EARTH_RADIUS_METERS * 2 * atan2(sqrt(a), sqrt(1 - a))
+
+
+def haversine_bulk(const double[::1] lats1, const double[::1] lons1,
+                   const double[::1] lats2, const double[::1] lons2):
+    """Pairwise Haversine distances in meters, computed without holding the GIL"""
+    cdef Py_ssize_t i, n = lats1.shape[0]
+    distances = np.empty(n, dtype=np.float64)
+    cdef double[::1] out = distances
+
+    with nogil:
+        for i in range(n):
+            out[i] = haversine(lats1[i], lons1[i], lats2[i], lons2[i])
+    return distances
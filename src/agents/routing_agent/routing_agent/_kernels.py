@@ -0,0 +1,101 @@
+"""
+Haversine Distance Kernels
+
+This module selects the fastest available implementation of the Haversine
+distance: the Cython extension for scalar calls, Numba-compiled kernels, and
+plain math/NumPy fallbacks when neither is installed.
+"""
+
+from math import atan2, cos, radians, sin, sqrt
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    # Numba is optional, fall back to the math/NumPy implementations
+    njit = None
+
+try:
+    from ._haversine import (
+        haversine as _haversine_c,
+        haversine_bulk as _haversine_bulk_c,
+        haversine_cos as _haversine_cos_c,
+    )
+except ImportError:
+    # The Cython extension is optional (build with: python setup.py build_ext --inplace)
+    _haversine_c = None
+
+EARTH_RADIUS_METERS = 6371000.0
+
+
+def _haversine_py(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Haversine distance in meters between two points given in degrees"""
+    lat1_rad = radians(lat1)
+    lat2_rad = radians(lat2)
+    delta_lat = radians(lat2 - lat1)
+    delta_lon = radians(lon2 - lon1)
+
+    a = (sin(delta_lat/2)**2 +
+         cos(lat1_rad) * cos(lat2_rad) * sin(delta_lon/2)**2)
+    c = 2 * atan2(sqrt(a), sqrt(1-a))
+
+    return EARTH_RADIUS_METERS * c
+
+
+def _haversine_cos_py(lat1: float, lon1: float, cos_lat1: float,
+                      lat2: float, lon2: float, cos_lat2: float) -> float:
+    """Haversine distance in meters reusing precomputed cosines of both latitudes"""
+    sin_half_dlat = sin(radians(lat2 - lat1) / 2)
+    sin_half_dlon = sin(radians(lon2 - lon1) / 2)
+
+    a = sin_half_dlat*sin_half_dlat + cos_lat1 * cos_lat2 * sin_half_dlon*sin_half_dlon
+    c = 2 * atan2(sqrt(a), sqrt(1-a))
+
+    return EARTH_RADIUS_METERS * c
+
+
+def _haversine_vec_numpy(lats1: np.ndarray, lons1: np.ndarray,
+                         lats2: np.ndarray, lons2: np.ndarray) -> np.ndarray:
+    """Pairwise Haversine distances in meters for arrays of points given in degrees"""
+    lat1_rad = np.deg2rad(lats1)
+    lat2_rad = np.deg2rad(lats2)
+    delta_lat = lat2_rad - lat1_rad
+    delta_lon = np.deg2rad(lons2) - np.deg2rad(lons1)
+
+    a = (np.sin(delta_lat/2)**2 +
+         np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(delta_lon/2)**2)
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
+
+    return EARTH_RADIUS_METERS * c
+
+
+if njit is not None:
+    # Explicit signature: compiled (or loaded from the on-disk cache) at import,
+    # so the first distance call does not pay for type inference
+    _haversine_jit = njit("f8(f8, f8, f8, f8)", fastmath=True, cache=True)(_haversine_py)
+    _haversine_cos_jit = njit("f8(f8, f8, f8, f8, f8, f8)", fastmath=True, cache=True)(_haversine_cos_py)
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _haversine_vec_jit(lats1, lons1, lats2, lons2):
+        """Pairwise Haversine distances in meters, compiled and parallelized over pairs"""
+        distances = np.empty(lats1.shape[0])
+        for i in prange(lats1.shape[0]):
+            distances[i] = _haversine_jit(lats1[i], lons1[i], lats2[i], lons2[i])
+        return distances
+
+    haversine_m = _haversine_jit
+    haversine_cos_m = _haversine_cos_jit
+    haversine_m_vec = _haversine_vec_jit
+else:
+    haversine_m = _haversine_py
+    haversine_cos_m = _haversine_cos_py
+    haversine_m_vec = _haversine_vec_numpy
+
+if _haversine_c is not None:
+    # The C kernel has the lowest per-call overhead for scalar distances,
+    # while the parallel Numba kernel stays preferred for arrays
+    haversine_m = _haversine_c
+    haversine_cos_m = _haversine_cos_c
+    if njit is None:
+        haversine_m_vec = _haversine_bulk_c
@@ -9,15 +9,21 @@ This module implements a routing agent that follows the problem formulation stru
 - Path Cost: Travel time (primary), with multi-criteria extension capability
 """
 
+import asyncio
 import logging
 import os
-from datetime import datetime
-from typing import Optional, List, Dict, Any, Tuple
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import replace
+from typing import Optional, Iterator, List, Dict, Any, Tuple
+import numpy as np
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 try:
     from arcgis.gis import GIS
-    from arcgis.geocoding import geocode
+    from arcgis.geocoding import geocode, batch_geocode
     from arcgis.network.analysis import find_routes
     from arcgis.geometry import Point, Polyline
     from arcgis.features import FeatureLayer, FeatureSet, Feature
@@ -27,7 +33,9 @@ except ImportError as e:
         "Please install ArcGIS API for Python: pip install arcgis"
     ) from e
 
-from .location_state import LocationState, RouteSegment, RoutingDecision
+from .cache import MemoryCache, SqliteStore, cache_key
+from .location_state import LocationState, RouteSegment, RoutingDecision, decision_timestamp
+from .rate_limit import TokenBucket
 
 # Load environment variables
 load_dotenv()
@@ -70,6 +78,26 @@ class RoutingAgent:
         self.travel_mode = os.getenv("DEFAULT_TRAVEL_MODE", "Driving")
         self.buffer_meters = float(os.getenv("ROUTE_BUFFER_METERS", "200"))
         
+        # Persistent caches for geocoding and routing results
+        cache_path = os.getenv("ROUTING_CACHE_PATH", "routing_cache.sqlite")
+        self.geocode_cache_ttl = float(os.getenv("GEOCODE_CACHE_TTL_DAYS", "30")) * 86400
+        self.route_cache_ttl = float(os.getenv("ROUTE_CACHE_TTL_HOURS", "24")) * 3600
+        self._geocode_store = SqliteStore(cache_path, table="geocode")
+        self._route_store = SqliteStore(cache_path, table="routes", share_with=self._geocode_store)
+        # In-process L1 above the SQLite L2 for repeated calls within a run,
+        # entries expire together with their SQLite copy
+        self._geocode_memory = MemoryCache(maxsize=256)
+        self._route_memory = MemoryCache(maxsize=1024)
+        
+        # Smooth service calls to the documented rates instead of retrying on HTTP 429
+        geocode_rate = float(os.getenv("GEOCODE_RATE_LIMIT", "1"))
+        route_rate = float(os.getenv("ROUTE_RATE_LIMIT", "5"))
+        self._geocode_limiter = TokenBucket(rate=geocode_rate, capacity=1)
+        self._route_limiter = TokenBucket(rate=route_rate, capacity=route_rate)
+        
+        # Publishing runs in the background so solving does not wait on it
+        self._publish_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="route-publish")
+        
         # Initialize GIS connection
         self.gis = None
         self.route_service = None
@@ -87,25 +115,46 @@ class RoutingAgent:
             elif self.username and self.password:
                 # Use username/password authentication
                 self.gis = GIS(self.org_url, username=self.username, password=self.password)
-                logger.info(f"Connected to ArcGIS as {self.username}")
+                logger.info("Connected to ArcGIS as %s", self.username)
             else:
                 # Try anonymous connection
                 self.gis = GIS()
                 logger.warning("Connected to ArcGIS anonymously - limited functionality")
             
-            # Get routing service
+            self._configure_session()
+            
+            # Get routing service (also warms up the pooled TLS connection)
             # This uses ArcGIS World Route Service
             self.route_service = self.gis.properties.helperServices.route.url
-            logger.info(f"Route service URL: {self.route_service}")
+            logger.info("Route service URL: %s", self.route_service)
             
         except Exception as e:
-            logger.error(f"Failed to connect to ArcGIS: {e}")
+            logger.error("Failed to connect to ArcGIS: %s", e)
             raise
 
+    def _configure_session(self):
+        """Share pooled keep-alive connections with retries across all ArcGIS requests"""
+        session = getattr(getattr(self.gis, "_con", None), "_session", None)
+        if not hasattr(session, "mount"):
+            logger.debug("ArcGIS connection does not expose a requests session, keeping defaults")
+            return
+        
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=(502, 503, 504))
+        )
+        session.mount("https://", adapter)
+        logger.debug("Mounted pooled HTTPS adapter on ArcGIS session")
+
     def geocode_location(self, address: str, country: str = "Germany") -> LocationState:
         """
         Geocode an address to get coordinates (Initial State / Goal State)
         
+        Results are cached in-process and in the persistent SQLite store, so
+        repeated addresses skip the geocoding service round-trip. Every call
+        returns its own LocationState.
+        
         Args:
             address: Address string (e.g., "Bonn, Germany")
             country: Country for geocoding context
@@ -113,12 +162,124 @@ class RoutingAgent:
         Returns:
             LocationState with coordinates and address
         """
-        logger.info(f"Geocoding address: {address}")
+        logger.info("Geocoding address: %s", address)
+        return self._geocode_cached(address, country)
+
+    def geocode_locations(self, addresses: List[str], country: str = "Germany") -> List[LocationState]:
+        """
+        Geocode several addresses using as few service requests as possible
+        
+        Cached addresses are served from the caches; the remaining ones are sent
+        to the geocoding service in a single batch request.
+        
+        Args:
+            addresses: Address strings (e.g., ["Bonn, Germany", "Remagen, Germany"])
+            country: Country for geocoding context
+            
+        Returns:
+            LocationState for each address, in input order
+        """
+        logger.info("Geocoding %s addresses", len(addresses))
+        
+        resolved = {}
+        missing = []
+        for address in dict.fromkeys(addresses):
+            key = cache_key(address, country)
+            location_state = self._geocode_memory.get(key)
+            if location_state is None:
+                stored = self._geocode_from_store(key)
+                if stored is None:
+                    missing.append(address)
+                    continue
+                location_state, expires_at = stored
+                self._geocode_memory.set(key, location_state, expires_at)
+            resolved[address] = location_state
+        
+        if missing:
+            # Batch results go straight into both caches, no read back from the store
+            for address, location_state in zip(missing, self._batch_geocode_remote(missing, country)):
+                key = cache_key(address, country)
+                self._geocode_memory.set(key, location_state, self._store_geocode(key, location_state))
+                resolved[address] = location_state
+        
+        # Copy per address, changes made by a caller must not leak into later geocodes
+        return [replace(resolved[address]) for address in addresses]
+
+    def _batch_geocode_remote(self, addresses: List[str], country: str) -> List[LocationState]:
+        """Geocode addresses in one batch request, or concurrently if batching is unavailable"""
+        try:
+            results = self._geocode_limiter.call(
+                batch_geocode, [f"{address}, {country}" for address in addresses]
+            )
+        except Exception as e:
+            logger.warning("Batch geocoding unavailable (%s), geocoding concurrently", e)
+            with ThreadPoolExecutor(max_workers=min(len(addresses), 4)) as executor:
+                return list(executor.map(lambda address: self._geocode_remote(address, country), addresses))
         
+        location_states = []
+        for address, result in zip(addresses, results):
+            location = result.get("location") if result else None
+            if not location or location.get("x") is None:
+                raise ValueError(f"Could not geocode address: {address}")
+            
+            attributes = result.get("attributes", {})
+            location_state = LocationState(
+                latitude=location["y"],
+                longitude=location["x"],
+                address=attributes.get('PlaceName') or address
+            )
+            logger.debug("Geocoded %s to %s", address, location_state)
+            location_states.append(location_state)
+        return location_states
+
+    def _geocode_cached(self, address: str, country: str) -> LocationState:
+        """Look up the geocode in the in-process cache, then the persistent store, then the service"""
+        key = cache_key(address, country)
+        location_state = self._geocode_memory.get(key)
+        if location_state is None:
+            location_state, expires_at = self._geocode_with_store(key, address, country)
+            self._geocode_memory.set(key, location_state, expires_at)
+        # Copy per call, changes made by a caller must not leak into later geocodes
+        return replace(location_state)
+
+    def _geocode_with_store(self, key: str, address: str, country: str) -> Tuple[LocationState, Optional[float]]:
+        """Look up the geocode in the persistent store, falling back to the service"""
+        stored = self._geocode_from_store(key)
+        if stored is not None:
+            logger.info("Geocode cache hit for %s: %s", address, stored[0])
+            return stored
+        
+        location_state = self._geocode_remote(address, country)
+        return location_state, self._store_geocode(key, location_state)
+    
+    def _geocode_from_store(self, key: str) -> Optional[Tuple[LocationState, Optional[float]]]:
+        """Geocode and expiry time (epoch seconds) from the persistent store, None on a miss"""
+        entry = self._geocode_store.get_entry(key)
+        if entry is None:
+            return None
+        payload, expires_at = entry
+        location_state = LocationState(
+            latitude=payload["lat"],
+            longitude=payload["lon"],
+            address=payload["place_name"]
+        )
+        return location_state, expires_at
+    
+    def _store_geocode(self, key: str, location_state: LocationState) -> Optional[float]:
+        """Persist a geocode, returning its expiry time (epoch seconds)"""
+        return self._geocode_store.set(key, {
+            "lat": location_state.latitude,
+            "lon": location_state.longitude,
+            "place_name": location_state.address,
+        }, ttl=self.geocode_cache_ttl)
+
+    def _geocode_remote(self, address: str, country: str) -> LocationState:
+        """Geocode an address using the ArcGIS World Geocoding Service"""
         try:
             # Use ArcGIS geocoding service with the default GIS instance's geocoder            
-            geocode_result = geocode(
-                address=f"{address}, {country}", 
+            geocode_result = self._geocode_limiter.call(
+                geocode,
+                address=f"{address}, {country}",
                 max_locations=1,
                 as_featureset=True
             )
@@ -133,32 +294,74 @@ class RoutingAgent:
             location_state = LocationState(
                 latitude=geometry.y,
                 longitude=geometry.x,
-                address=attributes.get('PlaceName', address),
-                timestamp=datetime.now()
+                address=attributes.get('PlaceName', address)
             )
             
-            logger.info(f"Geocoded {address} to {location_state}")
+            logger.info("Geocoded %s to %s", address, location_state)
             return location_state
             
         except Exception as e:
-            logger.error(f"Error geocoding {address}: {e}")
+            logger.error("Error geocoding %s: %s", address, e)
             raise
 
     def compute_route(self, 
                      start_state: LocationState, 
-                     end_state: LocationState) -> RoutingDecision:
+                     end_state: LocationState,
+                     include_directions: bool = False) -> RoutingDecision:
         """
         Apply transition model: compute route from start to end using ArcGIS routing
         
+        Successful routes are cached by endpoint coordinates rounded to 4 decimals
+        (~11 m, well below the goal test buffer), travel mode and route service.
+        
         Args:
             start_state: Starting location state
             end_state: Destination location state
+            include_directions: Request turn-by-turn directions and return one
+                segment per maneuver; otherwise a single segment with the totals
             
         Returns:
             RoutingDecision with route segments and costs
         """
-        logger.info(f"Computing route from {start_state} to {end_state}")
+        logger.info("Computing route from %s to %s", start_state, end_state)
+        
+        key = cache_key(
+            "route",
+            round(start_state.latitude, 4), round(start_state.longitude, 4),
+            round(end_state.latitude, 4), round(end_state.longitude, 4),
+            self.travel_mode, self.route_service, include_directions
+        )
+        payload = self._load_route_payload(key)
+        if payload is None:
+            routing_decision = self._compute_route_remote(start_state, end_state, include_directions)
+            if routing_decision.confidence > 0:
+                self._route_store.set(key, routing_decision.to_dict(), ttl=self.route_cache_ttl)
+            return routing_decision
         
+        routing_decision = RoutingDecision.from_dict(payload, start_state, end_state)
+        if routing_decision.route_geometry:
+            routing_decision.route_geometry = Polyline(routing_decision.route_geometry)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Route cache hit: %s", routing_decision.summary())
+        return routing_decision
+
+    def _load_route_payload(self, key: str) -> Optional[Dict[str, Any]]:
+        """Load a cached route payload from the in-process cache or the persistent store, None on a miss"""
+        payload = self._route_memory.get(key)
+        if payload is not None:
+            return payload
+        entry = self._route_store.get_entry(key)
+        if entry is None:
+            return None
+        payload, expires_at = entry
+        self._route_memory.set(key, payload, expires_at)
+        return payload
+
+    def _compute_route_remote(self,
+                              start_state: LocationState,
+                              end_state: LocationState,
+                              include_directions: bool) -> RoutingDecision:
+        """Compute the route using the ArcGIS routing service"""
         try:
             # Using find routes directly
             # Define stops as a FeatureSet
@@ -180,9 +383,11 @@ class RoutingAgent:
             ])
             
             # Solve the route
-            route_result = find_routes(
+            route_result = self._route_limiter.call(
+                find_routes,
                 stops=stops,
                 #travel_mode=self.travel_mode,
+                populate_directions=include_directions,
             )
             
             # Extract route information
@@ -199,43 +404,9 @@ class RoutingAgent:
             
             # Extract route segments from directions
             route_segments = []
-            if hasattr(route_result, 'output_directions') and route_result.output_directions:
-                directions = route_result.output_directions
-                if hasattr(directions, 'features'):
-                    for i, direction_feature in enumerate(directions.features):
-                        dir_attrs = direction_feature.attributes
-                        segment_geometry = direction_feature.geometry
-                        
-                        # Create segment start/end locations (simplified)
-                        if i == 0:
-                            segment_start = start_state
-                        else:
-                            # Use previous segment end as start
-                            segment_start = route_segments[-1].end_location
-                        
-                        if i == len(directions.features) - 1:
-                            segment_end = end_state
-                        else:
-                            # Approximate end location from geometry
-                            if hasattr(segment_geometry, 'paths') and segment_geometry.paths:
-                                segment_polyline = Polyline(segment_geometry)
-                                last_point = segment_polyline.last_point
-                                segment_end = LocationState(
-                                    latitude=last_point[1],
-                                    longitude=last_point[0]
-                                )
-                            else:
-                                segment_end = end_state
-                        
-                        segment = RouteSegment(
-                            start_location=segment_start,
-                            end_location=segment_end,
-                            travel_time_minutes=dir_attrs.get('ElapsedTime', 0),
-                            distance_km=dir_attrs.get('DriveDistance', 0),
-                            instructions=dir_attrs.get('Text', ''),
-                            geometry=segment_geometry.as_dict() if hasattr(segment_geometry, 'as_dict') else None
-                        )
-                        route_segments.append(segment)
+            directions = getattr(route_result, 'output_directions', None) if include_directions else None
+            if directions and hasattr(directions, 'features'):
+                route_segments = list(self._iter_segments(directions.features, start_state, end_state))
             
             # If no detailed segments, create single segment
             if not route_segments:
@@ -264,15 +435,16 @@ class RoutingAgent:
                 current_state=start_state,
                 target_state=end_state,
                 confidence=confidence,
-                timestamp=datetime.now(),
+                timestamp=None,
                 route_geometry=route_geometry
             )
             
-            logger.info(f"Route computed: {routing_decision.summary()}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Route computed: %s", routing_decision.summary())
             return routing_decision
             
         except Exception as e:
-            logger.error(f"Error computing route: {e}")
+            logger.error("Error computing route: %s", e)
             # Return failed decision
             return RoutingDecision(
                 route_segments=[],
@@ -282,8 +454,43 @@ class RoutingAgent:
                 current_state=start_state,
                 target_state=end_state,
                 confidence=0.0,
-                timestamp=datetime.now()
+                timestamp=None
+            )
+
+    @staticmethod
+    def _iter_segments(direction_features: List[Feature],
+                       start_state: LocationState,
+                       end_state: LocationState) -> Iterator[RouteSegment]:
+        """
+        Yield one route segment per directions feature in a single pass
+        
+        Each segment starts where the previous one ended; intermediate end
+        locations are taken from the last vertex of the segment geometry.
+        """
+        last_index = len(direction_features) - 1
+        segment_start = start_state
+        for i, direction_feature in enumerate(direction_features):
+            dir_attrs = direction_feature.attributes
+            segment_geometry = direction_feature.geometry
+            paths = getattr(segment_geometry, 'paths', None)
+            spatial_ref = (segment_geometry or {}).get('spatialReference') or {}
+            
+            if i < last_index and paths:
+                last_x, last_y = paths[-1][-1][:2]
+                segment_end = LocationState(latitude=last_y, longitude=last_x)
+            else:
+                segment_end = end_state
+            
+            yield RouteSegment(
+                start_location=segment_start,
+                end_location=segment_end,
+                travel_time_minutes=dir_attrs.get('ElapsedTime', 0),
+                distance_km=dir_attrs.get('DriveDistance', 0),
+                instructions=dir_attrs.get('Text', ''),
+                geometry_paths=np.asarray(paths[0], dtype=np.float64)[:, :2] if paths else None,
+                spatial_ref=spatial_ref.get('wkid', 4326)
             )
+            segment_start = segment_end
 
     def goal_test(self, current_state: LocationState, target_state: LocationState) -> bool:
         """
@@ -296,8 +503,8 @@ class RoutingAgent:
         Returns:
             True if goal is reached (within buffer), False otherwise
         """
-        within_buffer = current_state.within_buffer(target_state, self.buffer_meters)
-        logger.info(f"Goal test: {current_state} within {self.buffer_meters}m of {target_state}: {within_buffer}")
+        within_buffer = current_state.within_buffer_fast(target_state, self.buffer_meters)
+        logger.info("Goal test: %s within %sm of %s: %s", current_state, self.buffer_meters, target_state, within_buffer)
         return within_buffer
 
     def publish_route_to_feature_layer(self, 
@@ -313,16 +520,17 @@ class RoutingAgent:
         Returns:
             Feature layer URL if successful, None otherwise
         """
-        logger.info(f"Publishing route to feature layer: {layer_name}")
+        logger.info("Publishing route to feature layer: %s", layer_name)
         
         try:
-            if not routing_decision.route_geometry:
+            route_geometry = routing_decision.as_arcgis_geometry()
+            if not route_geometry:
                 logger.warning("No route geometry to publish")
                 return None
             
             # Create feature for the route
             route_feature = Feature(
-                geometry=routing_decision.route_geometry,
+                geometry=route_geometry,
                 attributes={
                     "Name": layer_name,
                     "StartAddress": routing_decision.current_state.address or "Start",
@@ -345,16 +553,49 @@ class RoutingAgent:
                 tags=["routing", "agent", "bonn", "remagen"]
             )
             
-            logger.info(f"Route published successfully: {published_item.url}")
+            logger.info("Route published successfully: %s", published_item.url)
             return published_item.url
             
         except Exception as e:
-            logger.error(f"Error publishing route to feature layer: {e}")
+            logger.error("Error publishing route to feature layer: %s", e)
             return None
 
+    def submit_publish(self,
+                       routing_decision: RoutingDecision,
+                       layer_name: str = "Bonn_to_Remagen_Route") -> "Future[Optional[str]]":
+        """
+        Publish route results in the background
+        
+        Args:
+            routing_decision: The routing decision to publish
+            layer_name: Name for the feature layer
+            
+        Returns:
+            Future resolving to the feature layer URL (None if publishing failed)
+        """
+        future = self._publish_executor.submit(
+            self.publish_route_to_feature_layer, routing_decision, layer_name
+        )
+        future.add_done_callback(self._log_published_url)
+        return future
+
+    @staticmethod
+    def _log_published_url(future: "Future[Optional[str]]") -> None:
+        """Log the feature layer URL once background publishing completes"""
+        feature_layer_url = future.result()
+        if feature_layer_url:
+            logger.info("Route published to: %s", feature_layer_url)
+
+    def close(self) -> None:
+        """Wait for pending publish jobs and release cache connections"""
+        self._publish_executor.shutdown(wait=True)
+        self._geocode_store.close()
+        self._route_store.close()
+
     def solve_routing_problem(self, 
                             start_address: str = "Bonn, Germany",
-                            end_address: str = "Remagen, Germany") -> RoutingDecision:
+                            end_address: str = "Remagen, Germany",
+                            include_directions: bool = False) -> RoutingDecision:
         """
         Main method to solve the routing problem from start to end address
         Following the complete problem formulation structure
@@ -362,23 +603,28 @@ class RoutingAgent:
         Args:
             start_address: Starting address (default: Bonn, Germany)
             end_address: Destination address (default: Remagen, Germany)
+            include_directions: Return one route segment per turn-by-turn maneuver
             
         Returns:
             RoutingDecision with complete route information
         """
-        logger.info(f"Solving routing problem: {start_address} → {end_address}")
+        logger.info("Solving routing problem: %s → %s", start_address, end_address)
+        # All states created while solving share one timestamp
+        token = decision_timestamp.set(time.time_ns())
         
         try:
-            # Step 1: Define Initial State (geocode start location)
-            start_state = self.geocode_location(start_address)
-            logger.info(f"Initial state: {start_state}")
+            # Step 1 & 2: Define Initial State and Goal State (geocode both in one request)
+            start_state, goal_state = self.geocode_locations([start_address, end_address])
+            logger.info("Initial state: %s", start_state)
+            logger.info("Goal state: %s", goal_state)
             
-            # Step 2: Define Goal State (geocode destination)
-            goal_state = self.geocode_location(end_address)
-            logger.info(f"Goal state: {goal_state}")
+            # Goal test before routing: no service call if we are already there
+            if self.goal_test(start_state, goal_state):
+                logger.info("Start is within the goal buffer, skipping route computation")
+                return RoutingDecision.at_goal(start_state, goal_state)
             
             # Step 3: Apply Transition Model (compute route)
-            routing_decision = self.compute_route(start_state, goal_state)
+            routing_decision = self.compute_route(start_state, goal_state, include_directions)
             
             # Step 4: Goal Test (verify destination reached)
             goal_reached = self.goal_test(
@@ -387,17 +633,62 @@ class RoutingAgent:
             )
             routing_decision.goal_reached = goal_reached
             
-            # Step 5: Publish results for inspection
-            feature_layer_url = self.publish_route_to_feature_layer(routing_decision)
-            if feature_layer_url:
-                logger.info(f"Route published to: {feature_layer_url}")
+            # Step 5: Publish results for inspection (in the background)
+            self.submit_publish(routing_decision)
             
-            logger.info(f"Routing problem solved: {routing_decision.summary()}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Routing problem solved: %s", routing_decision.summary())
             return routing_decision
             
         except Exception as e:
-            logger.error(f"Error solving routing problem: {e}")
+            logger.error("Error solving routing problem: %s", e)
             raise
+        finally:
+            decision_timestamp.reset(token)
+
+    async def solve_routing_problem_async(self,
+                                          start_address: str = "Bonn, Germany",
+                                          end_address: str = "Remagen, Germany",
+                                          include_directions: bool = False) -> RoutingDecision:
+        """
+        Asynchronous variant of solve_routing_problem
+        
+        Each ArcGIS call runs in a worker thread, so several routing problems can
+        be solved concurrently with asyncio.gather.
+        
+        Args:
+            start_address: Starting address (default: Bonn, Germany)
+            end_address: Destination address (default: Remagen, Germany)
+            include_directions: Return one route segment per turn-by-turn maneuver
+            
+        Returns:
+            RoutingDecision with complete route information
+        """
+        logger.info("Solving routing problem asynchronously: %s → %s", start_address, end_address)
+        # asyncio.to_thread copies the context, so worker threads see the timestamp
+        token = decision_timestamp.set(time.time_ns())
+        
+        try:
+            start_state, goal_state = await asyncio.to_thread(
+                self.geocode_locations, [start_address, end_address]
+            )
+            if self.goal_test(start_state, goal_state):
+                logger.info("Start is within the goal buffer, skipping route computation")
+                return RoutingDecision.at_goal(start_state, goal_state)
+            routing_decision = await asyncio.to_thread(
+                self.compute_route, start_state, goal_state, include_directions
+            )
+        finally:
+            decision_timestamp.reset(token)
+        routing_decision.goal_reached = self.goal_test(
+            routing_decision.current_state,
+            routing_decision.target_state
+        )
+        self.submit_publish(routing_decision)
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Routing problem solved: %s", routing_decision.summary())
+        return routing_decision
 
     def validate_decision(self, routing_decision: RoutingDecision) -> bool:
         """
@@ -421,20 +712,29 @@ class RoutingAgent:
             logger.error("Goal reached but no route segments")
             return False
         
-        # Check coordinate validity
-        for segment in routing_decision.route_segments:
-            if not self._is_valid_coordinate(segment.start_location) or \
-               not self._is_valid_coordinate(segment.end_location):
-                logger.error("Invalid coordinates in route segments")
-                return False
+        # Check coordinate validity of the start and target states, then of
+        # all segment endpoints in one vectorized pass
+        if not (self._is_valid_coordinate(routing_decision.current_state) and
+                self._is_valid_coordinate(routing_decision.target_state)):
+            logger.error("Invalid coordinates of the start or target location")
+            return False
+        
+        arrays = routing_decision.arrays
+        valid = np.ones(len(routing_decision.route_segments), dtype=bool)
+        for name, bound in (("start_lat", 90), ("start_lon", 180), ("end_lat", 90), ("end_lon", 180)):
+            valid &= np.abs(arrays[name]) <= bound
+        if not valid.all():
+            logger.error("Invalid coordinates in route segments")
+            return False
         
         logger.info("Routing decision validated successfully")
         return True
     
     def _is_valid_coordinate(self, location: LocationState) -> bool:
         """Check if location has valid coordinates"""
-        return (-90 <= location.latitude <= 90 and 
-                -180 <= location.longitude <= 180)
+        # Squared bounds: one multiply and compare per axis, NaN fails both
+        latitude, longitude = location.latitude, location.longitude
+        return latitude * latitude <= 8100.0 and longitude * longitude <= 32400.0
 
 
 # Example usage
@@ -443,7 +743,7 @@ if __name__ == "__main__":
     agent = RoutingAgent()
     
     # Solve the Bonn to Remagen routing problem
-    result = agent.solve_routing_problem()
+    result = agent.solve_routing_problem(include_directions=True)
     
     print(f"\n--- Routing Results ---")
     print(f"Route: {result.summary()}")
@@ -0,0 +1,202 @@
+"""
+Persistent Cache for Routing Agent Service Calls
+
+This module provides a small key/value store backed by SQLite so that repeated
+geocoding and routing requests can skip the network round-trip entirely, and
+an in-process LRU cache in front of it that honours the same expiry times.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from .serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(*parts: Any) -> str:
+    """
+    Build a stable cache key from the given parts
+
+    Args:
+        parts: Values identifying the cached request (address, country, ...)
+
+    Returns:
+        SHA-1 hex digest of the lower-cased, pipe-joined parts
+    """
+    raw = "|".join(str(part) for part in parts).lower()
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class SqliteStore:
+    """Key/value store persisting JSON payloads in SQLite with per-entry TTL"""
+
+    def __init__(self,
+                 path: str = "routing_cache.sqlite",
+                 table: str = "cache",
+                 share_with: Optional["SqliteStore"] = None):
+        """
+        Open (or create) the SQLite cache database
+
+        Args:
+            path: Database file path (":memory:" keeps the cache in-process)
+            table: Table name holding the cache entries
+            share_with: Existing store whose connection (and lock) is reused
+        """
+        self.path = path
+        self.table = table
+        if share_with is not None:
+            self.path = share_with.path
+            self._lock = share_with._lock
+            self._conn = share_with._conn
+        else:
+            self._lock = threading.Lock()
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            # WAL lets concurrent agent processes read while one of them writes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Return the payload stored under key, or None if missing or expired
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Deserialized payload or None
+        """
+        entry = self.get_entry(key)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        """
+        Return the payload stored under key with its expiry time
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of the deserialized payload and its expiry time (epoch
+            seconds, None if it never expires), or None if missing or expired
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, expires_at = row
+            if expires_at is not None and expires_at < time.time():
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+
+        return loads(value), expires_at
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> Optional[float]:
+        """
+        Store a JSON-serializable payload under key
+
+        Args:
+            key: Cache key
+            value: JSON-serializable payload
+            ttl: Time to live in seconds (None keeps the entry forever)
+
+        Returns:
+            Expiry time of the entry (epoch seconds), None if it never expires
+        """
+        expires_at = time.time() + ttl if ttl is not None else None
+        payload = dumps(value)
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, payload, expires_at),
+            )
+            self._conn.commit()
+        return expires_at
+
+    def delete(self, key: str) -> None:
+        """Remove the entry stored under key"""
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove all entries from the store"""
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+class MemoryCache:
+    """In-process LRU cache whose entries carry the expiry time of their persistent copy"""
+
+    def __init__(self, maxsize: int = 256):
+        """
+        Create an empty cache
+
+        Args:
+            maxsize: Number of entries kept before the least recently used is evicted
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Return the value cached under key, or None if missing or expired
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.time():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, expires_at: Optional[float] = None) -> None:
+        """
+        Cache a value under key until the given time
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            expires_at: Expiry time in epoch seconds (None keeps the entry until evicted)
+        """
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries from the cache"""
+        with self._lock:
+            self._entries.clear()
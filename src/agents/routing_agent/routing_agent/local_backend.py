@@ -0,0 +1,202 @@
+"""
+Local Routing Backend using A* Search on a Road Network Graph
+
+This module provides an alternative transition model to the ArcGIS routing
+service: routes are searched locally on a road network graph (e.g. built from
+OpenStreetMap) with A*, guided by a straight-line Haversine heuristic and
+optional ALT (A*, Landmarks, Triangle inequality) lower bounds.
+"""
+
+import logging
+from typing import Any, Dict, Hashable, List
+
+import numpy as np
+
+try:
+    import networkx as nx
+except ImportError as e:
+    raise ImportError(
+        "Please install NetworkX for local routing: pip install networkx"
+    ) from e
+
+from ._kernels import haversine_m
+from .location_state import LocationState, RouteSegment, RoutingDecision
+
+logger = logging.getLogger(__name__)
+
+
+class LocalRoutingBackend:
+    """
+    Compute routes on a local road network graph with A* search
+
+    Nodes must carry "y" (latitude) and "x" (longitude) attributes and edges a
+    "travel_time" (seconds) and "length" (meters) attribute, which is the
+    convention used by OSMnx graphs.
+    """
+
+    def __init__(self,
+                 graph: "nx.DiGraph",
+                 weight: str = "travel_time",
+                 max_speed_kmh: float = 130,
+                 num_landmarks: int = 0,
+                 buffer_meters: float = 200):
+        """
+        Initialize the backend and precompute heuristic data
+
+        Args:
+            graph: Directed road network graph
+            weight: Edge attribute to minimize ("travel_time" or "length")
+            max_speed_kmh: Upper speed bound keeping the travel time heuristic admissible
+            num_landmarks: Number of ALT landmarks to precompute (0 disables ALT)
+            buffer_meters: Goal test buffer distance
+        """
+        self.graph = graph
+        self.weight = weight
+        self.buffer_meters = buffer_meters
+        # Heuristic scale: meters -> weight units (seconds at max speed, or meters)
+        self._heuristic_scale = 3.6 / max_speed_kmh if weight == "travel_time" else 1.0
+
+        self._nodes = list(graph.nodes)
+        self._coords = {node: (data["y"], data["x"]) for node, data in graph.nodes(data=True)}
+        self._lats = np.array([self._coords[node][0] for node in self._nodes], dtype=np.float64)
+        self._lons = np.array([self._coords[node][1] for node in self._nodes], dtype=np.float64)
+
+        self._landmark_from: List[Dict[Hashable, float]] = []
+        self._landmark_to: List[Dict[Hashable, float]] = []
+        if num_landmarks > 0:
+            self._precompute_landmarks(num_landmarks)
+
+        logger.info("LocalRoutingBackend initialized with %s nodes", len(self._nodes))
+
+    @classmethod
+    def from_osm(cls, place: str, **kwargs: Any) -> "LocalRoutingBackend":
+        """
+        Build the backend from the OpenStreetMap drive network of a place
+
+        Args:
+            place: Place name understood by OSMnx (e.g., "Bonn, Germany")
+            kwargs: Further arguments passed to the constructor
+
+        Returns:
+            LocalRoutingBackend for the place's road network
+        """
+        try:
+            import osmnx as ox
+        except ImportError as e:
+            raise ImportError(
+                "Please install OSMnx to build graphs from OpenStreetMap: pip install osmnx"
+            ) from e
+
+        graph = ox.graph_from_place(place, network_type="drive")
+        graph = ox.add_edge_speeds(graph)
+        graph = ox.add_edge_travel_times(graph)
+        return cls(graph, **kwargs)
+
+    def _precompute_landmarks(self, num_landmarks: int) -> None:
+        """Select landmarks by farthest-point sampling and store their shortest path distances"""
+        reverse_graph = self.graph.reverse(copy=False)
+        landmark = self._nodes[0]
+        min_distances = np.full(len(self._nodes), np.inf)
+
+        for _ in range(min(num_landmarks, len(self._nodes))):
+            self._landmark_from.append(
+                nx.single_source_dijkstra_path_length(self.graph, landmark, weight=self.weight)
+            )
+            self._landmark_to.append(
+                nx.single_source_dijkstra_path_length(reverse_graph, landmark, weight=self.weight)
+            )
+            lat, lon = self._coords[landmark]
+            distances = LocationState(lat, lon).distances_to_array(self._lats, self._lons)
+            min_distances = np.minimum(min_distances, distances)
+            landmark = self._nodes[int(np.argmax(min_distances))]
+
+    def _heuristic(self, u: Hashable, v: Hashable) -> float:
+        """Admissible lower bound on the cost from u to v"""
+        lat1, lon1 = self._coords[u]
+        lat2, lon2 = self._coords[v]
+        bound = haversine_m(lat1, lon1, lat2, lon2) * self._heuristic_scale
+
+        # ALT: triangle inequality bounds from each landmark
+        for dist_from, dist_to in zip(self._landmark_from, self._landmark_to):
+            if u in dist_to and v in dist_to:
+                bound = max(bound, dist_to[u] - dist_to[v])
+            if u in dist_from and v in dist_from:
+                bound = max(bound, dist_from[v] - dist_from[u])
+        return bound
+
+    def nearest_node(self, location: LocationState) -> Hashable:
+        """Return the graph node closest to a location"""
+        distances = location.distances_to_array(self._lats, self._lons)
+        return self._nodes[int(np.argmin(distances))]
+
+    def _edge_data(self, u: Hashable, v: Hashable) -> Dict[str, Any]:
+        """Return the attributes of the cheapest edge from u to v"""
+        data = self.graph.get_edge_data(u, v)
+        if self.graph.is_multigraph():
+            data = min(data.values(), key=lambda edge: edge.get(self.weight, float("inf")))
+        return data
+
+    def compute_route(self,
+                      start_state: LocationState,
+                      end_state: LocationState) -> RoutingDecision:
+        """
+        Apply transition model: compute route from start to end with A* search
+
+        Args:
+            start_state: Starting location state
+            end_state: Destination location state
+
+        Returns:
+            RoutingDecision with one route segment per traversed edge
+        """
+        logger.info("Computing local route from %s to %s", start_state, end_state)
+        source = self.nearest_node(start_state)
+        target = self.nearest_node(end_state)
+
+        try:
+            path = nx.astar_path(self.graph, source, target,
+                                 heuristic=self._heuristic, weight=self.weight)
+        except nx.NetworkXNoPath:
+            logger.error("No local route found between %s and %s", start_state, end_state)
+            return RoutingDecision(
+                route_segments=[],
+                total_travel_time=0,
+                total_distance=0,
+                goal_reached=False,
+                current_state=start_state,
+                target_state=end_state,
+                confidence=0.0,
+                timestamp=None
+            )
+
+        states = [LocationState(*self._coords[node]) for node in path]
+        states[0], states[-1] = start_state, end_state
+        route_segments = []
+        for (u, v), segment_start, segment_end in zip(zip(path, path[1:]), states, states[1:]):
+            edge = self._edge_data(u, v)
+            route_segments.append(RouteSegment(
+                start_location=segment_start,
+                end_location=segment_end,
+                travel_time_minutes=edge.get("travel_time", 0) / 60,
+                distance_km=edge.get("length", 0) / 1000,
+                instructions=edge.get("name") if isinstance(edge.get("name"), str) else None
+            ))
+
+        if not route_segments:
+            # Start and end snap to the same node
+            route_segments = [RouteSegment(start_state, end_state, 0.0, 0.0, "Already at destination")]
+
+        routing_decision = RoutingDecision(
+            route_segments=route_segments,
+            total_travel_time=sum(segment.travel_time_minutes for segment in route_segments),
+            total_distance=sum(segment.distance_km for segment in route_segments),
+            goal_reached=LocationState(*self._coords[target]).within_buffer(end_state, self.buffer_meters),
+            current_state=start_state,
+            target_state=end_state,
+            confidence=1.0,
+            timestamp=None
+        )
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Local route computed: %s", routing_decision.summary())
+        return routing_decision
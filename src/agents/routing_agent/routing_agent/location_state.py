@@ -5,51 +5,162 @@ This module defines the state representation and decision structures for the rou
 """
 
 import logging
-from dataclasses import dataclass
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
 from datetime import datetime
+from math import asin, cos, radians, sin
 from typing import List, Optional, Tuple, Dict, Any
 
+import numpy as np
+
+from ._kernels import EARTH_RADIUS_METERS, haversine_cos_m, haversine_m_vec
+
 logger = logging.getLogger(__name__)
 
+METERS_PER_DEGREE = radians(1) * EARTH_RADIUS_METERS
+
+# Relative slack on the buffer prefilters so rounding never rejects a point
+# whose exact distance equals the buffer
+PREFILTER_SLACK = 1.0 + 1e-9
+
+# Column order of the structure-of-arrays view on RoutingDecision
+SEGMENT_ARRAY_COLUMNS = ("start_lat", "start_lon", "end_lat", "end_lon", "time", "distance")
+SEGMENT_ARRAY_DTYPE = np.dtype([(name, np.float64) for name in SEGMENT_ARRAY_COLUMNS])
+
+# Default weights of RoutingDecision.get_multi_criteria_cost
+DEFAULT_TIME_WEIGHT = 0.7
+DEFAULT_DISTANCE_WEIGHT = 0.3
+
+# Time (time.time_ns) shared by all states created while solving one routing problem
+decision_timestamp: ContextVar[Optional[int]] = ContextVar("decision_timestamp", default=None)
+
+
+def _decision_datetime() -> datetime:
+    """Datetime of the routing decision in progress, the current time outside of one"""
+    stamp = decision_timestamp.get()
+    # Fresh clock reads are converted directly, only shared stamps go through the cache
+    return datetime.now() if stamp is None else _ns_datetime(stamp)
 
-@dataclass
+
+@lru_cache(maxsize=64)
+def _ns_datetime(stamp: int) -> datetime:
+    """Local datetime of a time.time_ns() stamp, converted once per decision stamp"""
+    seconds, nanoseconds = divmod(stamp, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=nanoseconds // 1000)
+
+
+@dataclass(slots=True)
 class LocationState:
     """Represents a location state in the routing problem"""
     
     latitude: float
     longitude: float
     address: Optional[str] = None
-    timestamp: datetime = None
+    timestamp: Optional[datetime] = field(default=None, compare=False)
+    _cos_lat: Optional[float] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         if self.timestamp is None:
-            self.timestamp = datetime.now()
+            # States created during one routing decision share its datetime
+            self.timestamp = _decision_datetime()
+    
+    @property
+    def cos_lat(self) -> float:
+        """Cosine of the latitude, computed once and reused by every distance call"""
+        if self._cos_lat is None:
+            self._cos_lat = cos(radians(self.latitude))
+        return self._cos_lat
     
     def distance_to(self, other: 'LocationState') -> float:
         """
         Calculate approximate distance to another location state using Haversine formula
         Returns distance in meters
         """
-        import math
-        
-        R = 6371000  # Earth's radius in meters
-        
-        lat1_rad = math.radians(self.latitude)
-        lat2_rad = math.radians(other.latitude)
-        delta_lat = math.radians(other.latitude - self.latitude)
-        delta_lon = math.radians(other.longitude - self.longitude)
-        
-        a = (math.sin(delta_lat/2)**2 + 
-             math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon/2)**2)
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-        
-        return R * c
+        return haversine_cos_m(self.latitude, self.longitude, self.cos_lat,
+                               other.latitude, other.longitude, other.cos_lat)
+    
+    def distances_to_array(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """
+        Calculate Haversine distances to many locations in one vectorized pass
+        Returns distances in meters, one per (lat, lon) pair
+        """
+        return self.distance_to_batch(self.latitude, self.longitude, lats, lons)
+    
+    @classmethod
+    def distance_to_batch(cls, lat1, lon1, lat2, lon2) -> np.ndarray:
+        """
+        Calculate Haversine distances between many pairs of coordinates at once
+        Scalars are broadcast against arrays; returns distances in meters
+        """
+        shape = np.broadcast_shapes(np.shape(lat1), np.shape(lon1), np.shape(lat2), np.shape(lon2))
+        lat1, lon1, lat2, lon2 = (
+            np.ascontiguousarray(np.broadcast_to(values, shape), dtype=np.float64).ravel()
+            for values in (lat1, lon1, lat2, lon2)
+        )
+        return haversine_m_vec(lat1, lon1, lat2, lon2)
     
     def within_buffer(self, other: 'LocationState', buffer_meters: float) -> bool:
         """Check if this location is within buffer distance of another location"""
+        # Prefilters: the great-circle distance is never shorter than the meridian
+        # distance, so far-apart points are rejected without trig
+        limit = buffer_meters * PREFILTER_SLACK
+        if abs(other.latitude - self.latitude) * METERS_PER_DEGREE > limit:
+            return False
+        # Nor shorter than the arc spanned by the longitude difference at the
+        # higher of the two latitudes: sin(d/2R) >= cos(max_lat) * sin(dlon/2)
+        delta_lon = abs(other.longitude - self.longitude)
+        delta_lon = min(delta_lon, 360 - delta_lon)
+        max_lat = max(abs(self.latitude), abs(other.latitude))
+        chord = cos(radians(max_lat)) * sin(radians(delta_lon) / 2)
+        if 2 * EARTH_RADIUS_METERS * asin(min(chord, 1.0)) > limit:
+            return False
         distance = self.distance_to(other)
         return distance <= buffer_meters
     
+    def within_buffer_array(self, lats: np.ndarray, lons: np.ndarray, buffer_meters: float) -> np.ndarray:
+        """
+        Check many locations against the buffer distance in one pass
+        Bounding-box masks reject far-away points so the Haversine kernel only
+        runs on the survivors; returns one boolean per (lat, lon) pair
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        within = np.zeros(lats.shape, dtype=bool)
+        
+        # Same lower bounds as within_buffer: meridian distance, then the arc
+        # spanned by the longitude difference at the higher latitude
+        limit = buffer_meters * PREFILTER_SLACK
+        candidates = np.flatnonzero(np.abs(lats - self.latitude) * METERS_PER_DEGREE <= limit)
+        delta_lon = np.abs(lons[candidates] - self.longitude)
+        delta_lon = np.minimum(delta_lon, 360 - delta_lon)
+        max_lat = np.maximum(abs(self.latitude), np.abs(lats[candidates]))
+        chord = np.cos(np.radians(max_lat)) * np.sin(np.radians(delta_lon) / 2)
+        candidates = candidates[2 * EARTH_RADIUS_METERS * np.arcsin(np.minimum(chord, 1.0)) <= limit]
+        
+        if candidates.size:
+            within[candidates] = self.distances_to_array(lats[candidates], lons[candidates]) <= buffer_meters
+        return within
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize coordinates and address to a JSON-compatible dict"""
+        return {"lat": self.latitude, "lon": self.longitude, "address": self.address}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LocationState':
+        """Rebuild a location state from the output of to_dict"""
+        return cls(latitude=data["lat"], longitude=data["lon"], address=data.get("address"))
+    
+    def within_buffer_fast(self, other: 'LocationState', buffer_meters: float) -> bool:
+        """
+        Check buffer distance using an equirectangular approximation
+        Sub-meter error for sub-kilometer buffers; use within_buffer when the
+        exact great-circle distance matters
+        """
+        dx = (other.longitude - self.longitude) * METERS_PER_DEGREE * self.cos_lat
+        dy = (other.latitude - self.latitude) * METERS_PER_DEGREE
+        return dx*dx + dy*dy <= buffer_meters*buffer_meters
+    
     def __str__(self):
         return f"LocationState({self.latitude:.6f}, {self.longitude:.6f})"
     
@@ -57,7 +168,8 @@ class LocationState:
         return self.__str__()
 
 
-@dataclass
+
+@dataclass(slots=True)
 class RouteSegment:
     """Represents a segment in a route with cost information"""
     
@@ -66,15 +178,58 @@ class RouteSegment:
     travel_time_minutes: float
     distance_km: float
     instructions: Optional[str] = None
-    geometry: Optional[Dict[str, Any]] = None  # Store route geometry
+    geometry_paths: Optional[np.ndarray] = None  # (P, 2) array of x/y vertices
+    spatial_ref: int = 4326  # WKID of the vertex coordinates
     
     @property
     def cost(self) -> float:
         """Primary cost metric (travel time in minutes)"""
         return self.travel_time_minutes
+    
+    @property
+    def __geo_interface__(self) -> Optional[Dict[str, Any]]:
+        """GeoJSON LineString of the segment, built on access"""
+        if self.geometry_paths is None:
+            return None
+        return {"type": "LineString", "coordinates": self.geometry_paths.tolist()}
+    
+    def as_arcgis_geometry(self) -> Optional[Dict[str, Any]]:
+        """Build the ArcGIS polyline JSON of the segment on demand"""
+        if self.geometry_paths is None:
+            return None
+        return {
+            "paths": [self.geometry_paths.tolist()],
+            "spatialReference": {"wkid": self.spatial_ref},
+        }
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the segment to a JSON-compatible dict"""
+        return {
+            "start": self.start_location.to_dict(),
+            "end": self.end_location.to_dict(),
+            "time": self.travel_time_minutes,
+            "distance": self.distance_km,
+            "instructions": self.instructions,
+            "paths": self.geometry_paths,
+            "spatial_ref": self.spatial_ref,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RouteSegment':
+        """Rebuild a route segment from the output of to_dict"""
+        paths = data.get("paths")
+        return cls(
+            start_location=LocationState.from_dict(data["start"]),
+            end_location=LocationState.from_dict(data["end"]),
+            travel_time_minutes=data["time"],
+            distance_km=data["distance"],
+            instructions=data.get("instructions"),
+            geometry_paths=np.asarray(paths, dtype=np.float64) if paths is not None else None,
+            spatial_ref=data.get("spatial_ref", 4326),
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class RoutingDecision:
     """Decision output from the routing agent"""
     
@@ -87,17 +242,114 @@ class RoutingDecision:
     confidence: float  # 0-1 confidence in the route
     timestamp: datetime
     route_geometry: Optional[Dict[str, Any]] = None  # Full route polyline
+    _arrays: Optional[Dict[str, np.ndarray]] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         if self.timestamp is None:
-            self.timestamp = datetime.now()
+            self.timestamp = _decision_datetime()
     
     @property
     def path_cost(self) -> float:
         """Total path cost (primary metric: travel time)"""
         return self.total_travel_time
     
-    def get_multi_criteria_cost(self, time_weight: float = 0.7, distance_weight: float = 0.3) -> float:
+    @property
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Structure-of-arrays view of the route segments for bulk numeric work
+        Built from route_segments on first access, keyed by SEGMENT_ARRAY_COLUMNS
+        """
+        if self._arrays is None:
+            # Fill the record array straight from the generator, no intermediate list
+            records = np.fromiter(
+                ((segment.start_location.latitude, segment.start_location.longitude,
+                  segment.end_location.latitude, segment.end_location.longitude,
+                  segment.travel_time_minutes, segment.distance_km)
+                 for segment in self.route_segments),
+                dtype=SEGMENT_ARRAY_DTYPE,
+                count=len(self.route_segments)
+            )
+            self._arrays = {name: records[name] for name in SEGMENT_ARRAY_COLUMNS}
+        return self._arrays
+    
+    @classmethod
+    def at_goal(cls, current_state: LocationState, target_state: LocationState) -> 'RoutingDecision':
+        """Zero-cost decision for a start state that already passes the goal test"""
+        return cls(
+            route_segments=[RouteSegment(current_state, target_state, 0.0, 0.0, "Already at destination")],
+            total_travel_time=0.0,
+            total_distance=0.0,
+            goal_reached=True,
+            current_state=current_state,
+            target_state=target_state,
+            confidence=1.0,
+            timestamp=None,
+        )
+    
+    @property
+    def __geo_interface__(self) -> Optional[Dict[str, Any]]:
+        """
+        GeoJSON geometry of the route
+        Uses route_geometry when present, otherwise joins the segment vertex arrays
+        """
+        if self.route_geometry is not None:
+            return getattr(self.route_geometry, "__geo_interface__", self.route_geometry)
+        vertices = self._joined_segment_paths()
+        if vertices is None:
+            return None
+        return {"type": "LineString", "coordinates": vertices.tolist()}
+    
+    def as_arcgis_geometry(self) -> Optional[Dict[str, Any]]:
+        """
+        ArcGIS polyline JSON of the route
+        Uses route_geometry when present, otherwise joins the segment vertex arrays,
+        so backends keep a single copy of the coordinates on the segments
+        """
+        if self.route_geometry is not None:
+            return self.route_geometry
+        vertices = self._joined_segment_paths()
+        if vertices is None:
+            return None
+        return {
+            "paths": [vertices.tolist()],
+            "spatialReference": {"wkid": next(segment.spatial_ref for segment in self.route_segments
+                                              if segment.geometry_paths is not None)},
+        }
+    
+    def _joined_segment_paths(self) -> Optional[np.ndarray]:
+        """Concatenate the segment vertex arrays into one (N, 2) array, None without geometry"""
+        paths = [segment.geometry_paths for segment in self.route_segments
+                 if segment.geometry_paths is not None and len(segment.geometry_paths)]
+        if not paths:
+            return None
+        # Consecutive segments share their joining vertex, keep it once
+        paths = paths[:1] + [
+            path[1:] if np.array_equal(path[0], previous[-1]) else path
+            for previous, path in zip(paths, paths[1:])
+        ]
+        return np.concatenate(paths)
+    
+    def segment_features(self) -> List[Dict[str, Any]]:
+        """
+        GeoJSON features of the route segments that carry geometry
+        Coordinates stay float64 arrays so the serializer can write them in bulk
+        """
+        return [
+            {
+                "type": "Feature",
+                "geometry": {"type": "LineString", "coordinates": segment.geometry_paths},
+                "properties": {
+                    "time": segment.travel_time_minutes,
+                    "distance": segment.distance_km,
+                    "instructions": segment.instructions,
+                },
+            }
+            for segment in self.route_segments
+            if segment.geometry_paths is not None and len(segment.geometry_paths)
+        ]
+    
+    def get_multi_criteria_cost(self, time_weight: float = DEFAULT_TIME_WEIGHT,
+                                distance_weight: float = DEFAULT_DISTANCE_WEIGHT) -> float:
         """
         Calculate multi-criteria cost combining time and distance
         Can be extended for risk factors later
@@ -108,6 +360,34 @@ class RoutingDecision:
         
         return (time_weight * normalized_time + distance_weight * normalized_distance)
     
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the route part of the decision (states are supplied on rebuild)"""
+        return {
+            "segments": [segment.to_dict() for segment in self.route_segments],
+            "total_travel_time": self.total_travel_time,
+            "total_distance": self.total_distance,
+            "goal_reached": self.goal_reached,
+            "confidence": self.confidence,
+            "route_geometry": dict(self.route_geometry) if self.route_geometry else None,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any],
+                  current_state: LocationState,
+                  target_state: LocationState) -> 'RoutingDecision':
+        """Rebuild a routing decision from the output of to_dict"""
+        return cls(
+            route_segments=[RouteSegment.from_dict(segment) for segment in data["segments"]],
+            total_travel_time=data["total_travel_time"],
+            total_distance=data["total_distance"],
+            goal_reached=data["goal_reached"],
+            current_state=current_state,
+            target_state=target_state,
+            confidence=data["confidence"],
+            timestamp=None,
+            route_geometry=data.get("route_geometry"),
+        )
+    
     def summary(self) -> str:
         """Return a summary string of the routing decision"""
         status = "✅ Goal reached" if self.goal_reached else "❌ Goal not reached"
@@ -6,11 +6,14 @@ allowing testing and validation without requiring ArcGIS credentials.
 """
 
 import logging
-import math
-from datetime import datetime
+import time
+from dataclasses import replace
 from typing import Optional, List, Dict, Any
 
-from .location_state import LocationState, RouteSegment, RoutingDecision
+import numpy as np
+
+from .location_state import LocationState, RouteSegment, RoutingDecision, decision_timestamp
+from .serialization import dumps_feature_collection
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +26,21 @@ class MockRoutingAgent:
     formulation approach without requiring ArcGIS credentials.
     """
 
+    # Known locations for demo (approximate coordinates), keyed by casefolded address
+    _KNOWN_LOCATIONS = {
+        address.casefold(): location for address, location in {
+            "Bonn, Germany": LocationState(50.7374, 7.0982, "Bonn, DEU"),
+            "Remagen, Germany": LocationState(50.5791, 7.2281, "Remagen, DEU"),
+            "Köln, Germany": LocationState(50.9375, 6.9603, "Köln, DEU"),
+            "Düsseldorf, Germany": LocationState(51.2277, 6.7735, "Düsseldorf, DEU"),
+        }.items()
+    }
+
+    # Roads are ~20% longer than the straight line (rough approximation)
+    _DETOUR_FACTOR = 1.2
+    # Average 50 km/h in city, 80 km/h on highway; for German cities, assume mixed driving
+    _AVG_SPEED_KMH = 60.0
+
     def __init__(self, buffer_meters: float = 200):
         """
         Initialize the mock routing agent
@@ -33,14 +51,6 @@ class MockRoutingAgent:
         self.buffer_meters = buffer_meters
         self.travel_mode = "Driving"
         
-        # Known locations for demo (approximate coordinates)
-        self._known_locations = {
-            "bonn, germany": LocationState(50.7374, 7.0982, "Bonn, DEU"),
-            "remagen, germany": LocationState(50.5791, 7.2281, "Remagen, DEU"),
-            "köln, germany": LocationState(50.9375, 6.9603, "Köln, DEU"),
-            "düsseldorf, germany": LocationState(51.2277, 6.7735, "Düsseldorf, DEU"),
-        }
-        
         logger.info("MockRoutingAgent initialized (no ArcGIS required)")
 
     def geocode_location(self, address: str, country: str = "Germany") -> LocationState:
@@ -54,18 +64,24 @@ class MockRoutingAgent:
         Returns:
             LocationState with coordinates
         """
-        address_key = address.lower()
+        location = self._KNOWN_LOCATIONS.get(address.casefold())
         
-        if address_key in self._known_locations:
-            location = self._known_locations[address_key]
-            logger.info(f"Mock geocoded {address} to {location}")
-            return location
+        if location is not None:
+            logger.info("Mock geocoded %s to %s", address, location)
+            # Copy per call, the known locations are shared by all agents
+            return replace(location)
         else:
             # For unknown addresses, generate approximate coordinates
             # This is just for demo - in reality would fail
-            logger.warning(f"Unknown address {address}, using approximate coordinates")
+            logger.warning("Unknown address %s, using approximate coordinates", address)
             return LocationState(50.0, 7.0, address)
 
+    def geocode_locations(self, addresses: List[str], country: str = "Germany") -> List[LocationState]:
+        """
+        Mock batch geocoding (same interface as real agent)
+        """
+        return [self.geocode_location(address, country) for address in addresses]
+
     def compute_route(self, start_state: LocationState, end_state: LocationState) -> RoutingDecision:
         """
         Mock route computation using simplified calculations
@@ -77,22 +93,53 @@ class MockRoutingAgent:
         Returns:
             RoutingDecision with simulated route
         """
-        logger.info(f"Mock computing route from {start_state} to {end_state}")
+        logger.info("Mock computing route from %s to %s", start_state, end_state)
         
         # Calculate straight-line distance
         distance_m = start_state.distance_to(end_state)
-        distance_km = distance_m / 1000
+        routing_decision = self._simulate_route(start_state, end_state, distance_m)
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Mock route computed: %s", routing_decision.summary())
+        return routing_decision
+
+    def compute_routes(self, start_state: LocationState, end_states: List[LocationState]) -> List[RoutingDecision]:
+        """
+        Mock route computation from one start to many destinations
         
-        # Simulate route by adding 20% for actual roads (rough approximation)
-        actual_distance_km = distance_km * 1.2
+        The straight-line distances to all destinations are computed in a
+        single vectorized pass.
         
-        # Estimate travel time: average 50 km/h in city, 80 km/h on highway
-        # For German cities, assume mixed driving
-        avg_speed_kmh = 60
-        travel_time_hours = actual_distance_km / avg_speed_kmh
-        travel_time_minutes = travel_time_hours * 60
+        Args:
+            start_state: Starting location
+            end_states: Destination locations
+            
+        Returns:
+            One RoutingDecision per destination
+        """
+        logger.info("Mock computing %d routes from %s", len(end_states), start_state)
         
-        # Create simplified route segments (just start -> end)
+        distances_m = LocationState.distance_to_batch(
+            start_state.latitude, start_state.longitude,
+            [end_state.latitude for end_state in end_states],
+            [end_state.longitude for end_state in end_states]
+        )
+        return [
+            self._simulate_route(start_state, end_state, float(distance_m))
+            for end_state, distance_m in zip(end_states, distances_m)
+        ]
+
+    def _simulate_route(self, start_state: LocationState, end_state: LocationState,
+                        distance_m: float) -> RoutingDecision:
+        """Simulate a route decision from the straight-line distance in meters"""
+        # Simulate route by adding the detour factor for actual roads
+        actual_distance_km = distance_m * (self._DETOUR_FACTOR / 1000)
+        
+        # Travel time at the average speed, folded into minutes per km
+        travel_time_minutes = actual_distance_km * (60.0 / self._AVG_SPEED_KMH)
+        
+        # Create simplified route segments (just start -> end); the route
+        # geometry is derived from the segment vertices on demand
         route_segments = [
             RouteSegment(
                 start_location=start_state,
@@ -100,28 +147,19 @@ class MockRoutingAgent:
                 travel_time_minutes=travel_time_minutes,
                 distance_km=actual_distance_km,
                 instructions=f"Drive from {start_state.address} to {end_state.address}",
-                geometry={"type": "LineString", "coordinates": [
+                geometry_paths=np.array([
                     [start_state.longitude, start_state.latitude],
                     [end_state.longitude, end_state.latitude]
-                ]}
+                ])
             )
         ]
         
-        # Mock route geometry
-        route_geometry = {
-            "type": "LineString",
-            "coordinates": [
-                [start_state.longitude, start_state.latitude],
-                [end_state.longitude, end_state.latitude]
-            ]
-        }
-        
         # Goal test: for a successfully computed route, we consider goal achieved
         # The buffer test is primarily for validating if we're already at destination
         goal_reached = True  # We computed a valid route to destination
         confidence = 0.9  # High confidence in mock route
         
-        routing_decision = RoutingDecision(
+        return RoutingDecision(
             route_segments=route_segments,
             total_travel_time=travel_time_minutes,
             total_distance=actual_distance_km,
@@ -129,31 +167,29 @@ class MockRoutingAgent:
             current_state=start_state,
             target_state=end_state,
             confidence=confidence,
-            timestamp=datetime.now(),
-            route_geometry=route_geometry
+            timestamp=None
         )
-        
-        logger.info(f"Mock route computed: {routing_decision.summary()}")
-        return routing_decision
 
     def goal_test(self, current_state: LocationState, target_state: LocationState) -> bool:
         """
         Goal test implementation (same as real agent)
         """
-        within_buffer = current_state.within_buffer(target_state, self.buffer_meters)
-        logger.info(f"Goal test: {current_state} within {self.buffer_meters}m of {target_state}: {within_buffer}")
+        within_buffer = current_state.within_buffer_fast(target_state, self.buffer_meters)
+        logger.info("Goal test: %s within %sm of %s: %s", current_state, self.buffer_meters, target_state, within_buffer)
         return within_buffer
 
     def publish_route_to_feature_layer(self, routing_decision: RoutingDecision, layer_name: str = "Mock_Route") -> Optional[str]:
         """
         Mock publishing - just log the action
         """
-        logger.info(f"Mock publishing route to feature layer: {layer_name}")
-        logger.info(f"Route geometry: {routing_decision.route_geometry}")
+        logger.info("Mock publishing route to feature layer: %s", layer_name)
+        if logger.isEnabledFor(logging.INFO):
+            payload = dumps_feature_collection(routing_decision.segment_features())
+            logger.info("Route features: %d bytes of GeoJSON", len(payload))
         
         # Return a mock URL
-        mock_url = f"https://mock.arcgis.com/layers/{layer_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        logger.info(f"Mock feature layer URL: {mock_url}")
+        mock_url = f"https://mock.arcgis.com/layers/{layer_name}_{routing_decision.timestamp:%Y%m%d_%H%M%S}"
+        logger.info("Mock feature layer URL: %s", mock_url)
         return mock_url
 
     def solve_routing_problem(self, 
@@ -162,16 +198,18 @@ class MockRoutingAgent:
         """
         Mock implementation of the complete routing problem solution
         """
-        logger.info(f"Mock solving routing problem: {start_address} → {end_address}")
+        logger.info("Mock solving routing problem: %s → %s", start_address, end_address)
+        token = decision_timestamp.set(time.time_ns())
         
         try:
-            # Step 1: Define Initial State
-            start_state = self.geocode_location(start_address)
-            logger.info(f"Mock initial state: {start_state}")
+            # Step 1 & 2: Define Initial State and Goal State
+            start_state, goal_state = self.geocode_locations([start_address, end_address])
+            logger.info("Mock initial state: %s", start_state)
+            logger.info("Mock goal state: %s", goal_state)
             
-            # Step 2: Define Goal State
-            goal_state = self.geocode_location(end_address)
-            logger.info(f"Mock goal state: {goal_state}")
+            if self.goal_test(start_state, goal_state):
+                logger.info("Start is within the goal buffer, skipping route computation")
+                return RoutingDecision.at_goal(start_state, goal_state)
             
             # Step 3: Apply Transition Model
             routing_decision = self.compute_route(start_state, goal_state)
@@ -180,20 +218,66 @@ class MockRoutingAgent:
             # Note: goal_reached means we successfully computed a route to destination
             # The buffer test checks if start == end (already at destination)
             goal_test_result = self.goal_test(routing_decision.current_state, routing_decision.target_state)
-            logger.info(f"Buffer-based goal test (are we already there?): {goal_test_result}")
+            logger.info("Buffer-based goal test (are we already there?): %s", goal_test_result)
             # Keep goal_reached as True since we computed a route to destination
             
             # Step 5: Mock publishing
             feature_layer_url = self.publish_route_to_feature_layer(routing_decision)
             if feature_layer_url:
-                logger.info(f"Mock route published to: {feature_layer_url}")
+                logger.info("Mock route published to: %s", feature_layer_url)
             
-            logger.info(f"Mock routing problem solved: {routing_decision.summary()}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Mock routing problem solved: %s", routing_decision.summary())
             return routing_decision
             
         except Exception as e:
-            logger.error(f"Error in mock routing problem: {e}")
+            logger.error("Error in mock routing problem: %s", e)
             raise
+        finally:
+            decision_timestamp.reset(token)
+
+    def solve_routing_problem_many(self,
+                                   start_addresses: List[str],
+                                   end_addresses: List[str]) -> List[RoutingDecision]:
+        """
+        Mock solution of many routing problems in one vectorized pass
+        
+        All endpoints are geocoded once and the straight-line distances of all
+        origin/destination pairs are computed in a single batch call.
+        
+        Args:
+            start_addresses: Starting addresses
+            end_addresses: Destination addresses (paired with start_addresses)
+            
+        Returns:
+            One RoutingDecision per origin/destination pair
+        """
+        if len(start_addresses) != len(end_addresses):
+            raise ValueError("start_addresses and end_addresses must have the same length")
+        
+        logger.info("Mock solving %d routing problems", len(start_addresses))
+        token = decision_timestamp.set(time.time_ns())
+        
+        try:
+            start_states = self.geocode_locations(start_addresses)
+            goal_states = self.geocode_locations(end_addresses)
+            
+            distances_m = LocationState.distance_to_batch(
+                np.fromiter((state.latitude for state in start_states), np.float64, len(start_states)),
+                np.fromiter((state.longitude for state in start_states), np.float64, len(start_states)),
+                np.fromiter((state.latitude for state in goal_states), np.float64, len(goal_states)),
+                np.fromiter((state.longitude for state in goal_states), np.float64, len(goal_states))
+            )
+            
+            # Same goal test as solve_routing_problem, so both paths agree at the buffer edge
+            return [
+                RoutingDecision.at_goal(start_state, goal_state) if self.goal_test(start_state, goal_state)
+                else self._simulate_route(start_state, goal_state, distance_m)
+                for start_state, goal_state, distance_m
+                in zip(start_states, goal_states, distances_m.tolist())
+            ]
+        finally:
+            decision_timestamp.reset(token)
 
     def validate_decision(self, routing_decision: RoutingDecision) -> bool:
         """
@@ -211,20 +295,29 @@ class MockRoutingAgent:
             logger.error("Goal reached but no route segments")
             return False
         
-        # Check coordinate validity
-        for segment in routing_decision.route_segments:
-            if not self._is_valid_coordinate(segment.start_location) or \
-               not self._is_valid_coordinate(segment.end_location):
-                logger.error("Invalid coordinates in route segments")
-                return False
+        # Check coordinate validity of the start and target states, then of
+        # all segment endpoints in one vectorized pass
+        if not (self._is_valid_coordinate(routing_decision.current_state) and
+                self._is_valid_coordinate(routing_decision.target_state)):
+            logger.error("Invalid coordinates of the start or target location")
+            return False
+        
+        arrays = routing_decision.arrays
+        valid = np.ones(len(routing_decision.route_segments), dtype=bool)
+        for name, bound in (("start_lat", 90), ("start_lon", 180), ("end_lat", 90), ("end_lon", 180)):
+            valid &= np.abs(arrays[name]) <= bound
+        if not valid.all():
+            logger.error("Invalid coordinates in route segments")
+            return False
         
         logger.info("Mock routing decision validated successfully")
         return True
     
     def _is_valid_coordinate(self, location: LocationState) -> bool:
         """Check if location has valid coordinates"""
-        return (-90 <= location.latitude <= 90 and 
-                -180 <= location.longitude <= 180)
+        # Squared bounds: one multiply and compare per axis, NaN fails both
+        latitude, longitude = location.latitude, location.longitude
+        return latitude * latitude <= 8100.0 and longitude * longitude <= 32400.0
 
 
 # Demo function
@@ -0,0 +1,122 @@
+"""
+Rate Limiting for ArcGIS Service Calls
+
+This module provides a thread-safe token bucket that smooths requests to the
+ArcGIS geocoding and routing services to their documented rate, so batches of
+routing problems run at the allowed throughput instead of bouncing off
+HTTP 429 (Too Many Requests) responses.
+"""
+
+import logging
+import re
+import threading
+import time
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+_RETRY_AFTER_PATTERN = re.compile(r"retry[- ]after\D{0,5}(\d+(?:\.\d+)?)", re.IGNORECASE)
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """Check whether a service error reports HTTP 429 (Too Many Requests)"""
+    message = str(error)
+    return "429" in message or "too many requests" in message.lower()
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Extract the Retry-After delay in seconds from a service error, if present"""
+    match = _RETRY_AFTER_PATTERN.search(str(error))
+    return float(match.group(1)) if match else None
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` requests per second with bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float = 1):
+        """
+        Initialize a full bucket
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens (burst size)
+        """
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens accrued since the last update (none while penalized)"""
+        start = max(self._updated, self._blocked_until)
+        if now > start:
+            self._tokens = min(self.capacity, self._tokens + (now - start) * self.rate)
+        self._updated = max(now, self._updated)
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Block until the requested tokens are available and take them
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._blocked_until - now
+                if wait <= 0:
+                    if self._tokens >= tokens:
+                        self._tokens -= tokens
+                        return waited
+                    wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def penalize(self, retry_after: Optional[float] = None) -> None:
+        """
+        Drain the bucket and pause refilling after the service throttled a request
+
+        Args:
+            retry_after: Delay in seconds requested by the service (one refill interval if None)
+        """
+        delay = retry_after if retry_after is not None else 1 / self.rate
+        with self._lock:
+            self._tokens = 0.0
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        logger.warning("Service rate limit hit, pausing requests for %.1fs", delay)
+
+    def call(self, func: Callable[..., Any], *args: Any, max_retries: int = 3, **kwargs: Any) -> Any:
+        """
+        Call func once a token is available, retrying throttled (HTTP 429) calls
+
+        Args:
+            func: Service call to rate limit
+            max_retries: Retries after throttled responses before giving up
+
+        Returns:
+            Result of func
+        """
+        for attempt in range(max_retries + 1):
+            with self:
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    if attempt == max_retries or not is_rate_limited(e):
+                        raise
+                    self.penalize(retry_after(e))
+
+    def __enter__(self) -> "TokenBucket":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
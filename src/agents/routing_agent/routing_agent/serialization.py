@@ -0,0 +1,68 @@
+"""
+JSON Serialization Helpers
+
+This module serializes route geometries and cache payloads with orjson when it
+is installed, falling back to the standard library json module otherwise.
+"""
+
+import json
+from typing import Any, Dict, Iterable
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional, fall back to the standard library
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Convert NumPy values for the standard library encoder"""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize an object to JSON bytes
+
+    Args:
+        obj: JSON-compatible object (NumPy arrays are supported)
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=_default).encode("utf-8")
+
+
+def dumps_feature_collection(features: Iterable[Dict[str, Any]]) -> bytes:
+    """
+    Serialize GeoJSON features into a single FeatureCollection document
+
+    Args:
+        features: GeoJSON features, coordinates may be NumPy arrays
+
+    Returns:
+        UTF-8 encoded GeoJSON FeatureCollection
+    """
+    return dumps({"type": "FeatureCollection", "features": list(features)})
+
+
+def loads(data: Any) -> Any:
+    """
+    Deserialize JSON from bytes or str
+
+    Args:
+        data: JSON document
+
+    Returns:
+        Deserialized object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
@@ -7,22 +7,41 @@ using mocked ArcGIS services where appropriate.
 
 import unittest
 from unittest.mock import Mock, patch, MagicMock
+from dataclasses import asdict, fields
 from datetime import datetime
 import sys
 import os
+import time
+
+import numpy as np
 
 # Add parent directories to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from routing_agent.location_state import LocationState, RouteSegment, RoutingDecision
+from routing_agent.location_state import LocationState, RouteSegment, RoutingDecision, decision_timestamp, _ns_datetime
+from routing_agent.cache import MemoryCache, SqliteStore, cache_key
+from routing_agent.serialization import dumps_feature_collection, loads
+from routing_agent.rate_limit import TokenBucket, is_rate_limited, retry_after
+
+try:
+    import networkx as nx
+except ImportError:
+    nx = None
+
+try:
+    from routing_agent.agent import RoutingAgent
+except ImportError:
+    # The real agent needs the ArcGIS API for Python and requests
+    RoutingAgent = None
 
 
 class TestLocationState(unittest.TestCase):
     """Test cases for LocationState class"""
     
-    def setUp(self):
-        self.bonn = LocationState(50.7374, 7.0982, "Bonn")
-        self.remagen = LocationState(50.5791, 7.2281, "Remagen") 
+    @classmethod
+    def setUpClass(cls):
+        cls.bonn = LocationState(50.7374, 7.0982, "Bonn")
+        cls.remagen = LocationState(50.5791, 7.2281, "Remagen") 
     
     def test_location_creation(self):
         """Test basic location state creation"""
@@ -32,7 +51,36 @@ class TestLocationState(unittest.TestCase):
         self.assertEqual(location.longitude, 7.0)
         self.assertEqual(location.address, "Test Location")
         self.assertIsNotNone(location.timestamp)
-    
+
+    def test_decision_timestamp(self):
+        """Test states created during one decision share its timestamp"""
+        stamp = datetime(2024, 1, 1, 12, 0, 0, 123456)
+        token = decision_timestamp.set(int(stamp.timestamp()) * 1_000_000_000 + 123456789)
+        try:
+            first = LocationState(50.0, 7.0)
+            second = LocationState(50.5, 7.3)
+            decision = RoutingDecision.at_goal(first, second)
+        finally:
+            decision_timestamp.reset(token)
+
+        self.assertEqual(first.timestamp, stamp)
+        self.assertEqual(second.timestamp, stamp)
+        self.assertEqual(decision.timestamp, stamp)
+
+        # A zero stamp is a stamp, fresh clock reads bypass the stamp cache
+        token = decision_timestamp.set(0)
+        try:
+            self.assertEqual(RoutingDecision.at_goal(first, second).timestamp, datetime.fromtimestamp(0))
+        finally:
+            decision_timestamp.reset(token)
+        cached = _ns_datetime.cache_info().currsize
+        RoutingDecision.at_goal(first, second)
+        self.assertEqual(_ns_datetime.cache_info().currsize, cached)
+        self.assertEqual(LocationState(50.0, 7.0, timestamp=stamp).timestamp, stamp)
+        # A regular dataclass field, visible to fields() and asdict()
+        self.assertIn("timestamp", [f.name for f in fields(LocationState)])
+        self.assertEqual(asdict(first)["timestamp"], stamp)
+
     def test_distance_calculation(self):
         """Test distance calculation between locations"""
         distance = self.bonn.distance_to(self.remagen)
@@ -41,6 +89,31 @@ class TestLocationState(unittest.TestCase):
         self.assertGreater(distance, 10000)  # At least 10km 
         self.assertLess(distance, 30000)     # At most 30km
     
+    def test_distances_to_array(self):
+        """Test vectorized distance calculation against the scalar version"""
+        others = [self.remagen, self.bonn, LocationState(50.9375, 6.9603, "Köln")]
+        distances = self.bonn.distances_to_array(
+            [o.latitude for o in others], [o.longitude for o in others]
+        )
+        
+        self.assertEqual(distances.shape, (3,))
+        for distance, other in zip(distances, others):
+            self.assertAlmostEqual(distance, self.bonn.distance_to(other), places=3)
+
+    def test_distance_to_batch(self):
+        """Test pairwise batch distances match the scalar version"""
+        distances = LocationState.distance_to_batch(
+            np.array([50.7374, 50.9375]), np.array([7.0982, 6.9603]),
+            np.array([50.5791, 51.2277]), np.array([7.2281, 6.7735])
+        )
+
+        self.assertAlmostEqual(distances[0], self.bonn.distance_to(self.remagen), places=3)
+        self.assertAlmostEqual(
+            distances[1],
+            LocationState(50.9375, 6.9603).distance_to(LocationState(51.2277, 6.7735)),
+            places=3
+        )
+
     def test_within_buffer(self):
         """Test buffer distance checking"""
         # Same location should be within any buffer
@@ -52,13 +125,59 @@ class TestLocationState(unittest.TestCase):
         # But should be within 50km buffer
         self.assertTrue(self.bonn.within_buffer(self.remagen, 50000))
 
+        # Prefilter must not reject nearby points across the antimeridian
+        self.assertTrue(LocationState(0.0, 179.9995).within_buffer(LocationState(0.0, -179.9995), 200))
+
+        # Prefilter must not reject points at high latitude just inside the buffer
+        north = LocationState(80.0, 0.0)
+        north_east = LocationState(80.0, 5.0)
+        distance = north.distance_to(north_east)
+        self.assertTrue(north.within_buffer(north_east, distance + 10))
+        self.assertTrue(north.within_buffer(north_east, distance))
+        self.assertFalse(north.within_buffer(north_east, distance - 10))
+
+    def test_within_buffer_array(self):
+        """Test masked batch buffer check against the scalar version"""
+        lats = np.array([50.7374, 50.7384, 50.5791, 50.7374])
+        lons = np.array([7.0982, 7.0995, 7.2281, 7.1010])  # same, ~140m, ~20km, ~200m
+
+        within = self.bonn.within_buffer_array(lats, lons, 150)
+        expected = [self.bonn.within_buffer(LocationState(lat, lon), 150) for lat, lon in zip(lats, lons)]
+        self.assertEqual(within.tolist(), expected)
+        self.assertEqual(within.tolist(), [True, True, False, False])
+
+        # High-latitude points around the buffer edge must match the exact check
+        north = LocationState(80.0, 0.0)
+        self.assertEqual(north.within_buffer_array([80.0], [5.0], north.distance_to(LocationState(80.0, 5.0)) + 10).tolist(), [True])
+        rng = np.random.default_rng(42)
+        lats = rng.uniform(70.0, 89.0, 500)
+        lons = rng.uniform(-30.0, 30.0, 500)
+        for buffer_meters in (50_000, 200_000, 1_000_000):
+            np.testing.assert_array_equal(
+                north.within_buffer_array(lats, lons, buffer_meters),
+                north.distances_to_array(lats, lons) <= buffer_meters
+            )
+
+    def test_within_buffer_fast(self):
+        """Test equirectangular buffer check against the Haversine version"""
+        nearby = LocationState(50.7384, 7.0995, "Nearby")  # ~140m from Bonn
+        
+        self.assertTrue(self.bonn.within_buffer_fast(self.bonn, 100))
+        self.assertFalse(self.bonn.within_buffer_fast(self.remagen, 200))
+        for buffer_meters in (100, 150, 200):
+            self.assertEqual(
+                self.bonn.within_buffer_fast(nearby, buffer_meters),
+                self.bonn.within_buffer(nearby, buffer_meters)
+            )
+
 
 class TestRouteSegment(unittest.TestCase):
     """Test cases for RouteSegment class"""
     
-    def setUp(self):
-        self.start = LocationState(50.0, 7.0, "Start")
-        self.end = LocationState(50.1, 7.1, "End")
+    @classmethod
+    def setUpClass(cls):
+        cls.start = LocationState(50.0, 7.0, "Start")
+        cls.end = LocationState(50.1, 7.1, "End")
     
     def test_segment_creation(self):
         """Test route segment creation"""
@@ -74,16 +193,62 @@ class TestRouteSegment(unittest.TestCase):
         self.assertEqual(segment.travel_time_minutes, 10.5)
         self.assertEqual(segment.distance_km, 5.2)
         self.assertEqual(segment.instructions, "Drive straight")
+        self.assertIsNone(segment.as_arcgis_geometry())
+
+    def test_segment_geometry(self):
+        """Test ArcGIS polyline JSON is built from the vertex array"""
+        segment = RouteSegment(self.start, self.end, 10.5, 5.2,
+                               geometry_paths=np.array([[7.0, 50.0], [7.1, 50.1]]))
+
+        self.assertEqual(segment.as_arcgis_geometry(), {
+            "paths": [[[7.0, 50.0], [7.1, 50.1]]],
+            "spatialReference": {"wkid": 4326},
+        })
+        self.assertEqual(segment.__geo_interface__, {
+            "type": "LineString", "coordinates": [[7.0, 50.0], [7.1, 50.1]]
+        })
+
+    def test_route_geo_interface(self):
+        """Test route GeoJSON joins segment vertices without duplicates"""
+        middle = LocationState(50.05, 7.05)
+        decision = RoutingDecision(
+            route_segments=[
+                RouteSegment(self.start, middle, 5.0, 3.0,
+                             geometry_paths=np.array([[7.0, 50.0], [7.05, 50.05]])),
+                RouteSegment(middle, self.end, 5.0, 3.0,
+                             geometry_paths=np.array([[7.05, 50.05], [7.1, 50.1]])),
+            ],
+            total_travel_time=10.0,
+            total_distance=6.0,
+            goal_reached=True,
+            current_state=self.start,
+            target_state=self.end,
+            confidence=1.0,
+            timestamp=None
+        )
+
+        self.assertEqual(decision.__geo_interface__["coordinates"],
+                         [[7.0, 50.0], [7.05, 50.05], [7.1, 50.1]])
+        self.assertEqual(decision.as_arcgis_geometry(), {
+            "paths": [[[7.0, 50.0], [7.05, 50.05], [7.1, 50.1]]],
+            "spatialReference": {"wkid": 4326},
+        })
+
+        collection = loads(dumps_feature_collection(decision.segment_features()))
+        self.assertEqual(collection["type"], "FeatureCollection")
+        self.assertEqual([feature["geometry"]["coordinates"] for feature in collection["features"]],
+                         [[[7.0, 50.0], [7.05, 50.05]], [[7.05, 50.05], [7.1, 50.1]]])
 
 
 class TestRoutingDecision(unittest.TestCase):
     """Test cases for RoutingDecision class"""
     
-    def setUp(self):
-        self.start = LocationState(50.0, 7.0, "Start")
-        self.end = LocationState(50.1, 7.1, "End")
-        self.segment = RouteSegment(
-            self.start, self.end, 15.0, 8.5, "Test segment"
+    @classmethod
+    def setUpClass(cls):
+        cls.start = LocationState(50.0, 7.0, "Start")
+        cls.end = LocationState(50.1, 7.1, "End")
+        cls.segment = RouteSegment(
+            cls.start, cls.end, 15.0, 8.5, "Test segment"
         )
     
     def test_decision_creation(self):
@@ -103,6 +268,32 @@ class TestRoutingDecision(unittest.TestCase):
         self.assertTrue(decision.goal_reached)
         self.assertEqual(decision.confidence, 0.9)
         self.assertEqual(len(decision.route_segments), 1)
+        
+        # Slotted classes carry no per-instance __dict__
+        for obj in (decision, self.segment, self.start):
+            self.assertFalse(hasattr(obj, "__dict__"))
+    
+    def test_segment_arrays(self):
+        """Test structure-of-arrays view of the route segments"""
+        second = RouteSegment(self.end, self.start, 5.0, 1.5, "Return segment")
+        decision = RoutingDecision(
+            route_segments=[self.segment, second],
+            total_travel_time=20.0,
+            total_distance=10.0,
+            goal_reached=True,
+            current_state=self.start,
+            target_state=self.end,
+            confidence=0.9,
+            timestamp=datetime.now()
+        )
+        
+        arrays = decision.arrays
+        self.assertEqual(list(arrays["start_lat"]), [50.0, 50.1])
+        self.assertEqual(list(arrays["end_lon"]), [7.1, 7.0])
+        self.assertAlmostEqual(arrays["time"].sum(), 20.0)
+        self.assertAlmostEqual(arrays["distance"].sum(), 10.0)
+        self.assertIs(decision.arrays, arrays)
+        self.assertFalse(hasattr(decision, "__dict__"))
     
     def test_multi_criteria_cost(self):
         """Test multi-criteria cost calculation"""
@@ -126,6 +317,13 @@ class TestRoutingDecision(unittest.TestCase):
         custom_cost = decision.get_multi_criteria_cost(time_weight=0.5, distance_weight=0.5)
         expected_custom = 0.5 * 1.0 + 0.5 * 30.0  # 0.5 + 15.0 = 15.5
         self.assertAlmostEqual(custom_cost, expected_custom, places=1)
+        
+        # Costs follow later edits of the totals
+        self.assertEqual(decision.path_cost, 60.0)
+        decision.total_travel_time = 120.0
+        decision.total_distance = 10.0
+        self.assertEqual(decision.path_cost, 120.0)
+        self.assertAlmostEqual(decision.get_multi_criteria_cost(), 0.7 * 2.0 + 0.3 * 10.0)
     
     def test_summary(self):
         """Test decision summary string"""
@@ -147,6 +345,251 @@ class TestRoutingDecision(unittest.TestCase):
         self.assertIn("0.90", summary)
 
 
+class TestSqliteStore(unittest.TestCase):
+    """Test cases for the persistent SQLite cache"""
+    
+    def setUp(self):
+        self.store = SqliteStore(":memory:")
+    
+    def tearDown(self):
+        self.store.close()
+    
+    def test_cache_key_is_case_insensitive(self):
+        """Test that cache keys ignore address casing"""
+        self.assertEqual(cache_key("Bonn", "Germany"), cache_key("bonn", "germany"))
+        self.assertNotEqual(cache_key("Bonn", "Germany"), cache_key("Remagen", "Germany"))
+    
+    def test_set_and_get(self):
+        """Test storing and retrieving a payload"""
+        self.store.set("bonn", {"lat": 50.7374, "lon": 7.0982, "place_name": "Bonn"})
+        payload = self.store.get("bonn")
+        
+        self.assertEqual(payload["lat"], 50.7374)
+        self.assertEqual(payload["place_name"], "Bonn")
+        self.assertIsNone(self.store.get("remagen"))
+    
+    def test_numpy_payload(self):
+        """Test that NumPy arrays in payloads are stored as plain lists"""
+        import numpy as np
+        self.store.set("paths", {"paths": np.array([[7.0982, 50.7374], [7.2281, 50.5791]])})
+        self.assertEqual(self.store.get("paths")["paths"], [[7.0982, 50.7374], [7.2281, 50.5791]])
+    
+    def test_expired_entry(self):
+        """Test that expired entries are not returned"""
+        self.store.set("bonn", {"lat": 50.7374}, ttl=-1)
+        self.assertIsNone(self.store.get("bonn"))
+    
+    def test_entry_expiry(self):
+        """Test entries are returned with the expiry time they were stored with"""
+        expires_at = self.store.set("bonn", {"lat": 50.7374}, ttl=3600)
+        self.assertEqual(self.store.get_entry("bonn"), ({"lat": 50.7374}, expires_at))
+        self.store.set("remagen", {"lat": 50.5791})
+        self.assertEqual(self.store.get_entry("remagen"), ({"lat": 50.5791}, None))
+        self.assertIsNone(self.store.get_entry("köln"))
+    
+    def test_shared_connection(self):
+        """Test that stores sharing a connection keep separate tables"""
+        routes = SqliteStore(table="routes", share_with=self.store)
+        self.store.set("key", {"table": "cache"})
+        routes.set("key", {"table": "routes"})
+        
+        self.assertEqual(self.store.get("key")["table"], "cache")
+        self.assertEqual(routes.get("key")["table"], "routes")
+    
+    def test_decision_round_trip(self):
+        """Test serializing a routing decision for the route cache"""
+        start = LocationState(50.0, 7.0, "Start")
+        end = LocationState(50.1, 7.1, "End")
+        decision = RoutingDecision(
+            route_segments=[RouteSegment(start, end, 15.0, 8.5, "Test segment",
+                                         geometry_paths=np.array([[7.0, 50.0], [7.1, 50.1]]))],
+            total_travel_time=15.0,
+            total_distance=8.5,
+            goal_reached=True,
+            current_state=start,
+            target_state=end,
+            confidence=1.0,
+            timestamp=datetime.now()
+        )
+        
+        self.store.set("route", decision.to_dict())
+        restored = RoutingDecision.from_dict(self.store.get("route"), start, end)
+        
+        self.assertEqual(restored.total_travel_time, 15.0)
+        self.assertEqual(restored.route_segments[0].instructions, "Test segment")
+        self.assertEqual(restored.route_segments[0].end_location.latitude, 50.1)
+        self.assertEqual(restored.route_segments[0].geometry_paths.tolist(), [[7.0, 50.0], [7.1, 50.1]])
+        self.assertIs(restored.current_state, start)
+
+
+class TestMemoryCache(unittest.TestCase):
+    """Test cases for the in-process cache above the SQLite store"""
+    
+    def test_expiry_checked_on_hit(self):
+        """Test entries are dropped once their persistent copy has expired"""
+        cache = MemoryCache()
+        cache.set("fresh", "value", time.time() + 3600)
+        cache.set("stale", "value", time.time() - 1)
+        cache.set("forever", "value")
+        
+        self.assertEqual(cache.get("fresh"), "value")
+        self.assertIsNone(cache.get("stale"))
+        self.assertEqual(cache.get("forever"), "value")
+    
+    def test_least_recently_used_evicted(self):
+        """Test the least recently used entry is evicted beyond maxsize"""
+        cache = MemoryCache(maxsize=2)
+        cache.set("bonn", 1)
+        cache.set("remagen", 2)
+        cache.get("bonn")
+        cache.set("köln", 3)
+        
+        self.assertEqual(cache.get("bonn"), 1)
+        self.assertIsNone(cache.get("remagen"))
+        self.assertEqual(cache.get("köln"), 3)
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test cases for the service rate limiter"""
+
+    def test_burst_then_wait(self):
+        """Test full bucket allows a burst and then throttles"""
+        bucket = TokenBucket(rate=50, capacity=2)
+        self.assertEqual(bucket.acquire(), 0)
+        self.assertEqual(bucket.acquire(), 0)
+        self.assertGreater(bucket.acquire(), 0)
+
+    def test_retry_on_rate_limit(self):
+        """Test throttled calls are retried after the Retry-After delay"""
+        bucket = TokenBucket(rate=100, capacity=1)
+        responses = [Exception("Error 429: Too Many Requests, retry after 0.01 s"), "ok"]
+
+        def service():
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        self.assertEqual(bucket.call(service), "ok")
+        self.assertEqual(retry_after(Exception("Retry-After: 30")), 30.0)
+        self.assertFalse(is_rate_limited(ValueError("Could not geocode address")))
+
+    def test_other_errors_not_retried(self):
+        """Test errors other than HTTP 429 are raised immediately"""
+        bucket = TokenBucket(rate=100, capacity=1)
+        service = Mock(side_effect=ValueError("No route found"))
+        with self.assertRaises(ValueError):
+            bucket.call(service)
+        self.assertEqual(service.call_count, 1)
+
+
+@unittest.skipUnless(nx, "NetworkX not installed")
+class TestLocalRoutingBackend(unittest.TestCase):
+    """Test cases for A* routing on a local road network graph"""
+    
+    @classmethod
+    def setUpClass(cls):
+        # Small grid of nodes around Bonn, edges at 50 km/h in both directions
+        # (built once, the backend only reads the graph)
+        cls.graph = nx.DiGraph()
+        for i in range(4):
+            for j in range(4):
+                cls.graph.add_node((i, j), y=50.70 + i * 0.01, x=7.10 + j * 0.01)
+        for u in list(cls.graph.nodes):
+            for v in [(u[0] + 1, u[1]), (u[0], u[1] + 1)]:
+                if v in cls.graph.nodes:
+                    length = LocationState(*cls._coords(u)).distance_to(LocationState(*cls._coords(v)))
+                    for a, b in [(u, v), (v, u)]:
+                        cls.graph.add_edge(a, b, length=length, travel_time=length / (50 / 3.6))
+    
+    @classmethod
+    def _coords(cls, node):
+        return cls.graph.nodes[node]["y"], cls.graph.nodes[node]["x"]
+    
+    def test_compute_route(self):
+        """Test that A* finds a shortest route across the grid"""
+        from routing_agent.local_backend import LocalRoutingBackend
+        backend = LocalRoutingBackend(self.graph)
+        start = LocationState(50.70, 7.10, "Start")
+        end = LocationState(50.73, 7.13, "End")
+        
+        decision = backend.compute_route(start, end)
+        expected = nx.shortest_path_length(self.graph, (0, 0), (3, 3), weight="travel_time")
+        
+        self.assertTrue(decision.goal_reached)
+        self.assertEqual(len(decision.route_segments), 6)
+        self.assertAlmostEqual(decision.total_travel_time, expected / 60, places=6)
+        self.assertIs(decision.route_segments[0].start_location, start)
+        self.assertIs(decision.route_segments[-1].end_location, end)
+        
+        # Decisions made while solving a routing problem carry its timestamp
+        token = decision_timestamp.set(1_700_000_000_000_000_000)
+        try:
+            decision = backend.compute_route(start, end)
+        finally:
+            decision_timestamp.reset(token)
+        self.assertEqual(decision.timestamp, datetime.fromtimestamp(1_700_000_000))
+    
+    def test_landmarks_keep_route_optimal(self):
+        """Test that ALT landmark bounds do not change the route cost"""
+        from routing_agent.local_backend import LocalRoutingBackend
+        plain = LocalRoutingBackend(self.graph)
+        alt = LocalRoutingBackend(self.graph, num_landmarks=3)
+        start = LocationState(50.73, 7.10, "Start")
+        end = LocationState(50.70, 7.13, "End")
+        
+        self.assertAlmostEqual(
+            alt.compute_route(start, end).total_travel_time,
+            plain.compute_route(start, end).total_travel_time
+        )
+
+
+class TestMockRoutingAgent(unittest.TestCase):
+    """Test cases for the mock agent used without ArcGIS"""
+    
+    def test_geocode_returns_copies(self):
+        """Test changing a geocoded state does not change later geocodes"""
+        from routing_agent import MockRoutingAgent
+        bonn = MockRoutingAgent().geocode_location("Bonn, Germany")
+        bonn.latitude = 0.0
+        
+        self.assertEqual(MockRoutingAgent().geocode_location("Bonn, Germany").latitude, 50.7374)
+    
+    def test_batch_uses_goal_test(self):
+        """Test batch solving decides arrival with the same goal test as single solves"""
+        from routing_agent import MockRoutingAgent
+        agent = MockRoutingAgent()
+        
+        with patch.object(agent, "goal_test", return_value=True) as goal_test:
+            decisions = agent.solve_routing_problem_many(["Bonn, Germany"], ["Remagen, Germany"])
+        goal_test.assert_called_once()
+        self.assertEqual(decisions[0].total_distance, 0.0)
+        
+        decisions = agent.solve_routing_problem_many(["Bonn, Germany"], ["Remagen, Germany"])
+        self.assertGreater(decisions[0].total_distance, 0.0)
+    
+    def test_validate_decision_checks_states(self):
+        """Test validation rejects an out-of-range target even with valid segments"""
+        from routing_agent import MockRoutingAgent
+        agent = MockRoutingAgent()
+        start = LocationState(50.0, 7.0, "Start")
+        end = LocationState(50.1, 7.1, "End")
+        decision = RoutingDecision(
+            route_segments=[RouteSegment(start, end, 10.0, 12.0, "Drive")],
+            total_travel_time=10.0,
+            total_distance=12.0,
+            goal_reached=True,
+            current_state=start,
+            target_state=LocationState(50.1, 187.1, "Off the globe"),
+            confidence=1.0,
+            timestamp=None
+        )
+        
+        self.assertFalse(agent.validate_decision(decision))
+        decision.target_state = end
+        self.assertTrue(agent.validate_decision(decision))
+
+
 class TestRoutingAgentCore(unittest.TestCase):
     """Test cases for core RoutingAgent functionality (without ArcGIS)"""
     
@@ -168,5 +611,54 @@ class TestRoutingAgentCore(unittest.TestCase):
         self.assertFalse(agent._is_valid_coordinate(invalid_lon))
 
 
+
+@unittest.skipUnless(RoutingAgent, "ArcGIS API for Python not installed")
+class TestBatchGeocoding(unittest.TestCase):
+    """Test cases for RoutingAgent.geocode_locations with a mocked geocoding service"""
+    
+    def setUp(self):
+        self.agent = RoutingAgent.__new__(RoutingAgent)  # Create without __init__ (no GIS connection)
+        self.agent._geocode_store = SqliteStore(":memory:", table="geocode")
+        self.agent._geocode_memory = MemoryCache(16)
+        self.agent._geocode_limiter = TokenBucket(rate=1000.0)
+        self.agent.geocode_cache_ttl = 3600.0
+    
+    def test_batch_geocode_primes_caches(self):
+        """Test misses are geocoded in one batch and later served from the in-process cache"""
+        results = [
+            {"location": {"x": 7.0982, "y": 50.7374}, "attributes": {"PlaceName": "Bonn"}},
+            {"location": {"x": 7.2281, "y": 50.5791}, "attributes": {"PlaceName": "Remagen"}},
+        ]
+        with patch("routing_agent.agent.batch_geocode", return_value=results) as batch_geocode:
+            states = self.agent.geocode_locations(["Bonn", "Remagen", "Bonn"])
+        
+        batch_geocode.assert_called_once_with(["Bonn, Germany", "Remagen, Germany"])
+        self.assertEqual([state.address for state in states], ["Bonn", "Remagen", "Bonn"])
+        self.assertIsNot(states[0], states[2])
+        self.assertEqual(self.agent._geocode_store.get(cache_key("Remagen", "Germany"))["lat"], 50.5791)
+        
+        # Cached geocodes skip the service and the persistent store
+        with patch("routing_agent.agent.batch_geocode") as batch_geocode, \
+             patch.object(self.agent._geocode_store, "get_entry") as get_entry:
+            states = self.agent.geocode_locations(["Remagen", "Bonn"])
+        batch_geocode.assert_not_called()
+        get_entry.assert_not_called()
+        self.assertEqual([state.latitude for state in states], [50.5791, 50.7374])
+    
+    def test_batch_geocode_fallback(self):
+        """Test addresses are geocoded one by one in threads when batch geocoding fails"""
+        def geocode_remote(address, country):
+            return LocationState(50.0, 7.0, address)
+        
+        with patch("routing_agent.agent.batch_geocode", side_effect=RuntimeError("Batch geocoding not permitted")), \
+             patch.object(self.agent, "_geocode_remote", side_effect=geocode_remote) as remote:
+            states = self.agent.geocode_locations(["Bonn", "Remagen"])
+        
+        self.assertEqual(sorted(call.args[0] for call in remote.call_args_list), ["Bonn", "Remagen"])
+        self.assertEqual([state.address for state in states], ["Bonn", "Remagen"])
+        self.assertEqual(self.agent.geocode_locations(["Remagen"])[0].address, "Remagen")
+        self.assertEqual(remote.call_count, 2)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,29 @@
+"""
+Build script for the optional Haversine C extension
+
+Project metadata lives in pyproject.toml; this script only declares the
+compiled kernel. Build it in place with:
+
+    python setup.py build_ext --inplace
+
+Without Cython nothing is compiled and routing_agent falls
+back to the Numba and pure Python kernels.
+"""
+
+from setuptools import Extension, setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    # Cython is optional, skip the extension
+    cythonize = None
+
+# Compiler flags are declared in the distutils header of the .pyx file so
+# that a plain `cythonize -i` build uses the same optimizations
+extensions = [
+    Extension("routing_agent._haversine", ["routing_agent/_haversine.pyx"]),
+]
+
+setup(
+    ext_modules=cythonize(extensions) if cythonize is not None else [],
+)
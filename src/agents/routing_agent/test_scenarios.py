@@ -10,6 +10,7 @@ ArcGIS is not available.
 import sys
 import os
 from datetime import datetime
+from functools import lru_cache
 
 # Add the routing_agent package to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -21,7 +22,13 @@ except ImportError:
     from routing_agent import MockRoutingAgent as RoutingAgent
     AGENT_TYPE = "Mock"
 
-from routing_agent import LocationState
+from routing_agent import LocationState, RoutingDecision
+
+
+@lru_cache(maxsize=None)
+def shared_agent():
+    """Agent instance shared by all scenarios, created on first use"""
+    return RoutingAgent()
 
 
 def test_basic_routing():
@@ -29,7 +36,7 @@ def test_basic_routing():
     print(f"🧪 Test 1: Basic Bonn to Remagen Routing ({AGENT_TYPE})")
     print("-" * 50)
     
-    agent = RoutingAgent()
+    agent = shared_agent()
     result = agent.solve_routing_problem()
     
     assert result is not None, "Routing result should not be None"
@@ -46,7 +53,7 @@ def test_geocoding_accuracy():
     print(f"\n🧪 Test 2: Geocoding Accuracy ({AGENT_TYPE})")
     print("-" * 40)
     
-    agent = RoutingAgent()
+    agent = shared_agent()
     
     # Test Bonn geocoding
     bonn = agent.geocode_location("Bonn, Germany")
@@ -73,7 +80,7 @@ def test_goal_test_functionality():
     print("\n🧪 Test 3: Goal Test Functionality")
     print("-" * 40)
     
-    agent = RoutingAgent()
+    agent = shared_agent()
     
     # Create test locations
     bonn = LocationState(50.7374, 7.0982, "Bonn")
@@ -98,7 +105,7 @@ def test_path_cost_calculation():
     print("\n🧪 Test 4: Path Cost Calculations")
     print("-" * 40)
     
-    agent = RoutingAgent()
+    agent = shared_agent()
     result = agent.solve_routing_problem()
     
     # Test primary cost (travel time)
@@ -127,7 +134,7 @@ def test_route_validation():
     print("\n🧪 Test 5: Route Validation")
     print("-" * 35)
     
-    agent = RoutingAgent()
+    agent = shared_agent()
     result = agent.solve_routing_problem()
     
     # Test validation of good result
@@ -138,8 +145,14 @@ def test_route_validation():
     none_valid = agent.validate_decision(None)
     print(f"None result validation: {none_valid}")
     
+    # Test validation of out-of-range segment coordinates
+    off_globe = LocationState(95.0, 7.0, "Off the globe")
+    invalid_valid = agent.validate_decision(RoutingDecision.at_goal(off_globe, off_globe))
+    print(f"Invalid coordinates validation: {invalid_valid}")
+    
     assert is_valid, "Valid route should pass validation"
     assert not none_valid, "None result should fail validation"
+    assert not invalid_valid, "Out-of-range coordinates should fail validation"
     
     print("✅ Route validation test passed")
 
@@ -149,7 +162,7 @@ def test_alternative_locations():
     print("\n🧪 Test 6: Alternative Location Routing")
     print("-" * 45)
     
-    agent = RoutingAgent()
+    agent = shared_agent()
     
     # Test Köln to Düsseldorf (different route)
     result = agent.solve_routing_problem(
@@ -166,6 +179,52 @@ def test_alternative_locations():
     return result
 
 
+def test_already_at_destination():
+    """Test routing is skipped when start and goal coincide"""
+    print("\n🧪 Test 7: Already at Destination")
+    print("-" * 35)
+    
+    agent = shared_agent()
+    result = agent.solve_routing_problem(
+        start_address="Bonn, Germany",
+        end_address="Bonn, Germany"
+    )
+    
+    print(f"Bonn → Bonn: {result.summary()}")
+    
+    assert result.goal_reached, "Goal should be reached without routing"
+    assert result.total_travel_time == 0, "No travel time when already at destination"
+    assert agent.validate_decision(result), "Zero-cost decision should pass validation"
+    
+    print("✅ Already at destination test passed")
+    return result
+
+
+def test_batch_routing():
+    """Test solving several routing problems in one call"""
+    print("\n🧪 Test 8: Batch Routing")
+    print("-" * 25)
+    
+    agent = shared_agent()
+    if not hasattr(agent, "solve_routing_problem_many"):
+        print("⏭️  Batch routing not available for this agent")
+        return None
+    
+    starts = ["Bonn, Germany", "Köln, Germany", "Bonn, Germany"]
+    ends = ["Remagen, Germany", "Düsseldorf, Germany", "Bonn, Germany"]
+    results = agent.solve_routing_problem_many(starts, ends)
+    
+    for start, end, result in zip(starts, ends, results):
+        single = agent.solve_routing_problem(start, end)
+        print(f"{start} → {end}: {result.summary()}")
+        assert abs(result.total_travel_time - single.total_travel_time) < 1e-6, \
+            "Batch result should match the single routing result"
+        assert agent.validate_decision(result), "Batch result should pass validation"
+    
+    print("✅ Batch routing test passed")
+    return results
+
+
 def run_all_tests():
     """Run all routing agent tests"""
     print("🚀 Running Routing Agent Test Suite")
@@ -179,6 +238,8 @@ def run_all_tests():
         test_path_cost_calculation()
         test_route_validation()
         alternative_result = test_alternative_locations()
+        test_already_at_destination()
+        test_batch_routing()
         
         print("\n📊 TEST SUMMARY")
         print("=" * 20)
@@ -3,9 +3,31 @@
 Main entry point for the Simple Reflex Agent for Wildfire Detection
 """
 
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import os
+
 from wildfire_agent import SimpleReflexAgent
 
 
+def assess_location(agent: SimpleReflexAgent, lat: float, lon: float):
+    """
+    Run the agent for one location, returning the exception instead of raising
+
+    Args:
+        agent: Wildfire detection agent
+        lat: Latitude coordinate
+        lon: Longitude coordinate
+
+    Returns:
+        WildfireDecision, or the exception raised while processing the location
+    """
+    try:
+        return agent.run(lat, lon)
+    except Exception as e:
+        return e
+
+
 def main():
     """Main function to demonstrate the wildfire detection agent"""
     print("🔥 Simple Reflex Agent for Wildfire Detection")
@@ -24,36 +46,59 @@ def main():
 
     print(f"\nTesting {len(test_locations)} locations for wildfire risk...\n")
 
-    for lat, lon, location_name in test_locations:
+    # Keep only the raster pixels around the test locations in memory
+    lats = [lat for lat, _, _ in test_locations]
+    lons = [lon for _, lon, _ in test_locations]
+    agent.location_services.preload((min(lons) - 1, min(lats) - 1, max(lons) + 1, max(lats) + 1))
+
+    # The agent keeps no per-run state, so one instance is shared by all workers;
+    # the I/O-bound percept lookups overlap and results keep the input order
+    with ThreadPoolExecutor(max_workers=len(test_locations)) as executor:
+        results = list(
+            executor.map(
+                lambda location: assess_location(agent, location[0], location[1]),
+                test_locations,
+            )
+        )
+
+    risk_emoji = {"LOW": "🟢", "MEDIUM": "🟡", "HIGH": "🟠", "CRITICAL": "🔴"}
+
+    for (lat, lon, location_name), result in zip(test_locations, results):
         print(f"📍 {location_name} ({lat}, {lon})")
         print("-" * 40)
 
-        try:
-            result = agent.run(lat, lon)
+        if isinstance(result, Exception):
+            print(f"❌ Error processing location: {result}")
+            print()
+            continue
 
-            # Display results
-            risk_emoji = {"LOW": "🟢", "MEDIUM": "🟡", "HIGH": "🟠", "CRITICAL": "🔴"}
-
-            print(
-                f"Risk Level: {risk_emoji.get(result.risk_level, '⚪')} {result.risk_level}"
-            )
-            print(f"Confidence: {result.confidence:.2f}")
+        if result is None:
+            print("❌ Error processing location: invalid percepts")
+            print()
+            continue
 
-            if result.alert_message:
-                print(f"Alert: {result.alert_message}")
-            else:
-                print("Alert: No immediate threats detected")
+        # Display results
+        print(
+            f"Risk Level: {risk_emoji.get(result.risk_level, '⚪')} {result.risk_level}"
+        )
+        print(f"Confidence: {result.confidence:.2f}")
 
-            if result.triggered_rules:
-                print(f"Triggered Rules: {', '.join(result.triggered_rules)}")
-            else:
-                print("Triggered Rules: None")
+        if result.alert_message:
+            print(f"Alert: {result.alert_message}")
+        else:
+            print("Alert: No immediate threats detected")
 
-        except Exception as e:
-            print(f"❌ Error processing location: {e}")
+        if result.triggered_rules:
+            print(f"Triggered Rules: {', '.join(result.triggered_rules)}")
+        else:
+            print("Triggered Rules: None")
 
         print()
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=getattr(logging, os.getenv("LOG_LEVEL", "INFO")),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
     main()
@@ -3,151 +3,166 @@
 Test script to demonstrate wildfire detection with various risk scenarios
 """
 
-from wildfire_agent import SimpleReflexAgent, EnvironmentalPercepts
+import json
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+import logging
+import os
+from pathlib import Path
+from types import MappingProxyType
 from zoneinfo import ZoneInfo
 
+from wildfire_agent import SimpleReflexAgent, EnvironmentalPercepts, PerceptBatch, WildfireDecision
 
-def test_high_risk_scenarios():
-    """Test the agent with various high-risk scenarios"""
-    print("🔥 Testing High-Risk Wildfire Scenarios")
-    print("=" * 50)
+try:
+    import orjson
 
-    agent = SimpleReflexAgent()
+    _loads = orjson.loads
+except ImportError:
+    # orjson is optional, fall back to the standard library parser
+    _loads = json.loads
+
+# Display marker of each risk level
+_RISK_EMOJI = MappingProxyType({"LOW": "🟢", "MEDIUM": "🟡", "HIGH": "🟠", "CRITICAL": "🔴"})
+
+# Single timestamp shared by all scenario percepts without a recorded time
+_NOW = datetime.now()
+
+# Scenario definitions with different risk levels
+_SCENARIOS_FILE = Path(__file__).parent / "fixtures" / "scenarios.json"
+
+
+def _to_percepts(scenario: dict) -> tuple[str, EnvironmentalPercepts]:
+    """
+    Build the percepts of one scenario fixture
+
+    Args:
+        scenario: Scenario name and percept values, with an optional local
+            timestamp and its time zone
+
+    Returns:
+        Scenario name and its environmental percepts
+    """
+    timestamp = _NOW
+    if "timestamp" in scenario:
+        timestamp = datetime.fromisoformat(scenario["timestamp"]).replace(
+            tzinfo=ZoneInfo(scenario["timezone"])
+        )
+    return scenario["name"], EnvironmentalPercepts(
+        thermal=scenario["thermal"],
+        humidity=scenario["humidity"],
+        wind_speed=scenario["wind_speed"],
+        landuse=scenario["landuse"],
+        vegetation_density=scenario["vegetation_density"],
+        asset_proximity=scenario["asset_proximity"],
+        timestamp=timestamp,
+        latitude=scenario["latitude"],
+        longitude=scenario["longitude"],
+    )
+
+
+# Test scenarios as (name, percepts) pairs, parsed once at import
+_SCENARIOS: tuple[tuple[str, EnvironmentalPercepts], ...] = tuple(
+    map(_to_percepts, _loads(_SCENARIOS_FILE.read_bytes()))
+)
+
+# Scenario count from which the sweep fans out to worker processes; below it
+# one vectorized batch is faster than pickling percepts to the workers
+_PROCESS_POOL_THRESHOLD = 1000
+
+
+@lru_cache(maxsize=None)
+def _worker_agent() -> SimpleReflexAgent:
+    """Agent with the default rules, one per worker process"""
+    return SimpleReflexAgent()
+
+
+def _evaluate_scenario(percepts: EnvironmentalPercepts) -> WildfireDecision:
+    """
+    Evaluate one scenario in a worker process
+
+    Args:
+        percepts: Environmental percepts of the scenario
 
-    # Define test scenarios with different risk levels
-    scenarios = [
-        {
-            "name": "California Wildfire Season",
-            "percepts": EnvironmentalPercepts(
-                thermal=335.0,  # High temperature (above 330K threshold)
-                humidity=15.0,  # Very low humidity (below 30% threshold)
-                wind_speed=25.0,  # High wind speed (above 15 km/h threshold)
-                landuse="forest",  # Forest land use
-                vegetation_density=0.9,  # Dense vegetation
-                asset_proximity=3.0,  # Close to assets
-                timestamp=datetime.now(),
-                latitude=34.0522,
-                longitude=-118.2437,
-            ),
-        },
-        {
-            "name": "Moderate Grassland Risk",
-            "percepts": EnvironmentalPercepts(
-                thermal=320.0,
-                humidity=25.0,  # Low humidity
-                wind_speed=18.0,  # High wind
-                landuse="grassland",
-                vegetation_density=0.5,
-                asset_proximity=2.0,  # Very close to assets
-                timestamp=datetime.now(),
-                latitude=39.7392,
-                longitude=-104.9903,
-            ),
-        },
-        {
-            "name": "Dense Forest High Temperature",
-            "percepts": EnvironmentalPercepts(
-                thermal=328.0,  # High temperature
-                humidity=25.0,  # Low humidity
-                wind_speed=10.0,  # Moderate wind
-                landuse="forest",
-                vegetation_density=0.8,  # Dense vegetation
-                asset_proximity=12.0,  # Distant from assets
-                timestamp=datetime.now(),
-                latitude=45.5152,
-                longitude=-122.6784,
-            ),
-        },
-        {
-            "name": "Urban Low Risk",
-            "percepts": EnvironmentalPercepts(
-                thermal=295.0,  # Normal temperature
-                humidity=60.0,  # High humidity
-                wind_speed=8.0,  # Low wind
-                landuse="urban",
-                vegetation_density=0.2,  # Low vegetation
-                asset_proximity=1.0,  # Very close to assets
-                timestamp=datetime.now(),
-                latitude=37.7749,
-                longitude=-122.4194,
-            ),
-        },
-        {
-            "name": "Canadian Wildfire SS027-25",
-            "percepts": EnvironmentalPercepts(
-                thermal=294.0,
-                humidity=82.0,
-                wind_speed=6.4,
-                landuse="rangeland",
-                vegetation_density=0.63,
-                asset_proximity=30.0,
-                timestamp=datetime(2025, 8, 4, 22, 47, 0, tzinfo=ZoneInfo("America/Inuvik")),
-                latitude=61.291,
-                longitude=-112.821,
-            )
-        },
-        {
-            "name": "Canadian Wildfire K51411",
-            "percepts": EnvironmentalPercepts(
-                thermal=302.0,
-                humidity=24.0,
-                wind_speed=13.6,
-                landuse="built area",
-                vegetation_density=0.7,
-                asset_proximity=1.0,
-                timestamp=datetime(2025, 8, 5, 22, 50, 0, tzinfo=ZoneInfo("America/Vancouver")),
-                latitude=49.4841,
-                longitude=-119.603,
-            )
-        }
+    Returns:
+        Decision of the worker's agent
+    """
+    return _worker_agent().decide(percepts)
+
+
+def assess_scenarios(
+    agent: SimpleReflexAgent, scenarios: tuple[tuple[str, EnvironmentalPercepts], ...]
+) -> list[WildfireDecision]:
+    """
+    Evaluate scenarios in one batch, or across processes for large sweeps
+
+    Worker processes use agents with the default rules, so sweeps of
+    _PROCESS_POOL_THRESHOLD or more scenarios ignore custom rules of the agent.
+
+    Args:
+        agent: Agent evaluating the batch
+        scenarios: Scenarios as (name, percepts) pairs
+
+    Returns:
+        Decision of each scenario, in the order of the scenarios
+    """
+    percepts_list = [percepts for _, percepts in scenarios]
+
+    if len(scenarios) >= _PROCESS_POOL_THRESHOLD:
+        with ProcessPoolExecutor() as executor:
+            return list(executor.map(_evaluate_scenario, percepts_list, chunksize=256))
+
+    # Evaluate all scenarios in one vectorized pass, decoding decisions of the
+    # scenarios at risk; the others are decided one by one (from the rule cache)
+    at_risk = agent.decide_batch_at_risk(PerceptBatch.from_percepts(percepts_list))
+    return [
+        at_risk[index] if index in at_risk else agent.decide(percepts)
+        for index, percepts in enumerate(percepts_list)
     ]
 
-    for i, scenario in enumerate(scenarios, 1):
-        print(f"\n🎭 Scenario {i}: {scenario['name']}")
-        print("-" * 40)
 
-        percepts = scenario["percepts"]
+def test_high_risk_scenarios():
+    """Test the agent with various high-risk scenarios"""
+    # Report lines are collected and written with a single print
+    lines = ["🔥 Testing High-Risk Wildfire Scenarios", "=" * 50]
 
-        # Display percepts
-        print(f"📊 Environmental Conditions:")
-        print(f"   Temperature: {percepts.thermal}K")
-        print(f"   Humidity: {percepts.humidity}%")
-        print(f"   Wind Speed: {percepts.wind_speed} km/h")
-        print(f"   Land Use: {percepts.landuse}")
-        print(f"   Vegetation Density: {percepts.vegetation_density}")
-        print(f"   Asset Proximity: {percepts.asset_proximity} km")
+    agent = SimpleReflexAgent()
+
+    decisions = assess_scenarios(agent, _SCENARIOS)
 
-        # Make decision using the rule engine
-        decision = agent.decide(percepts)
+    for i, ((name, percepts), decision) in enumerate(zip(_SCENARIOS, decisions), 1):
+        # Display percepts
+        lines += [
+            f"\n🎭 Scenario {i}: {name}",
+            "-" * 40,
+            "📊 Environmental Conditions:",
+            f"   Temperature: {percepts.thermal}K",
+            f"   Humidity: {percepts.humidity}%",
+            f"   Wind Speed: {percepts.wind_speed} km/h",
+            f"   Land Use: {percepts.landuse}",
+            f"   Vegetation Density: {percepts.vegetation_density}",
+            f"   Asset Proximity: {percepts.asset_proximity} km",
+        ]
 
         # Take action
         agent.act(decision)
 
         # Display results
-        risk_emoji = {"LOW": "🟢", "MEDIUM": "🟡", "HIGH": "🟠", "CRITICAL": "🔴"}
-
-        print(f"\n📋 Risk Assessment:")
-        print(
-            f"   Risk Level: {risk_emoji.get(decision.risk_level, '⚪')} {decision.risk_level}"
-        )
-        print(f"   Confidence: {decision.confidence:.2f}")
+        lines += [
+            "\n📋 Risk Assessment:",
+            f"   Risk Level: {_RISK_EMOJI.get(decision.risk_level, '⚪')} {decision.risk_level}",
+            f"   Confidence: {decision.confidence:.2f}",
+            f"   Alert: {decision.alert_message or 'No immediate threats detected'}",
+            f"   Triggered Rules: {', '.join(decision.triggered_rules) or 'None'}",
+        ]
 
-        if decision.alert_message:
-            print(f"   Alert: {decision.alert_message}")
-        else:
-            print("   Alert: No immediate threats detected")
-
-        if decision.triggered_rules:
-            print(f"   Triggered Rules: {', '.join(decision.triggered_rules)}")
-        else:
-            print("   Triggered Rules: None")
+    print("\n".join(lines))
 
 
 def test_custom_rule():
     """Test adding a custom rule to the agent"""
-    print("\n\n🛠️ Testing Custom Rule Addition")
-    print("=" * 50)
+    lines = ["\n\n🛠️ Testing Custom Rule Addition", "=" * 50]
 
     agent = SimpleReflexAgent()
 
@@ -170,25 +185,34 @@ def test_custom_rule():
         landuse="grassland",
         vegetation_density=0.4,  # Some vegetation
         asset_proximity=8.0,
-        timestamp=datetime.now(),
+        timestamp=_NOW,
         latitude=35.0,
         longitude=-115.0,
     )
 
-    print("📊 Testing custom drought rule with percepts:")
-    print(f"   Temperature: {test_percepts.thermal}K")
-    print(f"   Humidity: {test_percepts.humidity}%")
-    print(f"   Vegetation Density: {test_percepts.vegetation_density}")
+    lines += [
+        "📊 Testing custom drought rule with percepts:",
+        f"   Temperature: {test_percepts.thermal}K",
+        f"   Humidity: {test_percepts.humidity}%",
+        f"   Vegetation Density: {test_percepts.vegetation_density}",
+    ]
 
     decision = agent.decide(test_percepts)
     agent.act(decision)
 
-    print(f"\n📋 Result:")
-    print(f"   Risk Level: {decision.risk_level}")
-    print(f"   Alert: {decision.alert_message}")
-    print(f"   Triggered Rules: {', '.join(decision.triggered_rules)}")
+    lines += [
+        "\n📋 Result:",
+        f"   Risk Level: {decision.risk_level}",
+        f"   Alert: {decision.alert_message}",
+        f"   Triggered Rules: {', '.join(decision.triggered_rules)}",
+    ]
+    print("\n".join(lines))
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=getattr(logging, os.getenv("LOG_LEVEL", "INFO")),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
     test_high_risk_scenarios()
     test_custom_rule()
\ No newline at end of file
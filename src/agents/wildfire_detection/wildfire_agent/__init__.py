@@ -5,20 +5,28 @@ This module provides a simple reflex agent for wildfire detection based on
 environmental percepts and condition-action rules.
 """
 
-from wildfire_agent.agent import (
+from .agent import (
     SimpleReflexAgent,
     EnvironmentalPercepts,
     WildfireDecision,
     RuleEngine,
 )
-from wildfire_agent.location import LocationServices
+from .location import LocationServices
+from .batch import PerceptBatch
+from .landuse import LandUse
+from .raster import RasterGrid
+from .assets import AssetIndex
 
-__all__ = [
+__all__ = (
     "SimpleReflexAgent",
-    "EnvironmentalPercepts", 
+    "EnvironmentalPercepts",
     "WildfireDecision",
     "LocationServices",
     "RuleEngine",
-]
+    "PerceptBatch",
+    "LandUse",
+    "RasterGrid",
+    "AssetIndex",
+)
 
 __version__ = "1.0.0"
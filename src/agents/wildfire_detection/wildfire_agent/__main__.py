@@ -0,0 +1,43 @@
+"""
+Example usage of the wildfire detection agent
+
+Run with ``python -m wildfire_agent``; the agent module itself is only ever
+imported, so its classes exist once per process.
+"""
+
+import logging
+import os
+
+from .agent import SimpleReflexAgent
+
+
+def main():
+    """Run the agent for a few example locations"""
+    # Initialize agent
+    agent = SimpleReflexAgent()
+
+    # Test locations
+    test_locations = [
+        (34.0522, -118.2437),  # Los Angeles
+        (37.7749, -122.4194),  # San Francisco
+        (45.5152, -122.6784),  # Portland
+    ]
+
+    for lat, lon in test_locations:
+        print(f"\n--- Testing location: ({lat}, {lon}) ---")
+        result = agent.run(lat, lon)
+        print(f"Risk Level: {result.risk_level}")
+        print(f"Confidence: {result.confidence:.2f}")
+        if result.alert_message:
+            print(f"Alert: {result.alert_message}")
+        print(
+            f"Triggered Rules: {', '.join(result.triggered_rules) if result.triggered_rules else 'None'}"
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=getattr(logging, os.getenv("LOG_LEVEL", "INFO")),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    main()
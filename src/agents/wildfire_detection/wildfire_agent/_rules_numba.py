@@ -0,0 +1,113 @@
+"""
+Default Rule Kernel
+
+This module holds the only definition of the default wildfire rule
+conditions: one function returning a bitmask of triggered rules. It is
+written with element-wise operators so the same code evaluates one location
+(scalars) or a whole batch (NumPy arrays). When Numba is installed the scalar
+form is compiled and batches are evaluated with rows spread across cores;
+otherwise the function runs as plain Python and as NumPy expressions.
+"""
+
+import numpy as np
+
+from .landuse import FOREST, GRASSLAND
+
+try:
+    from numba import njit, prange
+except ImportError:
+    # Numba is optional, fall back to the plain Python kernel
+    njit = None
+    prange = range
+
+JIT_AVAILABLE = njit is not None
+
+# Bits of the default rules in the kernel's result, in registration order
+HIGH_TEMPERATURE_FOREST = 1 << 0
+EXTREME_WEATHER = 1 << 1
+VEGETATION_THERMAL = 1 << 2
+ASSET_PROXIMITY = 1 << 3
+
+
+def cond_jit(signature, parallel=False):
+    """Compile with Numba when available, otherwise return the function unchanged"""
+
+    def decorator(func):
+        if njit is None:
+            return func
+        # No fastmath: NaN percepts must compare False like in Python
+        return njit(signature, cache=True, parallel=parallel)(func)
+
+    return decorator
+
+
+def default_rules_mask(thermal, humidity, wind_speed, landuse_code, vegetation_density,
+                       asset_proximity, thermal_threshold, humidity_threshold, wind_threshold):
+    """
+    Evaluate the default rule conditions, for scalars or NumPy arrays of percepts
+
+    Conditions are combined with & and | instead of and/or so they apply
+    element-wise to arrays; NaN percepts never trigger a rule.
+
+    Args:
+        thermal: Temperature in Kelvin
+        humidity: Humidity percentage
+        wind_speed: Wind speed in km/h
+        landuse_code: Land use code from LANDUSE_CODES
+        vegetation_density: Vegetation density index (0-1)
+        asset_proximity: Distance to nearest asset in km
+        thermal_threshold: Agent's thermal threshold in Kelvin
+        humidity_threshold: Agent's humidity threshold in percent
+        wind_threshold: Agent's wind speed threshold in km/h
+
+    Returns:
+        Bitmask of the triggered default rules (an int array for arrays)
+    """
+    return (
+        ((thermal > thermal_threshold) & (landuse_code == FOREST) & (humidity < humidity_threshold))
+        * HIGH_TEMPERATURE_FOREST
+        | ((wind_speed > wind_threshold) & (humidity < 20) & (thermal > 315)) * EXTREME_WEATHER
+        | ((vegetation_density > 0.6) & (thermal > 325) & (humidity < 40)) * VEGETATION_THERMAL
+        | ((asset_proximity < 5.0) & (thermal > 315) & ((landuse_code == FOREST) | (landuse_code == GRASSLAND)))
+        * ASSET_PROXIMITY
+    )
+
+
+# Default rule conditions for one location, compiled when Numba is installed
+eval_default_rules = cond_jit("u4(f8, f8, f8, i8, f8, f8, f8, f8, f8)")(default_rules_mask)
+
+
+@cond_jit("void(f8[:], f8[:], f8[:], i1[:], f8[:], f8[:], f8, f8, f8, u4[:])", parallel=True)
+def _eval_default_rules_rows(thermal, humidity, wind_speed, landuse_code, vegetation_density,
+                             asset_proximity, thermal_threshold, humidity_threshold, wind_threshold, out):
+    """Compiled scalar kernel applied to every row, rows spread across cores"""
+    for i in prange(thermal.shape[0]):
+        out[i] = eval_default_rules(
+            thermal[i], humidity[i], wind_speed[i], landuse_code[i], vegetation_density[i],
+            asset_proximity[i], thermal_threshold, humidity_threshold, wind_threshold,
+        )
+
+
+def eval_default_rules_batch(thermal, humidity, wind_speed, landuse_code, vegetation_density,
+                             asset_proximity, thermal_threshold, humidity_threshold, wind_threshold, out):
+    """
+    Evaluate the default rule conditions for many locations
+
+    Args:
+        thermal: Temperatures in Kelvin
+        humidity: Humidity percentages
+        wind_speed: Wind speeds in km/h
+        landuse_code: int8 land use codes from LANDUSE_CODES
+        vegetation_density: Vegetation density indices (0-1)
+        asset_proximity: Distances to the nearest asset in km
+        thermal_threshold: Agent's thermal threshold in Kelvin
+        humidity_threshold: Agent's humidity threshold in percent
+        wind_threshold: Agent's wind speed threshold in km/h
+        out: uint32 array receiving the bitmask of triggered default rules per row
+    """
+    args = (thermal, humidity, wind_speed, landuse_code, vegetation_density,
+            asset_proximity, thermal_threshold, humidity_threshold, wind_threshold)
+    if JIT_AVAILABLE:
+        _eval_default_rules_rows(*args, out)
+    else:
+        np.copyto(out, default_rules_mask(*args), casting="unsafe")
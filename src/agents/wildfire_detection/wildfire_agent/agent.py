@@ -5,41 +5,152 @@ This module implements a condition-action rule based agent that detects
 wildfire risk based on environmental percepts.
 """
 
+import functools
 import logging
 import os
-from dataclasses import dataclass
-from datetime import datetime, timedelta, UTC
-from typing import Dict, List, Optional, Callable
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
 from dotenv import load_dotenv
-from wildfire_agent.location import LocationServices
+from ._rules_numba import (
+    ASSET_PROXIMITY,
+    EXTREME_WEATHER,
+    HIGH_TEMPERATURE_FOREST,
+    VEGETATION_THERMAL,
+    eval_default_rules,
+    eval_default_rules_batch,
+)
+from .landuse import LANDUSE_CODES, UNKNOWN_LANDUSE, LandUse, as_landuse
+from .location import LocationServices
+
+if TYPE_CHECKING:
+    from .batch import PerceptBatch
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, os.getenv("LOG_LEVEL", "INFO")),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
 logger = logging.getLogger(__name__)
 
+# Wall clock in nanoseconds for decision timestamps, converted to datetime on access
+_clock_ns = time.time_ns
+
+# Land use classifications accepted by validate, every class a land cover raster
+# can report; the default rules only single out forest and grassland
+_VALID_LANDUSES = frozenset(LandUse)
+
+# Risk levels in priority order, indexed by risk code
+RISK_LEVELS = ("LOW", "MEDIUM", "HIGH", "CRITICAL")
+
+# Default rules as (name, bit in the default rule kernel, alert) in registration
+# order; their conditions are defined once, in _rules_numba.default_rules_mask
+_DEFAULT_RULES = (
+    (
+        "high_temperature_forest",
+        HIGH_TEMPERATURE_FOREST,
+        "🔥 CRITICAL wildfire risk: High temperature in forest with low humidity",
+    ),
+    ("extreme_weather", EXTREME_WEATHER, "⚠️ HIGH wildfire risk: Extreme weather conditions"),
+    ("vegetation_thermal", VEGETATION_THERMAL, "🌲 HIGH wildfire risk: Dense vegetation with elevated temperature"),
+    ("asset_proximity", ASSET_PROXIMITY, "🏘️ MEDIUM wildfire risk: Potential threat to nearby assets"),
+)
+
 
-@dataclass
+@dataclass(slots=True)
+class _RuleThresholds:
+    """Thresholds of the default rules, shared by an agent with its rule functions"""
+
+    thermal: float  # Kelvin
+    humidity: float  # percent
+    wind_speed: float  # km/h
+
+
+def _default_rules_mask(thresholds: _RuleThresholds, percepts: "EnvironmentalPercepts") -> int:
+    """
+    Bitmask of the triggered default rules for percepts at the given thresholds
+
+    Missing (None) values are read as NaN, like in PerceptBatch, so only the
+    conditions reading them fail and the other default rules still trigger.
+    """
+    values = (
+        percepts.thermal,
+        percepts.humidity,
+        percepts.wind_speed,
+        LANDUSE_CODES.get(percepts.landuse, UNKNOWN_LANDUSE),
+        percepts.vegetation_density,
+        percepts.asset_proximity,
+    )
+    try:
+        return eval_default_rules(*values, thresholds.thermal, thresholds.humidity, thresholds.wind_speed)
+    except TypeError:
+        if None not in values:
+            raise
+    values = tuple(np.nan if value is None else value for value in values)
+    return eval_default_rules(*values, thresholds.thermal, thresholds.humidity, thresholds.wind_speed)
+
+
+def _default_rules_batch_mask(thresholds: _RuleThresholds, batch: "PerceptBatch") -> np.ndarray:
+    """Bitmasks of the triggered default rules for a batch at the given thresholds"""
+    masks = np.empty(len(batch), dtype=np.uint32)
+    eval_default_rules_batch(
+        batch.thermal,
+        batch.humidity,
+        batch.wind_speed,
+        batch.landuse_code,
+        batch.vegetation_density,
+        batch.asset_proximity,
+        thresholds.thermal,
+        thresholds.humidity,
+        thresholds.wind_speed,
+        masks,
+    )
+    return masks
+
+
+def _default_rule(
+    thresholds: _RuleThresholds, bit: int, alert: str, percepts: "EnvironmentalPercepts"
+) -> Optional[str]:
+    """Default rule reading its bit from the default rule kernel (bound per rule with functools.partial)"""
+    return alert if _default_rules_mask(thresholds, percepts) & bit else None
+
+
+def risk_code(alert: str) -> int:
+    """Risk code (index into RISK_LEVELS) named by a rule's alert message"""
+    alert = alert.upper()
+    if "CRITICAL" in alert:
+        return 3
+    if "HIGH" in alert:
+        return 2
+    if "MEDIUM" in alert:
+        return 1
+    return 0
+
+
+@dataclass(slots=True)
 class EnvironmentalPercepts:
     """Environmental data percepts for wildfire risk assessment"""
 
     thermal: float  # Temperature in Kelvin
     humidity: float  # Humidity percentage
     wind_speed: float  # Wind speed in km/h
-    landuse: str  # Land use classification
+    landuse: LandUse  # Land use classification (other classes are kept as str)
     vegetation_density: float  # Vegetation density index (0-1)
     asset_proximity: float  # Distance to nearest asset in km
     timestamp: datetime
     latitude: float
     longitude: float
 
+    def __post_init__(self):
+        # Intern known land use classes; rules compare with ==, so a landuse
+        # assigned later as a plain str still matches
+        self.landuse = as_landuse(self.landuse)
+
 
-@dataclass
+# Not frozen: frozen dataclasses set each field through object.__setattr__,
+# which makes constructing a decision about four times slower
+@dataclass(slots=True)
 class WildfireDecision:
     """Decision output from the rule engine"""
 
@@ -47,26 +158,309 @@ class WildfireDecision:
     alert_message: Optional[str]
     confidence: float  # Confidence score (0-1)
     triggered_rules: List[str]  # Names of rules that triggered
-    timestamp: datetime
+    timestamp_ns: int  # Decision time in nanoseconds since the epoch
+
+    @property
+    def timestamp(self) -> datetime:
+        """Decision time as a local naive datetime (like datetime.now())"""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
 
 
 class RuleEngine:
     """Custom rule engine for wildfire detection using condition-action rules"""
 
+    __slots__ = (
+        "rules",
+        "batch_rules",
+        "rule_alerts",
+        "rule_risks",
+        "rule_landuses",
+        "rule_kernel",
+        "batch_kernel",
+        "kernel_bits",
+        "_compiled",
+        "_memoize",
+        "_evaluate_cached",
+    )
+
     def __init__(self):
-        self.rules: List[Callable[[EnvironmentalPercepts], Optional[str]]] = []
-        self.rule_names: Dict[Callable, str] = {}
+        # (name, rule) pairs in registration order
+        self.rules: List[Tuple[str, Callable[[EnvironmentalPercepts], Optional[str]]]] = []
+        self.batch_rules: Dict[Callable, Callable[["PerceptBatch"], Tuple[np.ndarray, str]]] = {}
+        self.rule_alerts: Dict[Callable, str] = {}
+        # Declared risk code of rules whose alerts always name the same level
+        self.rule_risks: Dict[Callable, int] = {}
+        # Land uses a rule can trigger for, the rule is skipped for any other
+        self.rule_landuses: Dict[Callable, FrozenSet[str]] = {}
+        self.rule_kernel: Optional[Callable[[EnvironmentalPercepts], int]] = None
+        self.batch_kernel: Optional[Callable[["PerceptBatch"], np.ndarray]] = None
+        self.kernel_bits: Dict[Callable, int] = {}
+        # (name, rule, bit, alert, risk code, land uses) per rule, built by compile
+        self._compiled: Optional[Tuple[Tuple, ...]] = None
+
+        # Decisions memoized by exact percept values (the timestamp is not part of the key),
+        # only while the rule kernel decides every rule
+        self._memoize = True
+        cache_size = int(os.getenv("RULE_CACHE_SIZE", "4096"))
+        self._evaluate_cached = functools.lru_cache(maxsize=cache_size)(self._evaluate_key)
+
+    def add_rule(
+        self,
+        name: str = None,
+        batch: Callable[["PerceptBatch"], Tuple[np.ndarray, str]] = None,
+        alert: Optional[str] = None,
+        risk_level: Optional[str] = None,
+        requires_landuse: Optional[Iterable[str]] = None,
+    ):
+        """
+        Decorator to add a rule to the engine
 
-    def add_rule(self, name: str = None):
-        """Decorator to add a rule to the engine"""
+        Args:
+            name: Rule name (defaults to the function name)
+            batch: Optional vectorized form of the rule, returning the boolean
+                mask of triggered rows and the alert message
+            alert: Optional constant alert message of the rule, lets a rule
+                kernel covering the rule decide it without calling the rule
+                or its batch form
+            risk_level: Optional risk level of every alert of the rule (one of
+                RISK_LEVELS), defaults to the level named by a constant alert;
+                without it the level is parsed from each alert message
+            requires_landuse: Optional land uses the rule can trigger for; the
+                rule is not called for percepts with any other land use
+        """
 
         def decorator(func: Callable[[EnvironmentalPercepts], Optional[str]]):
-            self.rules.append(func)
-            self.rule_names[func] = name or func.__name__
+            self.rules.append((name or func.__name__, func))
+            if batch is not None:
+                self.batch_rules[func] = batch
+            if alert is not None:
+                self.rule_alerts[func] = alert
+            if risk_level is not None:
+                self.rule_risks[func] = RISK_LEVELS.index(risk_level)
+            elif alert is not None:
+                self.rule_risks[func] = risk_code(alert)
+            if requires_landuse is not None:
+                self.rule_landuses[func] = frozenset(as_landuse(landuse) for landuse in requires_landuse)
+            self._compiled = None
+            self._memoize = self._kernel_decides_all()
+            self.clear_cache()
             return func
 
         return decorator
 
+    def set_rule_kernel(
+        self,
+        kernel: Callable[[EnvironmentalPercepts], int],
+        bits: Dict[Callable, int],
+        batch_kernel: Optional[Callable[["PerceptBatch"], np.ndarray]] = None,
+    ):
+        """
+        Install a kernel evaluating the conditions of several rules at once
+
+        Rules whose bit is not set in the kernel's result are skipped and
+        covered rules with a constant alert are decided from their bit without
+        being called; rules without a bit (e.g. added later) are always called.
+
+        Args:
+            kernel: Function returning the bitmask of triggered rules for percepts
+            bits: Bit of each rule covered by the kernel
+            batch_kernel: Optional function returning the bitmasks of a whole
+                batch; covered rules with a constant alert are then decided
+                from it instead of their batch forms
+        """
+        self.rule_kernel = kernel
+        self.kernel_bits = bits
+        self.batch_kernel = batch_kernel
+        self._compiled = None
+        self._memoize = self._kernel_decides_all()
+        self.clear_cache()
+
+    def compile(self) -> Tuple[Tuple, ...]:
+        """
+        Resolve the per-rule lookups of the rule sweep for the installed rules
+
+        Each rule's name, kernel bit, constant alert, risk code and land uses
+        are gathered into one tuple, so evaluating percepts walks that tuple
+        instead of looking every rule up in the rule dicts. Runs on the first
+        evaluation after add_rule or set_rule_kernel; call it once the rule set
+        is final to keep that work out of the first decision.
+
+        Returns:
+            The (name, rule, bit, alert, risk code, land uses) entry of each
+            rule in registration order
+        """
+        self._compiled = tuple(
+            (
+                name,
+                rule,
+                self.kernel_bits.get(rule),
+                self.rule_alerts.get(rule),
+                self.rule_risks.get(rule),
+                self.rule_landuses.get(rule),
+            )
+            for name, rule in self.rules
+        )
+        return self._compiled
+
+    def _kernel_decides_all(self) -> bool:
+        """Whether every rule is decided by its kernel bit, so decisions only depend on the percept values"""
+        return all(rule in self.kernel_bits and rule in self.rule_alerts for _, rule in self.rules)
+
+    @property
+    def rule_names(self) -> Dict[Callable, str]:
+        """Name of each rule function"""
+        return {rule: name for name, rule in self.rules}
+
+    def clear_cache(self) -> None:
+        """Drop memoized decisions (call after changing thresholds read by the rules)"""
+        self._evaluate_cached.cache_clear()
+
+    def cache_info(self) -> Tuple:
+        """Hit/miss statistics of the decision cache (hits, misses, maxsize, currsize)"""
+        return self._evaluate_cached.cache_info()
+
+    def _kernel_mask(self, percepts: EnvironmentalPercepts) -> Optional[int]:
+        """Bitmask from the rule kernel, None if there is none or it cannot read the percepts"""
+        if self.rule_kernel is None:
+            return None
+        try:
+            return self.rule_kernel(percepts)
+        except (TypeError, ValueError):
+            # Values the kernel cannot read: let the Python rules report their errors
+            return None
+
+    def evaluate_batch(self, batch: "PerceptBatch") -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Evaluate all rules against a batch of percepts
+
+        Rules with a batch form are evaluated as one vectorized mask; other
+        rules are called row by row.
+
+        Args:
+            batch: Percepts of many locations
+
+        Returns:
+            Risk levels (str array), confidences (float array) and the
+            triggered mask with one column per rule in registration order
+        """
+        risk, confidence, triggered, _ = self._evaluate_batch(batch)
+        return np.array(RISK_LEVELS)[risk], confidence, triggered
+
+    def batch_decisions(
+        self, batch: "PerceptBatch", timestamp_ns: Optional[int] = None
+    ) -> Dict[int, WildfireDecision]:
+        """
+        Evaluate a batch of percepts and decode decisions for the rows at risk
+
+        Rows left at LOW risk get no WildfireDecision, so scans over large
+        areas only build objects for the locations that need an alert.
+
+        Args:
+            batch: Percepts of many locations
+            timestamp_ns: Time of all decisions in epoch nanoseconds, read from
+                the clock if omitted
+
+        Returns:
+            Decisions of the rows above LOW risk, keyed by row index
+        """
+        risk, confidence, triggered, alerts = self._evaluate_batch(batch)
+        if timestamp_ns is None:
+            timestamp_ns = _clock_ns()
+        # Rows triggering the same rules share their rule names and, when all
+        # of those rules have a constant alert, their joined alert message
+        combinations = {}
+        decisions = {}
+        for index in np.flatnonzero(risk).tolist():
+            columns = tuple(np.flatnonzero(triggered[index]).tolist())
+            combination = combinations.get(columns)
+            if combination is None:
+                constant = all(isinstance(alerts[column], str) for column in columns)
+                combination = combinations[columns] = (
+                    "; ".join(alerts[column] for column in columns) if constant else None,
+                    [self.rules[column][0] for column in columns],
+                )
+            alert_message, rule_names = combination
+            if alert_message is None:
+                alert_message = "; ".join(
+                    alerts[column] if isinstance(alerts[column], str) else alerts[column][index]
+                    for column in columns
+                )
+            decisions[index] = WildfireDecision(
+                risk_level=RISK_LEVELS[risk[index]],
+                alert_message=alert_message,
+                confidence=float(confidence[index]),
+                triggered_rules=list(rule_names),
+                timestamp_ns=timestamp_ns,
+            )
+        return decisions
+
+    def _evaluate_batch(self, batch: "PerceptBatch") -> Tuple[np.ndarray, np.ndarray, np.ndarray, List]:
+        """
+        Evaluate all rules against a batch of percepts
+
+        Returns:
+            Risk codes (int8 array), confidences, the triggered mask and the
+            alert of each rule: a str for batch rules, a dict of row index to
+            alert for rules called row by row
+        """
+        count = len(batch)
+        triggered = np.zeros((count, len(self.rules)), dtype=bool)
+        risk = np.zeros(count, dtype=np.int8)
+        alerts = []
+        kernel_masks = self.batch_kernel(batch) if self.batch_kernel is not None else None
+        compiled = self._compiled if self._compiled is not None else self.compile()
+
+        for column, (name, rule, bit, alert, code, landuses) in enumerate(compiled):
+            if kernel_masks is not None and bit is not None and alert is not None:
+                mask = (kernel_masks & bit) != 0
+                triggered[:, column] = mask
+                np.maximum(risk, np.where(mask, code, 0), out=risk)
+                alerts.append(alert)
+                continue
+            allowed = self._landuse_mask(batch, landuses) if landuses is not None else None
+            batch_rule = self.batch_rules.get(rule)
+            if batch_rule is not None:
+                mask, alert = batch_rule(batch)
+                if allowed is not None:
+                    mask = mask & allowed
+                triggered[:, column] = mask
+                np.maximum(risk, np.where(mask, risk_code(alert) if code is None else code, 0), out=risk)
+                alerts.append(alert)
+                continue
+            row_alerts = {}
+            for index in range(count) if allowed is None else np.flatnonzero(allowed).tolist():
+                try:
+                    result = rule(batch.row(index))
+                except Exception as e:
+                    logger.error("Error evaluating rule %s: %s", name, e)
+                    continue
+                if result:
+                    triggered[index, column] = True
+                    risk[index] = max(risk[index], risk_code(result) if code is None else code)
+                    row_alerts[index] = result
+            alerts.append(row_alerts)
+
+        # Confidence from the number of triggered rules, raised by the risk level
+        confidence = np.minimum(triggered.sum(axis=1) * 0.3, 1.0)
+        confidence = np.select(
+            [risk == 3, risk == 2, risk == 1],
+            [1.0, np.minimum(confidence + 0.1, 1.0), np.minimum(confidence + 0.05, 1.0)],
+            confidence,
+        )
+
+        # Adaptive thresholding, same adjustments as adaptive_thresholding
+        threshold = np.full(count, 0.6)
+        threshold -= np.where(batch.asset_proximity < 500, 0.1, 0.0)
+        threshold -= np.where(batch.vegetation_density > 0.7, 0.05, 0.0)
+        threshold += np.where(batch.humidity > 0.7, 0.1, 0.0)
+        below = confidence < np.clip(threshold, 0.4, 0.9)
+
+        risk[below] = 0
+        confidence[below] = 0.0
+        triggered[below] = False
+
+        return risk, confidence, triggered, alerts
+
     def adaptive_thresholding(self, percepts: EnvironmentalPercepts, base_threshold: float = 0.6) -> float:
         """Apply adaptive thresholding to the confidence score"""
         p_thr = base_threshold
@@ -78,34 +472,104 @@ class RuleEngine:
             p_thr += 0.1  # damp conditions justify higher threshold
         return max(0.4, min(p_thr, 0.9))  # keep thresholds in safe range
 
-    def evaluate(self, percepts: EnvironmentalPercepts) -> WildfireDecision:
-        """Evaluate all rules against the percepts"""
-        triggered_rules = []
-        alerts = []
-        max_risk_level = "LOW"
+    def evaluate(self, percepts: EnvironmentalPercepts, timestamp_ns: Optional[int] = None) -> WildfireDecision:
+        """
+        Evaluate all rules against the percepts
+
+        While the rule kernel decides every rule (e.g. only the default rules
+        are installed), decisions are memoized by the exact percept values so
+        repeated percepts skip the rule sweep. Once other rules are installed,
+        which may read the timestamp or outside state, every call runs the
+        rules against the given percepts.
+
+        Args:
+            percepts: Percepts to evaluate
+            timestamp_ns: Decision time in epoch nanoseconds, read from the
+                clock if omitted (pass one time to stamp a batch of decisions)
+        """
+        if not self._memoize or self.rule_kernel is None:
+            return self._evaluate(percepts, timestamp_ns)
+        key = (
+            percepts.thermal,
+            percepts.humidity,
+            percepts.wind_speed,
+            percepts.landuse,
+            percepts.vegetation_density,
+            percepts.asset_proximity,
+            percepts.latitude,
+            percepts.longitude,
+        )
+        decision = self._evaluate_cached(key)
+        # Fresh copy per call, callers own their decision
+        return replace(
+            decision,
+            triggered_rules=list(decision.triggered_rules),
+            timestamp_ns=_clock_ns() if timestamp_ns is None else timestamp_ns,
+        )
 
-        # Risk level priority: LOW < MEDIUM < HIGH < CRITICAL
-        risk_priority = {"LOW": 0, "MEDIUM": 1, "HIGH": 2, "CRITICAL": 3}
+    def _evaluate_key(self, key: Tuple) -> WildfireDecision:
+        """Evaluate kernel-decided rules for percepts given as a cache key"""
+        thermal, humidity, wind_speed, landuse, vegetation_density, asset_proximity, latitude, longitude = key
+        return self._evaluate(
+            EnvironmentalPercepts(
+                thermal=thermal,
+                humidity=humidity,
+                wind_speed=wind_speed,
+                landuse=landuse,
+                vegetation_density=vegetation_density,
+                asset_proximity=asset_proximity,
+                timestamp=None,
+                latitude=latitude,
+                longitude=longitude,
+            )
+        )
 
-        for rule in self.rules:
+    @staticmethod
+    def _landuse_mask(batch: "PerceptBatch", landuses: FrozenSet[str]) -> np.ndarray:
+        """Rows of a batch whose land use is one of the given land uses"""
+        codes = [LANDUSE_CODES.get(landuse) for landuse in landuses]
+        if None not in codes:
+            return np.isin(batch.landuse_code, codes)
+        return np.fromiter((landuse in landuses for landuse in batch.landuse), dtype=bool, count=len(batch))
+
+    def _sweep(self, percepts: EnvironmentalPercepts) -> Tuple[List[str], List[str], int]:
+        """Names and alert messages of the triggered rules, in registration order, and the highest risk code"""
+        triggered_rules = []
+        alerts = []
+        risk = 0
+
+        mask = self._kernel_mask(percepts)
+        compiled = self._compiled if self._compiled is not None else self.compile()
+
+        for name, rule, bit, alert, code, landuses in compiled:
+            if bit is not None and mask is not None:
+                if not mask & bit:
+                    continue
+                if alert is not None:
+                    # Decided by the kernel, only called when the kernel could not run
+                    triggered_rules.append(name)
+                    alerts.append(alert)
+                    risk = max(risk, code)
+                    continue
+            if landuses is not None and percepts.landuse not in landuses:
+                continue
             try:
                 result = rule(percepts)
                 if result:
-                    rule_name = self.rule_names[rule]
-                    triggered_rules.append(rule_name)
+                    triggered_rules.append(name)
                     alerts.append(result)
-
-                    # Extract risk level from result
-                    if "CRITICAL" in result.upper():
-                        max_risk_level = "CRITICAL"
-                    elif "HIGH" in result.upper() and risk_priority[max_risk_level] < 2:
-                        max_risk_level = "HIGH"
-                    elif (
-                        "MEDIUM" in result.upper() and risk_priority[max_risk_level] < 1
-                    ):
-                        max_risk_level = "MEDIUM"
+                    risk = max(risk, risk_code(result) if code is None else code)
             except Exception as e:
-                logger.error(f"Error evaluating rule {self.rule_names[rule]}: {e}")
+                logger.error("Error evaluating rule %s: %s", name, e)
+
+        return triggered_rules, alerts, risk
+
+    def _evaluate(self, percepts: EnvironmentalPercepts, timestamp_ns: Optional[int] = None) -> WildfireDecision:
+        """Evaluate all rules against the percepts without the cache"""
+        triggered_rules, alerts, risk = self._sweep(percepts)
+
+        # Highest risk of the triggered rules: LOW < MEDIUM < HIGH < CRITICAL
+        max_risk_level = RISK_LEVELS[risk]
 
         # Calculate confidence based on number of triggered rules
         confidence = min(len(triggered_rules) * 0.3, 1.0) if triggered_rules else 0.0
@@ -132,7 +596,7 @@ class RuleEngine:
             alert_message=alert_message,
             confidence=confidence,
             triggered_rules=triggered_rules,
-            timestamp=datetime.now(),
+            timestamp_ns=_clock_ns() if timestamp_ns is None else timestamp_ns,
         )
 
 
@@ -142,65 +606,67 @@ class SimpleReflexAgent:
     def __init__(self, rapidapi_key: Optional[str] = None):
         self.location_services = LocationServices(rapidapi_key)
         self.rule_engine = RuleEngine()
-        self._setup_default_rules()
 
-        # Configuration thresholds
-        self.thermal_threshold = float(os.getenv("THERMAL_THRESHOLD", "330"))
-        self.humidity_threshold = float(os.getenv("HUMIDITY_THRESHOLD", "30"))
-        self.wind_threshold = float(os.getenv("WIND_SPEED_THRESHOLD", "15"))
+        # Configuration thresholds, read by the default rule kernel on every call
+        self._thresholds = _RuleThresholds(
+            thermal=float(os.getenv("THERMAL_THRESHOLD", "330")),
+            humidity=float(os.getenv("HUMIDITY_THRESHOLD", "30")),
+            wind_speed=float(os.getenv("WIND_SPEED_THRESHOLD", "15")),
+        )
+
+        self._setup_default_rules()
 
         logger.info("SimpleReflexAgent initialized")
 
-    def _setup_default_rules(self):
-        """Setup default wildfire detection rules"""
+    @property
+    def thermal_threshold(self) -> float:
+        """Temperature threshold in Kelvin"""
+        return self._thresholds.thermal
 
-        @self.rule_engine.add_rule("high_temperature_forest")
-        def high_temperature_forest_rule(
-            percepts: EnvironmentalPercepts,
-        ) -> Optional[str]:
-            if (
-                percepts.thermal > self.thermal_threshold
-                and percepts.landuse == "forest"
-                and percepts.humidity < self.humidity_threshold
-            ):
-                return "🔥 CRITICAL wildfire risk: High temperature in forest with low humidity"
-            return None
+    @thermal_threshold.setter
+    def thermal_threshold(self, value: float):
+        self._thresholds.thermal = float(value)
+        self.rule_engine.clear_cache()
 
-        @self.rule_engine.add_rule("extreme_weather")
-        def extreme_weather_rule(percepts: EnvironmentalPercepts) -> Optional[str]:
-            if (
-                percepts.wind_speed > self.wind_threshold
-                and percepts.humidity < 20
-                and percepts.thermal > 315
-            ):
-                return "⚠️ HIGH wildfire risk: Extreme weather conditions"
-            return None
+    @property
+    def humidity_threshold(self) -> float:
+        """Humidity threshold in percent"""
+        return self._thresholds.humidity
 
-        @self.rule_engine.add_rule("vegetation_thermal")
-        def vegetation_thermal_rule(percepts: EnvironmentalPercepts) -> Optional[str]:
-            if (
-                percepts.vegetation_density > 0.6
-                and percepts.thermal > 325
-                and percepts.humidity < 40
-            ):
-                return (
-                    "🌲 HIGH wildfire risk: Dense vegetation with elevated temperature"
-                )
-            return None
+    @humidity_threshold.setter
+    def humidity_threshold(self, value: float):
+        self._thresholds.humidity = float(value)
+        self.rule_engine.clear_cache()
 
-        @self.rule_engine.add_rule("asset_proximity")
-        def asset_proximity_rule(percepts: EnvironmentalPercepts) -> Optional[str]:
-            if (
-                percepts.asset_proximity < 5.0
-                and percepts.thermal > 315
-                and percepts.landuse in ["forest", "grassland"]
-            ):
-                return "🏘️ MEDIUM wildfire risk: Potential threat to nearby assets"
-            return None
+    @property
+    def wind_threshold(self) -> float:
+        """Wind speed threshold in km/h"""
+        return self._thresholds.wind_speed
+
+    @wind_threshold.setter
+    def wind_threshold(self, value: float):
+        self._thresholds.wind_speed = float(value)
+        self.rule_engine.clear_cache()
+
+    def _setup_default_rules(self):
+        """Setup default wildfire detection rules, all decided by the default rule kernel"""
+        bits = {}
+        for name, bit, alert in _DEFAULT_RULES:
+            rule = functools.partial(_default_rule, self._thresholds, bit, alert)
+            self.rule_engine.add_rule(name, alert=alert)(rule)
+            bits[rule] = bit
+        # Conditions of all default rules evaluated in one call, for percepts and for batches
+        self.rule_engine.set_rule_kernel(
+            functools.partial(_default_rules_mask, self._thresholds),
+            bits,
+            batch_kernel=functools.partial(_default_rules_batch_mask, self._thresholds),
+        )
 
     def perceive(self, lat: float, lon: float, 
                  max_thermal_age_hours: float = 6.0,
-                 max_weather_age_hours: float = 12.0) -> EnvironmentalPercepts:
+                 max_weather_age_hours: float = 12.0,
+                 bundle: Optional[Dict] = None,
+                 now: Optional[datetime] = None) -> EnvironmentalPercepts:
         """
         Perceive environmental conditions at given location
         
@@ -209,61 +675,34 @@ class SimpleReflexAgent:
             lon: Longitude coordinate  
             max_thermal_age_hours: Maximum age for thermal data to be considered valid (default: 6 hours)
             max_weather_age_hours: Maximum age for weather data to be considered valid (default: 12 hours)
+            bundle: Environmental data already fetched with LocationServices.get_bundle
+            now: Local time of the percepts, read from the clock if omitted
+                (pass one time to stamp a batch of percepts)
         """
-        logger.info(f"Perceiving environmental data at ({lat}, {lon})")
+        logger.info("Perceiving environmental data at (%s, %s)", lat, lon)
+        if now is None:
+            now = datetime.now()
 
         try:
             # Detect thermal anomalies, land cover, weather, vegetation density, and asset proximity
-            # Get thermal data with global coverage is not available, so we mock it
-            thermal = self.location_services.get_thermal_data(lat, lon)
-            
-            # Check for nearby thermal activity with time constraint
-            thermal_nearby = self.location_services.get_thermal_activity_nearby(lat, lon)
-            if (
-                thermal_nearby
-                and thermal_nearby["confidence"] > 0.5
-                and thermal_nearby.get("acquisition")
-            ):
-                try:
-                    acquisition_time = datetime.fromisoformat(thermal_nearby["acquisition"])
-                except (ValueError, TypeError):
-                    acquisition_time = None
-
-                if acquisition_time and datetime.now(UTC) - acquisition_time <= timedelta(hours=max_thermal_age_hours):
-                    thermal_threshold = float(os.getenv("THERMAL_THRESHOLD", "330"))
-                    thermal = thermal_threshold
-                    logger.info(
-                        f"Using nearby thermal activity: confidence={thermal_nearby['confidence']:.2f}, "
-                        f"detected {thermal_nearby.get('hours_since_detected', 'N/A')} hours ago"
-                    )
-                elif (
-                    "hours_since_detected" in thermal_nearby
-                    and thermal_nearby["hours_since_detected"] > max_thermal_age_hours
-                ):
-                    logger.info(
-                        f"Ignoring stale thermal activity: {thermal_nearby['hours_since_detected']:.1f} hours old "
-                        f"(max age: {max_thermal_age_hours} hours)"
-                    )
-            elif (
-                thermal_nearby
-                and "hours_since_detected" in thermal_nearby
-                and thermal_nearby["hours_since_detected"] > max_thermal_age_hours
-            ):
-                logger.info(
-                    f"Ignoring stale thermal activity: {thermal_nearby['hours_since_detected']:.1f} hours old "
-                    f"(max age: {max_thermal_age_hours} hours)"
-                )
+            # in one lookup; thermal data with global coverage is not available, so it is mocked
+            if bundle is None:
+                bundle = self.location_services.get_bundle(lat, lon)
+            thermal = bundle["thermal"]
             
+            # Use nearby thermal activity if it is recent enough
+            thermal = self._apply_nearby_thermal(thermal, bundle["thermal_nearby"], max_thermal_age_hours, now)
+
             # Land cover data is relatively stable and doesn't need time constraints
-            land_cover = self.location_services.get_land_cover(lat, lon)
+            land_cover = bundle["land_cover"]
             
             # Weather data should be recent for accurate fire risk assessment
-            weather = self.location_services.get_weather_data(lat, lon)
+            weather = bundle["weather"]
             # Note: In a real implementation, you would check the timestamp of weather data
             # and reject data older than max_weather_age_hours
             
-            vegetation = self.location_services.get_vegetation_density(lat, lon)
-            assets = self.location_services.get_asset_proximity(lat, lon)
+            vegetation = bundle["vegetation_density"]
+            assets = bundle["asset_proximity"]
 
             percepts = EnvironmentalPercepts(
                 thermal=thermal,
@@ -272,24 +711,84 @@ class SimpleReflexAgent:
                 landuse=land_cover,
                 vegetation_density=vegetation,
                 asset_proximity=assets,
-                timestamp=datetime.now(),
+                timestamp=now,
                 latitude=lat,
                 longitude=lon,
             )
 
             logger.info(
-                f"Percepts gathered: thermal={thermal}K, humidity={weather['humidity']}%, landuse={land_cover}"
+                "Percepts gathered: thermal=%sK, humidity=%s%%, landuse=%s", thermal, weather["humidity"], land_cover
             )
             return percepts
 
         except Exception as e:
-            logger.error(f"Error perceiving environmental data: {e}")
+            logger.error("Error perceiving environmental data: %s", e)
             raise
 
+    def _apply_nearby_thermal(
+        self, thermal: float, nearby: Optional[Dict], max_age_hours: float, now: datetime
+    ) -> float:
+        """
+        Thermal percept raised to the threshold by recent nearby thermal activity
+
+        Args:
+            thermal: Thermal reading at the location in Kelvin
+            nearby: Nearby thermal activity from LocationServices.get_thermal_activity_nearby
+            max_age_hours: Maximum age for the thermal activity to be considered valid
+            now: Local time of the percepts
+
+        Returns:
+            The thermal threshold for confident recent activity, otherwise the reading
+        """
+        if not nearby:
+            return thermal
+
+        if nearby["confidence"] > 0.5:
+            acquisition_epoch = nearby.get("acquisition_epoch")
+            if acquisition_epoch is None and nearby.get("acquisition"):
+                # Providers without the epoch time only report the ISO string
+                try:
+                    acquisition_epoch = datetime.fromisoformat(nearby["acquisition"]).timestamp()
+                except (ValueError, TypeError):
+                    pass
+            if acquisition_epoch is not None and now.timestamp() - acquisition_epoch <= max_age_hours * 3600.0:
+                logger.info(
+                    "Using nearby thermal activity: confidence=%.2f, detected %s hours ago",
+                    nearby["confidence"],
+                    nearby.get("hours_since_detected", "N/A"),
+                )
+                return self._thresholds.thermal
+
+        hours_since_detected = nearby.get("hours_since_detected")
+        if hours_since_detected is not None and hours_since_detected > max_age_hours:
+            logger.info(
+                "Ignoring stale thermal activity: %.1f hours old (max age: %s hours)",
+                hours_since_detected,
+                max_age_hours,
+            )
+        return thermal
+
     def validate(self, percepts: EnvironmentalPercepts) -> bool:
         """Validate percepts before decision making - pre-filter guardrails"""
         logger.info("Validating percepts")
-        
+
+        # Common case first: every field in range in one chained comparison,
+        # the checks below only run to report what is wrong
+        try:
+            if (
+                percepts.landuse in _VALID_LANDUSES
+                and 200 <= percepts.thermal <= 400
+                and 0 <= percepts.humidity <= 100
+                and 0 <= percepts.wind_speed <= 200
+                and 0 <= percepts.vegetation_density <= 1
+                and percepts.asset_proximity >= 0
+                and -90 <= percepts.latitude <= 90
+                and -180 <= percepts.longitude <= 180
+            ):
+                return True
+        except TypeError:
+            pass  # a missing field, reported below
+
         # Check for None values in critical fields
         if (percepts.thermal is None or percepts.humidity is None or 
             percepts.wind_speed is None or percepts.vegetation_density is None or
@@ -300,70 +799,109 @@ class SimpleReflexAgent:
 
         # Validate thermal temperature (realistic Earth surface temperatures in Kelvin)
         if percepts.thermal < 200 or percepts.thermal > 400:
-            logger.error(f"Unrealistic thermal temperature: {percepts.thermal}K (valid range: 200-400K)")
+            logger.error("Unrealistic thermal temperature: %sK (valid range: 200-400K)", percepts.thermal)
             return False
 
         # Validate humidity percentage (0-100%)
         if percepts.humidity < 0 or percepts.humidity > 100:
-            logger.error(f"Invalid humidity: {percepts.humidity}% (valid range: 0-100%)")
+            logger.error("Invalid humidity: %s%% (valid range: 0-100%%)", percepts.humidity)
             return False
 
         # Validate wind speed (non-negative, realistic maximum)
         if percepts.wind_speed < 0 or percepts.wind_speed > 200:
-            logger.error(f"Invalid wind speed: {percepts.wind_speed} km/h (valid range: 0-200 km/h)")
+            logger.error("Invalid wind speed: %s km/h (valid range: 0-200 km/h)", percepts.wind_speed)
             return False
 
         # Validate vegetation density (0-1 index)
         if percepts.vegetation_density < 0 or percepts.vegetation_density > 1:
-            logger.error(f"Invalid vegetation density: {percepts.vegetation_density} (valid range: 0-1)")
+            logger.error("Invalid vegetation density: %s (valid range: 0-1)", percepts.vegetation_density)
             return False
 
         # Validate asset proximity (non-negative distance)
         if percepts.asset_proximity < 0:
-            logger.error(f"Invalid asset proximity: {percepts.asset_proximity} km (must be >= 0)")
+            logger.error("Invalid asset proximity: %s km (must be >= 0)", percepts.asset_proximity)
             return False
 
         # Validate geographic coordinates
         if percepts.latitude < -90 or percepts.latitude > 90:
-            logger.error(f"Invalid latitude: {percepts.latitude} (valid range: -90 to 90)")
+            logger.error("Invalid latitude: %s (valid range: -90 to 90)", percepts.latitude)
             return False
         
         if percepts.longitude < -180 or percepts.longitude > 180:
-            logger.error(f"Invalid longitude: {percepts.longitude} (valid range: -180 to 180)")
+            logger.error("Invalid longitude: %s (valid range: -180 to 180)", percepts.longitude)
             return False
 
         # Validate landuse classification
-        valid_landuses = {"urban", "forest", "grassland"}
-        if percepts.landuse not in valid_landuses:
-            logger.error(f"Invalid landuse: {percepts.landuse} (valid options: {valid_landuses})")
+        if percepts.landuse not in _VALID_LANDUSES:
+            logger.error(
+                "Invalid landuse: %s (valid options: %s)", percepts.landuse, ", ".join(sorted(_VALID_LANDUSES))
+            )
             return False
         
         return True
 
-    def decide(self, percepts: EnvironmentalPercepts) -> WildfireDecision:
-        """Apply rule engine to make decision"""
+    def decide(self, percepts: EnvironmentalPercepts, timestamp_ns: Optional[int] = None) -> WildfireDecision:
+        """Apply rule engine to make decision (timestamp_ns as for RuleEngine.evaluate)"""
         logger.info("Evaluating percepts with rule engine")
-        decision = self.rule_engine.evaluate(percepts)
+        decision = self.rule_engine.evaluate(percepts, timestamp_ns)
         logger.info(
-            f"Decision: {decision.risk_level} risk, {len(decision.triggered_rules)} rules triggered"
+            "Decision: %s risk, %d rules triggered", decision.risk_level, len(decision.triggered_rules)
         )
         return decision
 
+    def decide_batch(self, batch: "PerceptBatch") -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Apply rule engine to a batch of percepts
+
+        Args:
+            batch: Percepts of many locations
+
+        Returns:
+            Risk levels, confidences and the triggered rule mask (see RuleEngine.evaluate_batch)
+        """
+        logger.info("Evaluating %d percepts with rule engine", len(batch))
+        risk_levels, confidences, triggered = self.rule_engine.evaluate_batch(batch)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Batch decision: %d locations at risk", np.count_nonzero(risk_levels != "LOW"))
+        return risk_levels, confidences, triggered
+
+    def decide_batch_at_risk(
+        self, batch: "PerceptBatch", timestamp_ns: Optional[int] = None
+    ) -> Dict[int, WildfireDecision]:
+        """
+        Apply rule engine to a batch of percepts, keeping decisions above LOW risk
+
+        Args:
+            batch: Percepts of many locations
+            timestamp_ns: Time of all decisions in epoch nanoseconds, read from
+                the clock if omitted
+
+        Returns:
+            Decisions of the rows at risk, keyed by row index (see RuleEngine.batch_decisions)
+        """
+        logger.info("Evaluating %d percepts with rule engine", len(batch))
+        decisions = self.rule_engine.batch_decisions(batch, timestamp_ns)
+        logger.info("Batch decision: %d locations at risk", len(decisions))
+        return decisions
+
     def act(self, decision: WildfireDecision) -> None:
         """Take action based on decision"""
         if decision.alert_message:
-            logger.warning(f"WILDFIRE ALERT: {decision.alert_message}")
+            logger.warning("WILDFIRE ALERT: %s", decision.alert_message)
             # In a real implementation, this could send notifications,
             # trigger emergency systems, etc.
         else:
-            logger.info(f"No alerts. Risk level: {decision.risk_level}")
+            logger.info("No alerts. Risk level: %s", decision.risk_level)
 
     def run(self, lat: float, lon: float) -> WildfireDecision:
         """Main agent execution cycle: perceive -> decide -> act"""
-        logger.info(f"Running wildfire detection for location ({lat}, {lon})")
+        logger.info("Running wildfire detection for location (%s, %s)", lat, lon)
+
+        # One clock read stamps both the percepts and the decision
+        timestamp_ns = _clock_ns()
 
         # Perceive
-        percepts = self.perceive(lat, lon)
+        percepts = self.perceive(lat, lon, now=datetime.fromtimestamp(timestamp_ns / 1e9))
 
         # Validate
         if not self.validate(percepts):
@@ -371,37 +909,88 @@ class SimpleReflexAgent:
             return None
 
         # Decide
-        decision = self.decide(percepts)
+        decision = self.decide(percepts, timestamp_ns)
 
         # Act
         self.act(decision)
 
         return decision
 
-    def add_rule(self, name: str = None):
+    def run_many(
+        self, points: Sequence[Tuple[float, float]], max_workers: Optional[int] = None
+    ) -> List[Optional[WildfireDecision]]:
+        """
+        Agent execution cycle for many locations in a thread pool, so the
+        I/O-bound percept lookups of different locations overlap
+
+        Args:
+            points: (lat, lon) coordinates
+            max_workers: Concurrent locations (default: the location services' max_workers)
+
+        Returns:
+            Decisions in the order of the points, None for invalid percepts
+        """
+        if max_workers is None:
+            max_workers = self.location_services.max_workers
+        if len(points) <= 1 or max_workers <= 1:
+            return [self.run(lat, lon) for lat, lon in points]
+
+        # The agent keeps no per-run state and the lookup cache is locked
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(points))) as executor:
+            return list(executor.map(lambda point: self.run(*point), points))
+
+    def run_batch(self, lats: List[float], lons: List[float]) -> Dict[int, WildfireDecision]:
+        """
+        Agent execution cycle for many locations: fetch the data of all
+        locations concurrently, decide for all of them in one vectorized pass
+        and act on the alerts
+
+        Args:
+            lats: Latitude coordinates
+            lons: Longitude coordinates, one per latitude
+
+        Returns:
+            Decisions of the locations above LOW risk, keyed by their index in
+            the input; locations with invalid percepts are skipped
+        """
+        from .batch import PerceptBatch
+
+        logger.info("Running wildfire detection for %d locations", len(lats))
+
+        # Perceive from one bundled lookup per location, fetched concurrently, and validate
+        points = list(zip(lats, lons))
+        bundles = self.location_services.get_bundle_batch(points)
+        # One clock read stamps the percepts and the decisions of all locations
+        timestamp_ns = _clock_ns()
+        now = datetime.fromtimestamp(timestamp_ns / 1e9)
+        indices = []
+        percepts_list = []
+        for index, ((lat, lon), bundle) in enumerate(zip(points, bundles)):
+            percepts = self.perceive(lat, lon, bundle=bundle, now=now)
+            if not self.validate(percepts):
+                logger.error("Invalid percepts at (%s, %s), skipping location", lat, lon)
+                continue
+            indices.append(index)
+            percepts_list.append(percepts)
+
+        if not percepts_list:
+            return {}
+
+        # Decide
+        decisions = self.decide_batch_at_risk(PerceptBatch.from_percepts(percepts_list), timestamp_ns)
+
+        # Act on the locations at risk, keyed by input index
+        results = {}
+        for row, decision in decisions.items():
+            self.act(decision)
+            results[indices[row]] = decision
+        return results
+
+    def add_rule(
+        self,
+        name: str = None,
+        risk_level: Optional[str] = None,
+        requires_landuse: Optional[Iterable[str]] = None,
+    ):
         """Add custom rule to the agent"""
-        return self.rule_engine.add_rule(name)
-
-
-# Example usage
-if __name__ == "__main__":
-    # Initialize agent
-    agent = SimpleReflexAgent()
-
-    # Test locations
-    test_locations = [
-        (34.0522, -118.2437),  # Los Angeles
-        (37.7749, -122.4194),  # San Francisco
-        (45.5152, -122.6784),  # Portland
-    ]
-
-    for lat, lon in test_locations:
-        print(f"\n--- Testing location: ({lat}, {lon}) ---")
-        result = agent.run(lat, lon)
-        print(f"Risk Level: {result.risk_level}")
-        print(f"Confidence: {result.confidence:.2f}")
-        if result.alert_message:
-            print(f"Alert: {result.alert_message}")
-        print(
-            f"Triggered Rules: {', '.join(result.triggered_rules) if result.triggered_rules else 'None'}"
-        )
+        return self.rule_engine.add_rule(name, risk_level=risk_level, requires_landuse=requires_landuse)
@@ -0,0 +1,97 @@
+"""
+Asset Spatial Index
+
+This module answers nearest-asset queries (villages, roads, biodiversity
+hotspots) over a fixed set of asset locations. Assets are stored as unit
+vectors on the sphere so the straight-line nearest neighbour is also the
+great-circle nearest neighbour; queries use a SciPy KD-tree when it is
+installed and a chunked brute-force search otherwise.
+"""
+
+import csv
+from typing import Sequence
+
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    # SciPy is optional, fall back to a brute-force nearest neighbour search
+    cKDTree = None
+
+EARTH_RADIUS_KM = 6371.0
+
+# Distance matrix entries per chunk of the brute-force search
+_BRUTE_FORCE_CHUNK = 1 << 20
+
+
+def _unit_vectors(lats: Sequence[float], lons: Sequence[float]) -> np.ndarray:
+    """(N, 3) unit vectors of coordinates in degrees"""
+    lat = np.radians(np.asarray(lats, dtype=np.float64))
+    lon = np.radians(np.asarray(lons, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+
+class AssetIndex:
+    """Nearest neighbour index over asset locations"""
+
+    __slots__ = ("_points", "_tree")
+
+    def __init__(self, lats: Sequence[float], lons: Sequence[float]):
+        """
+        Build the index once for all queries
+
+        Args:
+            lats: Latitudes of the assets
+            lons: Longitudes of the assets
+        """
+        self._points = _unit_vectors(lats, lons)
+        self._tree = cKDTree(self._points) if cKDTree is not None and len(self._points) else None
+
+    @classmethod
+    def from_csv(cls, path: str) -> "AssetIndex":
+        """
+        Build the index from a CSV file with latitude and longitude columns
+
+        Args:
+            path: Path of the CSV file
+
+        Returns:
+            AssetIndex of the assets in the file
+        """
+        lats, lons = [], []
+        with open(path, newline="", encoding="utf-8") as file:
+            for row in csv.DictReader(file):
+                lats.append(float(row["latitude"]))
+                lons.append(float(row["longitude"]))
+        return cls(lats, lons)
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def nearest_km(self, lats: Sequence[float], lons: Sequence[float]) -> np.ndarray:
+        """
+        Great-circle distances to the nearest asset
+
+        Args:
+            lats: Latitude coordinates
+            lons: Longitude coordinates
+
+        Returns:
+            float64 array of the distances in km (inf without assets)
+        """
+        queries = _unit_vectors(lats, lons)
+        if not len(self._points):
+            return np.full(len(queries), np.inf)
+
+        if self._tree is not None:
+            chord, _ = self._tree.query(queries, k=1)
+        else:
+            # The nearest asset has the largest dot product with the query
+            chord = np.empty(len(queries))
+            step = max(1, _BRUTE_FORCE_CHUNK // len(self._points))
+            for start in range(0, len(queries), step):
+                cos_angle = (queries[start:start + step] @ self._points.T).max(axis=1)
+                chord[start:start + step] = np.sqrt(np.maximum(2.0 - 2.0 * cos_angle, 0.0))
+        return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.minimum(chord / 2.0, 1.0))
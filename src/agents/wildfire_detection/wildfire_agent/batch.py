@@ -0,0 +1,97 @@
+"""
+Batched Environmental Percepts
+
+This module provides a structure-of-arrays container for evaluating many
+percepts at once: one NumPy array per percept field instead of one
+EnvironmentalPercepts object per row.
+"""
+
+from dataclasses import dataclass, field
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+from .agent import EnvironmentalPercepts
+from .landuse import LANDUSE_CODES, UNKNOWN_LANDUSE
+
+# Numeric percept fields stored as one float64 array each
+NUMERIC_FIELDS = (
+    "thermal",
+    "humidity",
+    "wind_speed",
+    "vegetation_density",
+    "asset_proximity",
+    "latitude",
+    "longitude",
+)
+
+
+@dataclass(slots=True)
+class PerceptBatch:
+    """Environmental percepts of many locations stored column-wise"""
+
+    thermal: np.ndarray  # Temperature in Kelvin
+    humidity: np.ndarray  # Humidity percentage
+    wind_speed: np.ndarray  # Wind speed in km/h
+    landuse: np.ndarray  # Land use classification (object array of str)
+    vegetation_density: np.ndarray  # Vegetation density index (0-1)
+    asset_proximity: np.ndarray  # Distance to nearest asset in km
+    latitude: np.ndarray
+    longitude: np.ndarray
+    timestamp: Optional[np.ndarray] = None  # Percept times (object array of datetime)
+    landuse_code: np.ndarray = field(init=False)  # int8 codes from LANDUSE_CODES
+
+    def __post_init__(self):
+        self.landuse_code = np.fromiter(
+            (LANDUSE_CODES.get(landuse, UNKNOWN_LANDUSE) for landuse in self.landuse),
+            dtype=np.int8,
+            count=len(self.landuse),
+        )
+
+    @classmethod
+    def from_percepts(cls, percepts: Sequence[EnvironmentalPercepts]) -> "PerceptBatch":
+        """
+        Build a batch from individual percepts
+
+        Args:
+            percepts: Percepts of the locations, one per row
+
+        Returns:
+            PerceptBatch with the percepts in the same order
+        """
+        count = len(percepts)
+        columns = {
+            name: cls._column((getattr(p, name) for p in percepts), count)
+            for name in NUMERIC_FIELDS
+        }
+        landuse = np.empty(count, dtype=object)
+        landuse[:] = [p.landuse for p in percepts]
+        timestamp = np.empty(count, dtype=object)
+        timestamp[:] = [p.timestamp for p in percepts]
+        return cls(landuse=landuse, timestamp=timestamp, **columns)
+
+    @staticmethod
+    def _column(values: Iterable, count: int) -> np.ndarray:
+        """Fill a float64 column, missing values become NaN"""
+        return np.fromiter(
+            (np.nan if value is None else value for value in values),
+            dtype=np.float64,
+            count=count,
+        )
+
+    def __len__(self) -> int:
+        return len(self.thermal)
+
+    def row(self, index: int) -> EnvironmentalPercepts:
+        """Percepts of a single row (for rules without a batch form)"""
+        return EnvironmentalPercepts(
+            thermal=float(self.thermal[index]),
+            humidity=float(self.humidity[index]),
+            wind_speed=float(self.wind_speed[index]),
+            landuse=self.landuse[index],
+            vegetation_density=float(self.vegetation_density[index]),
+            asset_proximity=float(self.asset_proximity[index]),
+            timestamp=self.timestamp[index] if self.timestamp is not None else None,
+            latitude=float(self.latitude[index]),
+            longitude=float(self.longitude[index]),
+        )
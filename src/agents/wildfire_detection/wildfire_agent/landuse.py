@@ -0,0 +1,48 @@
+"""
+Land Use Classes
+
+Land use classifications accepted by the wildfire detection agent (including
+the ESA WorldCover classes of land cover rasters), as interned enum members
+and as integer codes for the compiled and vectorized rule paths.
+"""
+
+from enum import StrEnum
+from typing import Optional, Union
+
+
+class LandUse(StrEnum):
+    """Known land use classes (members compare equal to their string values)"""
+
+    URBAN = "urban"
+    FOREST = "forest"
+    GRASSLAND = "grassland"
+    RANGELAND = "rangeland"
+    CROPLAND = "cropland"
+    BARE = "bare"
+    SNOW = "snow"
+    WATER = "water"
+    WETLAND = "wetland"
+    MOSS = "moss"
+
+
+# Integer codes of the known land use classes (-1 for any other class)
+LANDUSE_CODES = {landuse: code for code, landuse in enumerate(LandUse)}
+UNKNOWN_LANDUSE = -1
+
+FOREST = LANDUSE_CODES[LandUse.FOREST]
+GRASSLAND = LANDUSE_CODES[LandUse.GRASSLAND]
+
+_LANDUSE_BY_VALUE = {landuse.value: landuse for landuse in LandUse}
+
+
+def as_landuse(value: Optional[str]) -> Union[LandUse, str, None]:
+    """
+    Intern a land use classification
+
+    Args:
+        value: Land use classification
+
+    Returns:
+        The LandUse member for known classes, otherwise the value unchanged
+    """
+    return _LANDUSE_BY_VALUE.get(value, value)
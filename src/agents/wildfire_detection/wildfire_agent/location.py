@@ -1,24 +1,236 @@
-from datetime import datetime, timedelta, UTC
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, UTC
+import functools
 import logging
 import os
-from typing import Dict, Optional
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .assets import AssetIndex
+from .landuse import LandUse
+from .raster import RasterGrid
 
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, os.getenv("LOG_LEVEL", "INFO")),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
 logger = logging.getLogger(__name__)
 
+# Land use of the ESA WorldCover classes, indexed by the raster's uint8 class code
+_LANDCOVER_CLASSES = np.full(256, None, dtype=object)
+_LANDCOVER_CLASSES[10] = LandUse.FOREST  # Tree cover
+_LANDCOVER_CLASSES[20] = LandUse.RANGELAND  # Shrubland
+_LANDCOVER_CLASSES[30] = LandUse.GRASSLAND  # Grassland
+_LANDCOVER_CLASSES[40] = LandUse.CROPLAND
+_LANDCOVER_CLASSES[50] = LandUse.URBAN  # Built-up
+_LANDCOVER_CLASSES[60] = LandUse.BARE  # Bare / sparse vegetation
+_LANDCOVER_CLASSES[70] = LandUse.SNOW  # Snow and ice
+_LANDCOVER_CLASSES[80] = LandUse.WATER  # Permanent water bodies
+_LANDCOVER_CLASSES[90] = LandUse.WETLAND  # Herbaceous wetland
+_LANDCOVER_CLASSES[95] = LandUse.FOREST  # Mangroves
+_LANDCOVER_CLASSES[100] = LandUse.MOSS  # Moss and lichen
+
+
+def _geohash_cell(lat: float, lon: float, precision: int) -> int:
+    """
+    Integer id of the geohash cell containing a location
+
+    Args:
+        lat: Latitude coordinate
+        lon: Longitude coordinate
+        precision: Geohash length in characters (6 is about 1.2 x 0.6 km)
+
+    Returns:
+        Cell id packing the longitude and latitude bits of the geohash
+    """
+    bits = 5 * precision
+    lon_bits = (bits + 1) // 2  # geohash starts with a longitude bit
+    lat_bits = bits // 2
+    lat_index = int((lat + 90.0) / 180.0 * (1 << lat_bits))
+    lon_index = int((lon + 180.0) / 360.0 * (1 << lon_bits))
+    return (lon_index << lat_bits) | lat_index
+
+
+def _cached_by_cell(method: Callable) -> Callable:
+    """Memoize a LocationServices lookup per geohash cell (and remaining arguments)"""
+
+    @functools.wraps(method)
+    def wrapper(self, lat: float, lon: float, *args, **kwargs):
+        if self.cache_size <= 0 or not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            return method(self, lat, lon, *args, **kwargs)
+
+        key = (method.__name__, _geohash_cell(lat, lon, self.cache_precision), args, tuple(sorted(kwargs.items())))
+        ttl = self.cache_ttl.get(method.__name__)
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None and (ttl is None or time.monotonic() - entry[0] < ttl):
+                self._cache.move_to_end(key)
+                return entry[1]
+
+        value = method(self, lat, lon, *args, **kwargs)
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic(), value)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return value
+
+    return wrapper
+
+
+def _acquisition(hours_ago: float) -> Dict[str, Any]:
+    """Acquisition time of a detection as ISO string and as seconds since the epoch"""
+    epoch = time.time() - hours_ago * 3600.0
+    return {"acquisition": datetime.fromtimestamp(epoch, UTC).isoformat(), "acquisition_epoch": epoch}
+
+
+# Bundle fields and the getters fetching them
+_BUNDLE_GETTERS = (
+    ("thermal", "get_thermal_data"),
+    ("thermal_nearby", "get_thermal_activity_nearby"),
+    ("land_cover", "get_land_cover"),
+    ("weather", "get_weather_data"),
+    ("vegetation_density", "get_vegetation_density"),
+    ("asset_proximity", "get_asset_proximity"),
+)
+
 
 class LocationServices:
     """Wrapper class for location-based environmental data services"""
 
-    def __init__(self, rapidapi_key: Optional[str] = None):
+    def __init__(
+        self,
+        rapidapi_key: Optional[str] = None,
+        landcover_path: Optional[str] = None,
+        ndvi_path: Optional[str] = None,
+        assets_path: Optional[str] = None,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+    ):
         self.rapidapi_key = rapidapi_key or os.getenv("RAPIDAPI_KEY")
         if not self.rapidapi_key:
             logger.warning("No RapidAPI key provided. Using mock data.")
 
+        # Rasters loaded once and answered by array indexing, locations they
+        # do not cover fall back to the per-location lookups
+        self.landcover_path = landcover_path or os.getenv("LANDCOVER_RASTER")
+        self.ndvi_path = ndvi_path or os.getenv("NDVI_RASTER")
+        self.landcover: Optional[RasterGrid] = None
+        self.ndvi: Optional[RasterGrid] = None
+        self.preload(bbox)
+
+        # Spatial index over the asset locations, built once for all proximity queries
+        assets_path = assets_path or os.getenv("ASSETS_FILE")
+        self.assets: Optional[AssetIndex] = AssetIndex.from_csv(assets_path) if assets_path else None
+
+        # Lookups memoized per geohash cell, so nearby locations share one fetch
+        self.cache_size = int(os.getenv("LOCATION_CACHE_SIZE", "4096"))
+        self.cache_precision = int(os.getenv("LOCATION_CACHE_PRECISION", "6"))
+        self._cache: "OrderedDict[tuple, tuple[float, Any]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Maximum age in seconds of memoized lookups that go stale, by method name
+        self.cache_ttl: Dict[str, float] = {
+            "get_thermal_activity_nearby": float(os.getenv("LOCATION_THERMAL_TTL", "3600")),
+        }
+
+        # Concurrent lookups of get_bundle_batch, and of the fields of a bundle
+        # from the provider (shared pool, created on first use)
+        self.max_workers = int(os.getenv("LOCATION_MAX_WORKERS", "8"))
+        self._field_executor: Optional[ThreadPoolExecutor] = None
+        self._field_executor_lock = threading.Lock()
+
+    def preload(self, bbox: Optional[Tuple[float, float, float, float]] = None) -> None:
+        """
+        Load the configured rasters into memory before the first lookup
+
+        Args:
+            bbox: (min_lon, min_lat, max_lon, max_lat) of the monitored area to
+                keep only the raster pixels covering it, the whole rasters by default
+        """
+        if self.landcover_path:
+            self.landcover = RasterGrid.from_file(self.landcover_path, bbox=bbox)
+        if self.ndvi_path:
+            self.ndvi = RasterGrid.from_file(self.ndvi_path, "float32", bbox=bbox)
+
+    def clear_cache(self) -> None:
+        """Drop all memoized lookups"""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def invalidate_older_than(self, seconds: float) -> int:
+        """
+        Drop memoized lookups fetched more than the given number of seconds ago
+
+        Args:
+            seconds: Maximum age of the lookups to keep
+
+        Returns:
+            Number of dropped lookups
+        """
+        cutoff = time.monotonic() - seconds
+        with self._cache_lock:
+            stale = [key for key, (fetched, _) in self._cache.items() if fetched <= cutoff]
+            for key in stale:
+                del self._cache[key]
+        return len(stale)
+
+    def get_bundle(self, lat: float, lon: float) -> Dict[str, Any]:
+        """
+        Fetch all environmental data of a location at once
+
+        The data comes from the single-field getters. Provider lookups are
+        fetched concurrently so their latencies overlap; the mock data is
+        computed locally and fetched in turn. A provider with a combined
+        endpoint answers this with one request instead of six.
+
+        Args:
+            lat: Latitude coordinate
+            lon: Longitude coordinate
+
+        Returns:
+            Dictionary containing thermal, thermal_nearby, land_cover, weather,
+            vegetation_density and asset_proximity
+        """
+        if self.rapidapi_key and self.max_workers > 1:
+            executor = self._get_field_executor()
+            futures = {
+                field: executor.submit(getattr(self, getter), lat, lon) for field, getter in _BUNDLE_GETTERS
+            }
+            return {field: future.result() for field, future in futures.items()}
+
+        return {
+            "thermal": self.get_thermal_data(lat, lon),
+            "thermal_nearby": self.get_thermal_activity_nearby(lat, lon),
+            "land_cover": self.get_land_cover(lat, lon),
+            "weather": self.get_weather_data(lat, lon),
+            "vegetation_density": self.get_vegetation_density(lat, lon),
+            "asset_proximity": self.get_asset_proximity(lat, lon),
+        }
+
+    def _get_field_executor(self) -> ThreadPoolExecutor:
+        """Thread pool fetching the fields of bundles, shared by all bundles"""
+        with self._field_executor_lock:
+            if self._field_executor is None:
+                self._field_executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="location-fields"
+                )
+            return self._field_executor
+
+    def get_bundle_batch(self, points: Sequence[Tuple[float, float]]) -> List[Dict[str, Any]]:
+        """
+        Fetch all environmental data of many locations, up to max_workers concurrently
+
+        Args:
+            points: (lat, lon) coordinates
+
+        Returns:
+            Bundles (see get_bundle) in the order of the points
+        """
+        if len(points) <= 1 or self.max_workers <= 1:
+            return [self.get_bundle(lat, lon) for lat, lon in points]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(points))) as executor:
+            return list(executor.map(lambda point: self.get_bundle(*point), points))
+
+    @_cached_by_cell
     def get_thermal_data(self, lat: float, lon: float) -> float:
         """Fetch thermal intensity data from MODIS"""
         # Mock implementation - replace with actual RapidAPI call
@@ -34,20 +246,56 @@ class LocationServices:
         # For now, return mock data
         return 310.0
 
-    def get_land_cover(self, lat: float, lon: float) -> str:
+    def get_land_cover(self, lat: float, lon: float) -> LandUse:
         """Fetch land cover classification"""
+        if self.landcover is not None:
+            landuse = self._landcover_class(self.landcover.value(lat, lon))
+            if landuse is not None:
+                return landuse
+        return self._fetch_land_cover(lat, lon)
+
+    def get_land_cover_batch(self, lats: Sequence[float], lons: Sequence[float]) -> np.ndarray:
+        """
+        Fetch land cover classifications of many locations
+
+        Args:
+            lats: Latitude coordinates
+            lons: Longitude coordinates
+
+        Returns:
+            Object array of the land cover classifications
+        """
+        if self.landcover is None:
+            return self._per_location(self.get_land_cover, lats, lons, dtype=object)
+
+        codes, covered = self.landcover.sample(lats, lons)
+        landuse = _LANDCOVER_CLASSES[codes]
+        covered &= landuse != None  # noqa: E711 (elementwise comparison)
+        for i in np.flatnonzero(~covered):
+            landuse[i] = self._fetch_land_cover(lats[i], lons[i])
+        return landuse
+
+    @staticmethod
+    def _landcover_class(code) -> Optional[LandUse]:
+        """Land use of a raster class code, None for nodata or unknown codes"""
+        return None if code is None else _LANDCOVER_CLASSES[code]
+
+    @_cached_by_cell
+    def _fetch_land_cover(self, lat: float, lon: float) -> LandUse:
+        """Fetch land cover classification from the provider"""
         # Mock implementation - replace with actual API call
         if not self.rapidapi_key:
             # Simple mock based on coordinates
             if abs(lat - 34.0522) < 0.5 and abs(lon + 118.2437) < 0.5:
-                return "urban"
+                return LandUse.URBAN
             elif 30 < lat < 50 and -125 < lon < -70:  # North America forests
-                return "forest"
-            return "grassland"
+                return LandUse.FOREST
+            return LandUse.GRASSLAND
 
         # TODO: Implement actual land cover API call
-        return "forest"
+        return LandUse.FOREST
 
+    @_cached_by_cell
     def get_weather_data(self, lat: float, lon: float) -> Dict[str, float]:
         """Fetch weather data (humidity, wind speed)"""
         # Mock implementation - replace with actual weather API
@@ -59,13 +307,50 @@ class LocationServices:
 
     def get_vegetation_density(self, lat: float, lon: float) -> float:
         """Fetch vegetation density index"""
+        if self.ndvi is not None:
+            ndvi = self.ndvi.value(lat, lon)
+            if ndvi is not None:
+                return min(max(float(ndvi), 0.0), 1.0)
+        return self._fetch_vegetation_density(lat, lon)
+
+    def get_vegetation_density_batch(self, lats: Sequence[float], lons: Sequence[float]) -> np.ndarray:
+        """
+        Fetch vegetation density indices of many locations
+
+        Args:
+            lats: Latitude coordinates
+            lons: Longitude coordinates
+
+        Returns:
+            float64 array of the vegetation density indices (0-1)
+        """
+        if self.ndvi is None:
+            return self._per_location(self.get_vegetation_density, lats, lons, dtype=np.float64)
+
+        ndvi, covered = self.ndvi.sample(lats, lons)
+        density = np.clip(ndvi, 0.0, 1.0).astype(np.float64)
+        for i in np.flatnonzero(~covered):
+            density[i] = self._fetch_vegetation_density(lats[i], lons[i])
+        return density
+
+    @staticmethod
+    def _per_location(getter: Callable, lats: Sequence[float], lons: Sequence[float], dtype) -> np.ndarray:
+        """Fill an array by calling a single-location getter per location"""
+        values = np.empty(len(lats), dtype=dtype)
+        for i, (lat, lon) in enumerate(zip(lats, lons)):
+            values[i] = getter(lat, lon)
+        return values
+
+    @_cached_by_cell
+    def _fetch_vegetation_density(self, lat: float, lon: float) -> float:
+        """Fetch vegetation density index from the provider"""
         # Mock implementation
         if not self.rapidapi_key:
             # Higher vegetation in forested areas
             land_cover = self.get_land_cover(lat, lon)
-            if land_cover == "forest":
+            if land_cover == LandUse.FOREST:
                 return 0.8
-            elif land_cover == "grassland":
+            elif land_cover == LandUse.GRASSLAND:
                 return 0.4
             return 0.1  # Urban areas
 
@@ -73,18 +358,41 @@ class LocationServices:
 
     def get_asset_proximity(self, lat: float, lon: float) -> float:
         """Calculate distance to nearest assets (villages, roads, etc.)"""
+        if self.assets is not None:
+            return float(self.assets.nearest_km((lat,), (lon,))[0])
+        return self._fetch_asset_proximity(lat, lon)
+
+    def get_asset_proximity_batch(self, lats: Sequence[float], lons: Sequence[float]) -> np.ndarray:
+        """
+        Calculate distances to the nearest assets of many locations
+
+        Args:
+            lats: Latitude coordinates
+            lons: Longitude coordinates
+
+        Returns:
+            float64 array of the distances in km
+        """
+        if self.assets is not None:
+            return self.assets.nearest_km(lats, lons)
+        return self._per_location(self.get_asset_proximity, lats, lons, dtype=np.float64)
+
+    @_cached_by_cell
+    def _fetch_asset_proximity(self, lat: float, lon: float) -> float:
+        """Fetch distance to nearest assets from the provider"""
         # Mock implementation - in real scenario, query spatial database
         if not self.rapidapi_key:
             # Assume urban areas have closer assets
             land_cover = self.get_land_cover(lat, lon)
-            if land_cover == "urban":
+            if land_cover == LandUse.URBAN:
                 return 2.5  # km
-            elif land_cover == "grassland":
+            elif land_cover == LandUse.GRASSLAND:
                 return 8.0  # km
             return 15.0  # Remote forest areas
 
         return 10.0
 
+    @_cached_by_cell
     def get_thermal_activity_nearby(self, lat: float, lon: float, distance: int = 5000) -> Dict[str, float]:
         """
         Detect thermal activities (hotspots, fires) within specified distance
@@ -100,6 +408,7 @@ class LocationServices:
             - confidence: Float between 0-1 indicating detection confidence
             - distance: Distance to nearest thermal activity in meters
             - acquisition: Date and time when the thermal activity was first detected
+            - acquisition_epoch: The same time in seconds since the epoch
         """
         # Mock implementation - replace with actual thermal anomaly detection API
         if not self.rapidapi_key:
@@ -121,7 +430,7 @@ class LocationServices:
                 base_confidence += 0.2
                 hours_detected += 1.0
                 
-            if land_cover == "forest" and thermal_temp > 310:
+            if land_cover == LandUse.FOREST and thermal_temp > 310:
                 base_confidence += 0.4
                 hours_detected += 3.0
                 
@@ -141,7 +450,7 @@ class LocationServices:
                 "longitude": thermal_lon,
                 "confidence": min(base_confidence, 1.0),
                 "distance": distance,
-                "acquisition": (datetime.now(UTC) - timedelta(hours=hours_detected)).isoformat()
+                **_acquisition(hours_detected),
             }
 
         # TODO: Implement actual thermal activity detection API call
@@ -152,5 +461,5 @@ class LocationServices:
             "longitude": thermal_lon,
             "confidence": 0.5,
             "distance": distance,
-            "acquisition": (datetime.now(UTC) - timedelta(hours=hours_detected)).isoformat()
+            **_acquisition(hours_detected),
         }
\ No newline at end of file
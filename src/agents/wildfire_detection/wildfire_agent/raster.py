@@ -0,0 +1,116 @@
+"""
+In-Memory Raster Grids
+
+This module keeps a raster band (land cover classes, NDVI) in a NumPy array so
+location lookups are array indexing instead of a request per pixel. Rasters
+are read with rasterio when it is installed.
+"""
+
+from dataclasses import dataclass
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+try:
+    import rasterio
+    from rasterio.windows import from_bounds
+except ImportError:
+    # rasterio is optional, only needed to load raster files
+    rasterio = None
+
+
+@dataclass(slots=True)
+class RasterGrid:
+    """A single raster band in geographic coordinates (EPSG:4326)"""
+
+    values: np.ndarray  # Band values indexed by [row, col]
+    transform: Tuple[float, float, float, float, float, float]  # Affine (a, b, c, d, e, f)
+    nodata: object = None  # Value of pixels without data
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str,
+        dtype: str = "uint8",
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+    ) -> "RasterGrid":
+        """
+        Read the first band of a raster file into memory
+
+        Args:
+            path: Path of a raster in EPSG:4326
+            dtype: NumPy data type of the loaded band
+            bbox: (min_lon, min_lat, max_lon, max_lat) to read only the
+                pixels covering an area instead of the whole raster
+
+        Returns:
+            RasterGrid holding the band
+        """
+        if rasterio is None:
+            raise ImportError("rasterio is required to load raster files")
+
+        with rasterio.open(path) as dataset:
+            if dataset.crs is not None and dataset.crs.to_epsg() != 4326:
+                raise ValueError(f"Raster {path} must be in EPSG:4326, found {dataset.crs}")
+            if bbox is None:
+                values = dataset.read(1, out_dtype=dtype)
+                return cls(values, tuple(dataset.transform)[:6], dataset.nodata)
+
+            window = from_bounds(*bbox, transform=dataset.transform)
+            window = window.round_offsets("floor").round_lengths("ceil")
+            values = dataset.read(1, window=window, out_dtype=dtype, boundless=True, fill_value=dataset.nodata or 0)
+            return cls(values, tuple(dataset.window_transform(window))[:6], dataset.nodata)
+
+    def _pixel(self, lat, lon):
+        """Fractional (row, col) of coordinates, scalars or arrays"""
+        a, b, c, d, e, f = self.transform
+        det = a * e - b * d
+        x = lon - c
+        y = lat - f
+        col = (e * x - b * y) / det
+        row = (a * y - d * x) / det
+        return row, col
+
+    def value(self, lat: float, lon: float):
+        """
+        Band value at a location
+
+        Args:
+            lat: Latitude coordinate
+            lon: Longitude coordinate
+
+        Returns:
+            Pixel value, or None outside the raster or on nodata pixels
+        """
+        row, col = self._pixel(lat, lon)
+        if not (0 <= row < self.values.shape[0] and 0 <= col < self.values.shape[1]):
+            return None
+        value = self.values[math.floor(row), math.floor(col)]
+        if value == self.nodata or value != value:  # value != value for NaN
+            return None
+        return value
+
+    def sample(self, lats: np.ndarray, lons: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Band values at many locations with one fancy-indexing call
+
+        Args:
+            lats: Latitude coordinates
+            lons: Longitude coordinates
+
+        Returns:
+            Tuple of the pixel values and a mask of the locations covered by
+            the raster with data (values outside the mask are undefined)
+        """
+        row, col = self._pixel(np.asarray(lats, dtype=np.float64), np.asarray(lons, dtype=np.float64))
+        height, width = self.values.shape
+        covered = (row >= 0) & (row < height) & (col >= 0) & (col < width)
+        rows = np.where(covered, row, 0).astype(np.intp)
+        cols = np.where(covered, col, 0).astype(np.intp)
+        values = self.values[rows, cols]
+        if self.nodata is not None:
+            covered &= values != self.nodata
+        if values.dtype.kind == "f":
+            covered &= ~np.isnan(values)
+        return values, covered
@@ -4,10 +4,14 @@ Unit tests for the Simple Reflex Agent for Wildfire Detection
 
 import unittest
 from datetime import datetime
+from functools import lru_cache
+import logging
 import os
 import sys
 from unittest.mock import patch, MagicMock
 
+import numpy as np
+
 # Add the wildfire_agent directory to the path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 print(sys.path)
@@ -18,7 +22,24 @@ from wildfire_agent import (
     WildfireDecision,
     LocationServices,
     RuleEngine,
+    PerceptBatch,
+    LandUse,
+    RasterGrid,
+    AssetIndex,
 )
+from wildfire_agent._rules_numba import default_rules_mask, eval_default_rules, eval_default_rules_batch
+
+# Keep the per-decision INFO records of the agent out of the test output
+logging.getLogger("wildfire_agent").setLevel(logging.WARNING)
+
+# Single timestamp shared by all percept fixtures
+_NOW = datetime.now()
+
+
+@lru_cache(maxsize=None)
+def shared_agent():
+    """Agent with the default rules shared by tests that do not modify it"""
+    return SimpleReflexAgent()
 
 
 class TestEnvironmentalPercepts(unittest.TestCase):
@@ -33,7 +54,7 @@ class TestEnvironmentalPercepts(unittest.TestCase):
             landuse="forest",
             vegetation_density=0.8,
             asset_proximity=5.0,
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             latitude=34.0522,
             longitude=-118.2437,
         )
@@ -42,6 +63,36 @@ class TestEnvironmentalPercepts(unittest.TestCase):
         self.assertEqual(percepts.humidity, 45.0)
         self.assertEqual(percepts.landuse, "forest")
         self.assertEqual(percepts.vegetation_density, 0.8)
+        self.assertFalse(hasattr(percepts, "__dict__"))
+
+    def test_landuse_interned(self):
+        """Test known land use strings are interned as LandUse members"""
+        percepts = EnvironmentalPercepts(
+            thermal=320.5,
+            humidity=45.0,
+            wind_speed=12.0,
+            landuse="forest",
+            vegetation_density=0.8,
+            asset_proximity=5.0,
+            timestamp=_NOW,
+            latitude=34.0522,
+            longitude=-118.2437,
+        )
+        self.assertIs(percepts.landuse, LandUse.FOREST)
+        self.assertEqual(percepts.landuse, "forest")
+
+        other = EnvironmentalPercepts(
+            thermal=320.5,
+            humidity=45.0,
+            wind_speed=12.0,
+            landuse="built area",
+            vegetation_density=0.8,
+            asset_proximity=5.0,
+            timestamp=_NOW,
+            latitude=34.0522,
+            longitude=-118.2437,
+        )
+        self.assertEqual(other.landuse, "built area")
 
 
 class TestLocationServices(unittest.TestCase):
@@ -81,6 +132,87 @@ class TestLocationServices(unittest.TestCase):
         self.assertIn(remote_land_cover, ["forest", "grassland"])
 
 
+    def test_bundle_batch(self):
+        """Test batched bundles match single-location bundles in input order"""
+        services = LocationServices()
+        points = [(34.0522, -118.2437), (45.0, -110.0), (10.0, 20.0)]
+
+        bundles = services.get_bundle_batch(points)
+
+        self.assertEqual(len(bundles), len(points))
+        for (lat, lon), bundle in zip(points, bundles):
+            expected = services.get_bundle(lat, lon)
+            self.assertEqual(bundle["land_cover"], expected["land_cover"])
+            self.assertEqual(bundle["thermal"], expected["thermal"])
+            self.assertEqual(bundle["weather"], expected["weather"])
+
+    def test_bundle_provider_fields_fetched_concurrently(self):
+        """Test provider bundles fetch every field through the shared field pool"""
+        services = LocationServices(rapidapi_key="test_key")
+        nearby = {"latitude": None, "longitude": None, "confidence": 0.0, "distance": 5000, "acquisition": None}
+
+        with patch.object(services, "get_thermal_activity_nearby", return_value=nearby):
+            bundle = services.get_bundle(45.0, -110.0)
+
+        self.assertIs(bundle["thermal_nearby"], nearby)
+        self.assertEqual(bundle["thermal"], services.get_thermal_data(45.0, -110.0))
+        self.assertEqual(bundle["land_cover"], services.get_land_cover(45.0, -110.0))
+        self.assertEqual(bundle["weather"], services.get_weather_data(45.0, -110.0))
+        self.assertIsNotNone(services._field_executor)
+
+    def test_lookup_cache(self):
+        """Test lookups are memoized per geohash cell and can be invalidated"""
+        services = LocationServices()
+
+        weather = services.get_weather_data(45.0, -110.0)
+        # About 10 m away, same 6 character geohash cell
+        self.assertIs(services.get_weather_data(45.0001, -110.0001), weather)
+        self.assertIsNot(services.get_weather_data(46.0, -110.0), weather)
+
+        self.assertEqual(services.invalidate_older_than(3600), 0)
+        self.assertEqual(services.invalidate_older_than(0), 2)
+        self.assertIsNot(services.get_weather_data(45.0, -110.0), weather)
+
+        # Thermal activity is refetched once older than its time to live
+        nearby = services.get_thermal_activity_nearby(45.0, -110.0)
+        self.assertIs(services.get_thermal_activity_nearby(45.0, -110.0), nearby)
+        services.cache_ttl["get_thermal_activity_nearby"] = 0
+        self.assertIsNot(services.get_thermal_activity_nearby(45.0, -110.0), nearby)
+
+    def test_landcover_raster(self):
+        """Test land cover and vegetation lookups index preloaded rasters"""
+        services = LocationServices()
+        # 2 x 2 pixels of 1 degree covering lat 44..46, lon -111..-109
+        transform = (1.0, 0.0, -111.0, 0.0, -1.0, 46.0)
+        services.landcover = RasterGrid(np.array([[10, 50], [30, 0]], dtype=np.uint8), transform, nodata=0)
+        services.ndvi = RasterGrid(np.array([[0.9, -0.2], [0.5, np.nan]], dtype=np.float32), transform)
+
+        self.assertEqual(services.get_land_cover(45.5, -110.5), LandUse.FOREST)
+        self.assertEqual(services.get_land_cover(45.5, -109.5), LandUse.URBAN)
+        self.assertAlmostEqual(services.get_vegetation_density(45.5, -110.5), 0.9, places=5)
+        self.assertEqual(services.get_vegetation_density(45.5, -109.5), 0.0)
+
+        # Nodata pixels and locations off the raster fall back to the mock lookups
+        lats = np.array([45.5, 44.5, 44.5, 10.0])
+        lons = np.array([-110.5, -110.5, -109.5, 20.0])
+        landuse = services.get_land_cover_batch(lats, lons)
+        self.assertEqual(list(landuse), [LandUse.FOREST, LandUse.GRASSLAND, LandUse.FOREST, LandUse.GRASSLAND])
+        density = services.get_vegetation_density_batch(lats, lons)
+        np.testing.assert_allclose(density, [0.9, 0.5, 0.8, 0.4], rtol=1e-6)
+
+    def test_asset_index(self):
+        """Test asset proximity queries the nearest indexed asset"""
+        services = LocationServices()
+        services.assets = AssetIndex([45.0, 34.0522], [-110.0, -118.2437])
+
+        # One degree of latitude is about 111.2 km
+        self.assertAlmostEqual(services.get_asset_proximity(46.0, -110.0), 111.19, places=1)
+        self.assertAlmostEqual(services.get_asset_proximity(34.0522, -118.2437), 0.0, places=3)
+
+        distances = services.get_asset_proximity_batch([46.0, 34.0522], [-110.0, -118.2437])
+        np.testing.assert_allclose(distances, [111.19, 0.0], atol=0.01)
+
+
 class TestRuleEngine(unittest.TestCase):
     """Test the RuleEngine class"""
 
@@ -102,6 +234,7 @@ class TestRuleEngine(unittest.TestCase):
 
         self.assertEqual(len(engine.rules), 1)
         self.assertIn("test_rule", engine.rule_names.values())
+        self.assertEqual(engine.rules[0], ("test_rule", test_rule))
 
     def test_rule_evaluation(self):
         """Test rule evaluation"""
@@ -121,7 +254,7 @@ class TestRuleEngine(unittest.TestCase):
             landuse="forest",
             vegetation_density=0.5,
             asset_proximity=10.0,
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             latitude=40.0,
             longitude=-120.0,
         )
@@ -139,7 +272,7 @@ class TestRuleEngine(unittest.TestCase):
             landuse="urban",
             vegetation_density=0.2,
             asset_proximity=2.0,
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             latitude=40.0,
             longitude=-120.0,
         )
@@ -149,6 +282,134 @@ class TestRuleEngine(unittest.TestCase):
         self.assertIsNone(decision.alert_message)
 
 
+    def test_decision_cache(self):
+        """Test repeated percepts are served from the cache while the kernel decides every rule"""
+        engine = SimpleReflexAgent().rule_engine
+
+        percepts = EnvironmentalPercepts(
+            thermal=340.0,
+            humidity=15.0,
+            wind_speed=10.0,
+            landuse="forest",
+            vegetation_density=0.5,
+            asset_proximity=10.0,
+            timestamp=_NOW,
+            latitude=40.0,
+            longitude=-120.0,
+        )
+
+        first = engine.evaluate(percepts)
+        second = engine.evaluate(percepts)
+        self.assertEqual(engine.cache_info().hits, 1)
+        self.assertEqual(first.triggered_rules, second.triggered_rules)
+        self.assertIsNot(first.triggered_rules, second.triggered_rules)
+
+        # A rule outside the kernel invalidates cached decisions and is called on every evaluation
+        calls = []
+
+        @engine.add_rule("always")
+        def always_rule(percepts):
+            calls.append(percepts)
+            return "MEDIUM test alert"
+
+        self.assertEqual(engine.cache_info().currsize, 0)
+        self.assertIn("always", engine.evaluate(percepts).triggered_rules)
+        self.assertIn("always", engine.evaluate(percepts).triggered_rules)
+        self.assertEqual(len(calls), 2)
+        self.assertTrue(all(call is percepts for call in calls))
+        self.assertEqual(engine.cache_info().currsize, 0)
+
+    def test_declared_risk_level(self):
+        """Test a declared risk level is used instead of parsing the alert"""
+        engine = RuleEngine()
+
+        @engine.add_rule("forest_rule", risk_level="CRITICAL")
+        def forest_rule(percepts):
+            return "Forest fire alert" if percepts.thermal > 330 else None
+
+        percepts = EnvironmentalPercepts(
+            thermal=340.0,
+            humidity=30.0,
+            wind_speed=10.0,
+            landuse="forest",
+            vegetation_density=0.5,
+            asset_proximity=10.0,
+            timestamp=_NOW,
+            latitude=40.0,
+            longitude=-120.0,
+        )
+
+        self.assertEqual(engine.evaluate(percepts).risk_level, "CRITICAL")
+
+    def test_required_landuse(self):
+        """Test rules are only called for the land uses they require"""
+        engine = RuleEngine()
+        calls = []
+
+        @engine.add_rule("forest_rule", risk_level="CRITICAL", requires_landuse=("forest",))
+        def forest_rule(percepts):
+            calls.append(percepts.landuse)
+            return "Forest fire alert" if percepts.thermal > 330 else None
+
+        forest, urban = (
+            EnvironmentalPercepts(
+                thermal=340.0,
+                humidity=30.0,
+                wind_speed=10.0,
+                landuse=landuse,
+                vegetation_density=0.5,
+                asset_proximity=10.0,
+                timestamp=_NOW,
+                latitude=40.0,
+                longitude=-120.0,
+            )
+            for landuse in ("forest", "urban")
+        )
+
+        self.assertEqual(engine._evaluate(forest).risk_level, "CRITICAL")
+        self.assertEqual(engine._evaluate(urban).risk_level, "LOW")
+        self.assertEqual(calls, [LandUse.FOREST])
+
+        calls.clear()
+        risk, _, triggered = engine.evaluate_batch(PerceptBatch.from_percepts([urban, forest]))
+        self.assertEqual(calls, [LandUse.FOREST])
+        self.assertEqual(triggered[:, 0].tolist(), [False, True])
+
+    def test_compiled_rules_follow_add_rule(self):
+        """Test the compiled rule entries are rebuilt after adding a rule"""
+        engine = RuleEngine()
+
+        @engine.add_rule("forest_rule", alert="🔥 CRITICAL forest alert", requires_landuse=("forest",))
+        def forest_rule(percepts):
+            return "🔥 CRITICAL forest alert" if percepts.thermal > 330 else None
+
+        self.assertEqual(
+            engine.compile(),
+            (("forest_rule", forest_rule, None, "🔥 CRITICAL forest alert", 3, frozenset({LandUse.FOREST})),),
+        )
+
+        percepts = EnvironmentalPercepts(
+            thermal=340.0,
+            humidity=30.0,
+            wind_speed=10.0,
+            landuse="urban",
+            vegetation_density=0.5,
+            asset_proximity=10.0,
+            timestamp=_NOW,
+            latitude=40.0,
+            longitude=-120.0,
+        )
+        self.assertEqual(engine.evaluate(percepts).risk_level, "LOW")
+
+        @engine.add_rule("urban_rule", risk_level="CRITICAL")
+        def urban_rule(percepts):
+            return "Urban fire alert" if percepts.landuse == "urban" else None
+
+        decision = engine.evaluate(percepts)
+        self.assertEqual(decision.triggered_rules, ["urban_rule"])
+        self.assertEqual(decision.risk_level, "CRITICAL")
+
+
 class TestSimpleReflexAgent(unittest.TestCase):
     """Test the SimpleReflexAgent class"""
 
@@ -161,7 +422,7 @@ class TestSimpleReflexAgent(unittest.TestCase):
 
     def test_agent_perceive(self):
         """Test agent perception"""
-        agent = SimpleReflexAgent()
+        agent = shared_agent()
         percepts = agent.perceive(34.0522, -118.2437)
 
         self.assertIsInstance(percepts, EnvironmentalPercepts)
@@ -178,7 +439,7 @@ class TestSimpleReflexAgent(unittest.TestCase):
 
     def test_agent_decide(self):
         """Test agent decision making"""
-        agent = SimpleReflexAgent()
+        agent = shared_agent()
 
         # Create test percepts
         percepts = EnvironmentalPercepts(
@@ -188,7 +449,7 @@ class TestSimpleReflexAgent(unittest.TestCase):
             landuse="forest",
             vegetation_density=0.9,  # Dense vegetation
             asset_proximity=3.0,  # Close to assets
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             latitude=34.0522,
             longitude=-118.2437,
         )
@@ -200,9 +461,34 @@ class TestSimpleReflexAgent(unittest.TestCase):
         self.assertLessEqual(decision.confidence, 1)
         self.assertIsInstance(decision.triggered_rules, list)
 
+    def test_landuse_assigned_as_str(self):
+        """Test rules match a land use assigned as a plain str after construction"""
+        agent = shared_agent()
+        percepts = EnvironmentalPercepts(
+            thermal=335.0,
+            humidity=15.0,
+            wind_speed=5.0,
+            landuse="urban",
+            vegetation_density=0.3,
+            asset_proximity=3.0,
+            timestamp=_NOW,
+            latitude=34.0522,
+            longitude=-118.2437,
+        )
+        self.assertNotIn("high_temperature_forest", agent.decide(percepts).triggered_rules)
+
+        percepts.landuse = "forest"
+        self.assertIsNot(percepts.landuse, LandUse.FOREST)
+        rules = dict(agent.rule_engine.rules)
+        self.assertIsNotNone(rules["high_temperature_forest"](percepts))
+        self.assertIsNotNone(rules["asset_proximity"](percepts))
+        decision = agent.decide(percepts)
+        self.assertIn("high_temperature_forest", decision.triggered_rules)
+        self.assertIn("asset_proximity", decision.triggered_rules)
+
     def test_agent_full_cycle(self):
         """Test complete agent execution cycle"""
-        agent = SimpleReflexAgent()
+        agent = shared_agent()
 
         # Run the agent
         decision = agent.run(34.0522, -118.2437)
@@ -210,6 +496,134 @@ class TestSimpleReflexAgent(unittest.TestCase):
         self.assertIsInstance(decision, WildfireDecision)
         self.assertIn(decision.risk_level, ["LOW", "MEDIUM", "HIGH", "CRITICAL"])
         self.assertIsNotNone(decision.timestamp)
+        self.assertLess(abs((datetime.now() - decision.timestamp).total_seconds()), 60)
+
+    def test_thermal_activity_age(self):
+        """Test nearby thermal activity only counts while it is recent"""
+        agent = shared_agent()
+        bundle = agent.location_services.get_bundle(45.0, -110.0)
+        now = datetime.now()
+
+        for hours_ago, expected in ((1.0, agent.thermal_threshold), (7.0, bundle["thermal"])):
+            nearby = {
+                "confidence": 0.9,
+                "acquisition_epoch": now.timestamp() - hours_ago * 3600.0,
+            }
+            percepts = agent.perceive(45.0, -110.0, bundle={**bundle, "thermal_nearby": nearby}, now=now)
+            self.assertEqual(percepts.thermal, expected)
+
+    def test_shared_timestamps(self):
+        """Test percepts and decisions can share one time read for a batch"""
+        agent = shared_agent()
+
+        percepts = agent.perceive(34.0522, -118.2437, now=_NOW)
+        self.assertIs(percepts.timestamp, _NOW)
+
+        timestamp_ns = 1_700_000_000_000_000_000
+        decision = agent.rule_engine.evaluate(percepts, timestamp_ns=timestamp_ns)
+        self.assertEqual(decision.timestamp_ns, timestamp_ns)
+
+    def test_threshold_change_applies_to_rules(self):
+        """Test setting a threshold applies to the following decisions"""
+        agent = SimpleReflexAgent()
+        percepts = EnvironmentalPercepts(
+            thermal=335.0,
+            humidity=15.0,
+            wind_speed=25.0,
+            landuse="forest",
+            vegetation_density=0.9,
+            asset_proximity=3.0,
+            timestamp=_NOW,
+            latitude=34.0522,
+            longitude=-118.2437,
+        )
+        self.assertIn("high_temperature_forest", agent.decide(percepts).triggered_rules)
+
+        agent.thermal_threshold = 340
+        self.assertEqual(agent.thermal_threshold, 340.0)
+        self.assertNotIn("high_temperature_forest", agent.decide(percepts).triggered_rules)
+
+    def test_missing_value_only_disables_rules_reading_it(self):
+        """Test a missing percept only fails the default rule conditions reading it"""
+        agent = SimpleReflexAgent()
+        percepts = EnvironmentalPercepts(
+            thermal=320.0,
+            humidity=None,
+            wind_speed=5.0,
+            landuse="grassland",
+            vegetation_density=0.3,
+            asset_proximity=1.0,
+            timestamp=_NOW,
+            latitude=45.0,
+            longitude=-110.0,
+        )
+
+        with self.assertNoLogs("wildfire_agent", level="ERROR"):
+            triggered_rules, _, risk = agent.rule_engine._sweep(percepts)
+        self.assertEqual(triggered_rules, ["asset_proximity"])
+        self.assertEqual(risk, 1)
+
+        # Same kernel result as the batch path, which stores missing values as NaN
+        engine = agent.rule_engine
+        batch_masks = engine.batch_kernel(PerceptBatch.from_percepts([percepts]))
+        self.assertEqual(batch_masks.tolist(), [engine.rule_kernel(percepts)])
+
+    def test_run_on_landcover_raster_classes(self):
+        """Test every land cover raster class passes validation and gets a decision"""
+        agent = SimpleReflexAgent()
+        # 1 x 12 pixels of 1 degree covering lat 45..46, lon -120..-108
+        classes = [10, 20, 30, 40, 50, 60, 70, 80, 90, 95, 100, 10]
+        agent.location_services.landcover = RasterGrid(
+            np.array([classes], dtype=np.uint8), (1.0, 0.0, -120.0, 0.0, -1.0, 46.0), nodata=0
+        )
+
+        for column, code in enumerate(classes):
+            lon = -119.5 + column
+            percepts = agent.perceive(45.5, lon)
+            self.assertIsInstance(percepts.landuse, LandUse, code)
+            self.assertTrue(agent.validate(percepts), code)
+            self.assertIsNotNone(agent.run(45.5, lon), code)
+
+    def test_run_batch(self):
+        """Test the batch execution cycle agrees with run for each location"""
+        agent = SimpleReflexAgent()
+
+        @agent.add_rule("forest_test_rule")
+        def forest_test_rule(percepts):
+            return "CRITICAL forest test alert" if percepts.landuse == LandUse.FOREST else None
+
+        locations = [(34.0522, -118.2437), (37.7749, -122.4194), (45.0, -110.0), (10.0, 20.0)]
+
+        results = agent.run_batch([lat for lat, _ in locations], [lon for _, lon in locations])
+
+        for index, (lat, lon) in enumerate(locations):
+            decision = agent.run(lat, lon)
+            if decision.risk_level == "LOW":
+                self.assertNotIn(index, results)
+                continue
+            self.assertEqual(results[index].risk_level, decision.risk_level)
+            self.assertEqual(results[index].triggered_rules, decision.triggered_rules)
+        self.assertIn(2, results)
+
+        # One clock read stamps all decisions of the batch
+        timestamp_ns = 1_700_000_000_000_000_000
+        with patch("wildfire_agent.agent._clock_ns", return_value=timestamp_ns) as clock:
+            results = agent.run_batch([lat for lat, _ in locations], [lon for _, lon in locations])
+        clock.assert_called_once_with()
+        self.assertEqual({decision.timestamp_ns for decision in results.values()}, {timestamp_ns})
+
+    def test_run_many(self):
+        """Test the threaded execution cycle keeps the order of the locations"""
+        agent = shared_agent()
+        locations = [(34.0522, -118.2437), (37.7749, -122.4194), (45.0, -110.0), (10.0, 20.0)]
+
+        decisions = agent.run_many(locations, max_workers=4)
+
+        self.assertEqual(len(decisions), len(locations))
+        for (lat, lon), decision in zip(locations, decisions):
+            expected = agent.run(lat, lon)
+            self.assertEqual(decision.risk_level, expected.risk_level)
+            self.assertEqual(decision.triggered_rules, expected.triggered_rules)
 
     def test_custom_rule_addition(self):
         """Test adding custom rules to the agent"""
@@ -224,13 +638,50 @@ class TestSimpleReflexAgent(unittest.TestCase):
 
         self.assertEqual(len(agent.rule_engine.rules), initial_rule_count + 1)
 
+    def test_custom_rules_read_timestamp_and_state(self):
+        """Test custom rules see the caller's timestamp and outside state on every decision"""
+        agent = SimpleReflexAgent()
+        state = {"armed": False}
+
+        @agent.add_rule("night_rule", risk_level="CRITICAL")
+        def night_rule(percepts):
+            return "Night patrol alert" if percepts.timestamp.hour >= 20 else None
+
+        @agent.add_rule("toggle_rule", risk_level="CRITICAL")
+        def toggle_rule(percepts):
+            return "Armed alert" if state["armed"] else None
+
+        percepts = EnvironmentalPercepts(
+            thermal=295.0,
+            humidity=60.0,
+            wind_speed=8.0,
+            landuse="urban",
+            vegetation_density=0.2,
+            asset_proximity=10.0,
+            timestamp=datetime(2024, 7, 1, 22, 0),
+            latitude=34.0522,
+            longitude=-118.2437,
+        )
+        self.assertEqual(agent.decide(percepts).triggered_rules, ["night_rule"])
+
+        state["armed"] = True
+        self.assertEqual(agent.decide(percepts).triggered_rules, ["night_rule", "toggle_rule"])
+
+        # Rules without a batch form get the row's timestamp
+        names = [name for name, _ in agent.rule_engine.rules]
+        _, _, triggered = agent.decide_batch(PerceptBatch.from_percepts([percepts]))
+        self.assertEqual([name for name, hit in zip(names, triggered[0]) if hit], ["night_rule", "toggle_rule"])
+
+        percepts.timestamp = datetime(2024, 7, 1, 12, 0)
+        self.assertEqual(agent.decide(percepts).triggered_rules, ["toggle_rule"])
+
 
 class TestIntegration(unittest.TestCase):
     """Integration tests for the complete system"""
 
     def test_high_risk_scenario(self):
         """Test a high-risk wildfire scenario"""
-        agent = SimpleReflexAgent()
+        agent = shared_agent()
 
         # Create high-risk percepts
         high_risk_percepts = EnvironmentalPercepts(
@@ -240,7 +691,7 @@ class TestIntegration(unittest.TestCase):
             landuse="forest",
             vegetation_density=0.95,  # Very dense vegetation
             asset_proximity=1.0,  # Very close to assets
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             latitude=34.0522,
             longitude=-118.2437,
         )
@@ -255,7 +706,7 @@ class TestIntegration(unittest.TestCase):
 
     def test_low_risk_scenario(self):
         """Test a low-risk scenario"""
-        agent = SimpleReflexAgent()
+        agent = shared_agent()
 
         # Create low-risk percepts
         low_risk_percepts = EnvironmentalPercepts(
@@ -265,7 +716,7 @@ class TestIntegration(unittest.TestCase):
             landuse="urban",
             vegetation_density=0.1,  # Low vegetation
             asset_proximity=0.5,  # Close to assets but urban
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             latitude=37.7749,
             longitude=-122.4194,
         )
@@ -298,9 +749,10 @@ class TestLocationLandCoverMapping(unittest.TestCase):
 class TestValidationGuardrails(unittest.TestCase):
     """Test validation guardrails for filtering noise and invalid data"""
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """Set up test agent"""
-        self.agent = SimpleReflexAgent()
+        cls.agent = shared_agent()
 
     def test_valid_percepts(self):
         """Test that valid percepts pass validation"""
@@ -311,7 +763,7 @@ class TestValidationGuardrails(unittest.TestCase):
             landuse="forest",
             vegetation_density=0.8,
             asset_proximity=5.0,
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             latitude=34.0522,
             longitude=-118.2437,
         )
@@ -326,7 +778,7 @@ class TestValidationGuardrails(unittest.TestCase):
             landuse="forest",
             vegetation_density=0.8,
             asset_proximity=5.0,
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             latitude=34.0522,
             longitude=-118.2437,
         )
@@ -341,7 +793,7 @@ class TestValidationGuardrails(unittest.TestCase):
             landuse="forest",
             vegetation_density=0.8,
             asset_proximity=5.0,
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             latitude=34.0522,
             longitude=-118.2437,
         )
@@ -356,7 +808,7 @@ class TestValidationGuardrails(unittest.TestCase):
             landuse="forest",
             vegetation_density=0.8,
             asset_proximity=5.0,
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             latitude=34.0522,
             longitude=-118.2437,
         )
@@ -372,7 +824,7 @@ class TestValidationGuardrails(unittest.TestCase):
             landuse="forest",
             vegetation_density=0.8,
             asset_proximity=5.0,
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             latitude=34.0522,
             longitude=-118.2437,
         )
@@ -392,7 +844,7 @@ class TestValidationGuardrails(unittest.TestCase):
             landuse="forest",
             vegetation_density=0.8,
             asset_proximity=5.0,
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             latitude=34.0522,
             longitude=-118.2437,
         )
@@ -412,7 +864,7 @@ class TestValidationGuardrails(unittest.TestCase):
             landuse="forest",
             vegetation_density=0.8,
             asset_proximity=5.0,
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             latitude=34.0522,
             longitude=-118.2437,
         )
@@ -432,7 +884,7 @@ class TestValidationGuardrails(unittest.TestCase):
             landuse="forest",
             vegetation_density=-0.1,
             asset_proximity=5.0,
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             latitude=34.0522,
             longitude=-118.2437,
         )
@@ -451,7 +903,7 @@ class TestValidationGuardrails(unittest.TestCase):
             landuse="forest",
             vegetation_density=0.8,
             asset_proximity=-1.0,
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             latitude=34.0522,
             longitude=-118.2437,
         )
@@ -467,7 +919,7 @@ class TestValidationGuardrails(unittest.TestCase):
             landuse="forest",
             vegetation_density=0.8,
             asset_proximity=5.0,
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             latitude=95.0,  # Invalid latitude
             longitude=-118.2437,
         )
@@ -487,7 +939,7 @@ class TestValidationGuardrails(unittest.TestCase):
             landuse="invalid_landuse",  # Not in allowed categories
             vegetation_density=0.8,
             asset_proximity=5.0,
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             latitude=34.0522,
             longitude=-118.2437,
         )
@@ -503,7 +955,7 @@ class TestValidationGuardrails(unittest.TestCase):
             landuse="forest",
             vegetation_density=0.8,
             asset_proximity=5.0,
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             latitude=34.0522,
             longitude=-118.2437,
         )
@@ -520,7 +972,7 @@ class TestRiskLevelScenarios(unittest.TestCase):
 
     def test_very_high_risk_scenario(self):
         """Test very high risk scenario"""
-        agent = SimpleReflexAgent()
+        agent = shared_agent()
 
         percepts = EnvironmentalPercepts(
             thermal=340.0,
@@ -529,7 +981,7 @@ class TestRiskLevelScenarios(unittest.TestCase):
             landuse="forest",
             vegetation_density=0.7,
             asset_proximity=5.0,
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             latitude=40.0,
             longitude=-120.0,
         )
@@ -539,7 +991,7 @@ class TestRiskLevelScenarios(unittest.TestCase):
 
     def test_medium_risk_scenario(self):
         """Test medium risk scenario"""
-        agent = SimpleReflexAgent()
+        agent = shared_agent()
 
         percepts = EnvironmentalPercepts(
             thermal=320.0,
@@ -548,7 +1000,7 @@ class TestRiskLevelScenarios(unittest.TestCase):
             landuse="forest",
             vegetation_density=0.7,
             asset_proximity=5.0,
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             latitude=40.0,
             longitude=-120.0,
         )
@@ -558,7 +1010,7 @@ class TestRiskLevelScenarios(unittest.TestCase):
 
     def test_low_risk_scenario(self):
         """Test low risk scenario"""
-        agent = SimpleReflexAgent()
+        agent = shared_agent()
 
         percepts = EnvironmentalPercepts(
             thermal=280.0,
@@ -567,7 +1019,7 @@ class TestRiskLevelScenarios(unittest.TestCase):
             landuse="forest",
             vegetation_density=0.7,
             asset_proximity=5.0,
-            timestamp=datetime.now(),
+            timestamp=_NOW,
             latitude=40.0,
             longitude=-120.0,
         )
@@ -576,6 +1028,131 @@ class TestRiskLevelScenarios(unittest.TestCase):
         self.assertIn(decision.risk_level, ["LOW", "MEDIUM", "HIGH", "CRITICAL"])
 
 
+
+class TestPerceptBatch(unittest.TestCase):
+    """Test batched rule evaluation against the per-percept path"""
+
+    @classmethod
+    def setUpClass(cls):
+        rows = [
+            (335.0, 15.0, 25.0, "forest", 0.9, 3.0),
+            (320.0, 25.0, 18.0, "grassland", 0.5, 2.0),
+            (328.0, 25.0, 10.0, "forest", 0.8, 12.0),
+            (295.0, 60.0, 8.0, "urban", 0.2, 1.0),
+            (302.0, 12.0, 13.6, "built area", 0.7, 1.0),
+            (330.0, 12.0, 20.0, "grassland", 0.8, 3.0),
+            (326.0, 18.0, 20.0, "urban", 0.8, 10.0),
+        ]
+        cls.percepts = [
+            EnvironmentalPercepts(
+                thermal=thermal,
+                humidity=humidity,
+                wind_speed=wind_speed,
+                landuse=landuse,
+                vegetation_density=vegetation_density,
+                asset_proximity=asset_proximity,
+                timestamp=_NOW,
+                latitude=40.0,
+                longitude=-120.0,
+            )
+            for thermal, humidity, wind_speed, landuse, vegetation_density, asset_proximity in rows
+        ]
+
+    def assert_batch_matches(self, agent):
+        batch = PerceptBatch.from_percepts(self.percepts)
+        risk_levels, confidences, triggered = agent.decide_batch(batch)
+        at_risk = agent.decide_batch_at_risk(batch)
+        names = [name for name, _ in agent.rule_engine.rules]
+
+        for i, percepts in enumerate(self.percepts):
+            decision = agent.decide(percepts)
+            self.assertEqual(risk_levels[i], decision.risk_level)
+            self.assertAlmostEqual(confidences[i], decision.confidence)
+            self.assertEqual(
+                [name for name, hit in zip(names, triggered[i]) if hit],
+                decision.triggered_rules,
+            )
+
+            # Decisions are decoded only for rows above LOW risk
+            if decision.risk_level == "LOW":
+                self.assertNotIn(i, at_risk)
+                continue
+            self.assertEqual(at_risk[i].risk_level, decision.risk_level)
+            self.assertEqual(at_risk[i].alert_message, decision.alert_message)
+            self.assertEqual(at_risk[i].triggered_rules, decision.triggered_rules)
+            self.assertAlmostEqual(at_risk[i].confidence, decision.confidence)
+
+    def test_landuse_codes(self):
+        """Test land use classes are encoded as integer codes"""
+        batch = PerceptBatch.from_percepts(self.percepts)
+        self.assertEqual(batch.landuse_code.tolist(), [1, 2, 1, 0, -1, 2, 0])
+
+    def test_default_rules_match_decide(self):
+        """Test vectorized default rules agree with decide"""
+        agent = shared_agent()
+        self.assert_batch_matches(agent)
+
+    def test_rule_kernel_matches_python_rules(self):
+        """Test decisions from the default rule kernel match calling each default rule"""
+        agent = SimpleReflexAgent()
+        compiled = [agent.decide(percepts) for percepts in self.percepts]
+
+        agent.rule_engine.rule_kernel = None
+        agent.rule_engine.clear_cache()
+        for decision, percepts in zip(compiled, self.percepts):
+            expected = agent.decide(percepts)
+            self.assertEqual(decision.triggered_rules, expected.triggered_rules)
+            self.assertEqual(decision.alert_message, expected.alert_message)
+
+    def test_default_rule_kernel_paths_agree(self):
+        """Test the scalar, compiled and batch forms of the default rule kernel agree"""
+        values = {
+            "thermal": [np.nan, 315.0, 320.0, 325.0, 330.0, 335.0],
+            "humidity": [np.nan, 15.0, 20.0, 30.0, 40.0],
+            "wind_speed": [np.nan, 15.0, 25.0],
+            "landuse_code": [-1, 0, 1, 2],
+            "vegetation_density": [np.nan, 0.6, 0.9],
+            "asset_proximity": [np.nan, 3.0, 5.0],
+        }
+        grid = np.meshgrid(*values.values(), indexing="ij")
+        columns = {name: axis.ravel() for name, axis in zip(values, grid)}
+        columns["landuse_code"] = columns["landuse_code"].astype(np.int8)
+        thresholds = (330.0, 30.0, 15.0)
+
+        masks = np.empty(len(columns["thermal"]), dtype=np.uint32)
+        eval_default_rules_batch(*columns.values(), *thresholds, masks)
+        self.assertEqual(masks.tolist(), default_rules_mask(*columns.values(), *thresholds).tolist())
+        self.assertTrue(masks.any())
+        for index in range(0, len(masks), 7):
+            row = [column[index].item() for column in columns.values()]
+            self.assertEqual(eval_default_rules(*row, *thresholds), masks[index])
+            self.assertEqual(default_rules_mask(*row, *thresholds), masks[index])
+
+    def test_batch_kernel_matches_row_rules(self):
+        """Test the default rule batch kernel agrees with the rules called row by row"""
+        agent = SimpleReflexAgent()
+        batch = PerceptBatch.from_percepts(self.percepts)
+        self.assertIsNotNone(agent.rule_engine.batch_kernel)
+        risk_levels, confidences, triggered = agent.decide_batch(batch)
+
+        agent.rule_engine.batch_kernel = None
+        expected_levels, expected_confidences, expected_triggered = agent.decide_batch(batch)
+        self.assertEqual(risk_levels.tolist(), expected_levels.tolist())
+        self.assertEqual(confidences.tolist(), expected_confidences.tolist())
+        self.assertEqual(triggered.tolist(), expected_triggered.tolist())
+
+    def test_custom_rule_evaluated_per_row(self):
+        """Test rules without a batch form are evaluated row by row"""
+        agent = SimpleReflexAgent()
+
+        @agent.add_rule("drought_conditions")
+        def drought_rule(percepts):
+            if percepts.humidity < 15 and percepts.vegetation_density > 0.3:
+                return "🌵 MEDIUM wildfire risk: Drought conditions detected"
+            return None
+
+        self.assert_batch_matches(agent)
+
 if __name__ == "__main__":
     # Run tests if executed directly
     unittest.main()